@@ -0,0 +1,199 @@
+
+""" Benchmark of the conversion stages on synthetic OpenDRIVE networks
+
+Each scenario is generated with benchmarks/generator.py, then the stages parse_opendrive, loadOpenDrive,
+exportLaneletNetwork and export_to_string are timed separately and the whole conversion from the XML string
+to the CommonRoad string is timed as one. The results are written as JSON, a previous
+result file can be passed with --compare to print the speedup of every stage.
+
+Usage:
+    python benchmarks/conversion.py [-o results.json] [--compare baseline.json] [--repeat N] [--quick]
+    python benchmarks/conversion.py --roads 500 --lanes 3 --widths 4 --geometries line=1,spiral=2 --junctions 0.5
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+from lxml import etree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+from generator import SyntheticOpenDrive, add_generator_arguments
+
+from opendriveparser import parse_opendrive
+from opendrive2lanelet.network import Network
+from opendrive2lanelet.commonroad import Scenario
+
+
+STAGES = ["parse_opendrive", "loadOpenDrive", "exportLaneletNetwork", "export_to_string"]
+
+# Time of the whole conversion, including parsing the XML and the time between the stages
+CONVERSION = "conversion"
+
+BASE_SCENARIO = dict(roads=200, lanes=2, widths=1, geometries=dict(line=1, arc=1, spiral=1, poly3=1, paramPoly3=1), junctions=0.2)
+
+# Each scenario scales one parameter of the base scenario
+SCENARIOS = [
+    ("base", {}),
+    ("roads-x4", dict(roads=800)),
+    ("lanes-x3", dict(lanes=6)),
+    ("widths-x8", dict(widths=8)),
+    ("only-lines", dict(geometries=dict(line=1))),
+    ("only-spirals", dict(geometries=dict(spiral=1))),
+    ("only-poly3", dict(geometries=dict(poly3=1))),
+    ("only-paramPoly3", dict(geometries=dict(paramPoly3=1))),
+    ("junctions-dense", dict(junctions=0.8)),
+]
+
+QUICK_SCENARIOS = [
+    ("base", dict(roads=40)),
+    ("widths-x8", dict(roads=40, widths=8)),
+    ("junctions-dense", dict(roads=40, junctions=0.8)),
+]
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.realpath(__file__)), stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def run_stages(xml):
+    """ Run the conversion once, returns the time of every stage and the size of the result """
+
+    times = {}
+
+    conversionStart = time.perf_counter()
+    root = etree.fromstring(xml)
+
+    start = time.perf_counter()
+    openDrive = parse_opendrive(root)
+    times["parse_opendrive"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    roadNetwork = Network()
+    roadNetwork.loadOpenDrive(openDrive)
+    times["loadOpenDrive"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    laneletNetwork = roadNetwork.exportLaneletNetwork()
+    times["exportLaneletNetwork"] = time.perf_counter() - start
+
+    scenario = Scenario(dt=0.1)
+    scenario.lanelet_network = laneletNetwork
+
+    start = time.perf_counter()
+    scenario.export_to_string()
+    times["export_to_string"] = time.perf_counter() - start
+
+    times[CONVERSION] = time.perf_counter() - conversionStart
+
+    counts = dict(
+        roads=len(openDrive.roads),
+        junctions=len(openDrive.junctions),
+        lanelets=len(laneletNetwork.lanelets),
+        vertices=sum(len(lanelet.left_vertices) + len(lanelet.right_vertices) for lanelet in laneletNetwork.lanelets),
+    )
+
+    return times, counts
+
+
+def run_scenario(name, params, repeat, seed=0):
+
+    xml = SyntheticOpenDrive(seed=seed, **params).tostring()
+
+    runs = {stage: [] for stage in STAGES + [CONVERSION]}
+    counts = None
+
+    for _ in range(repeat):
+        times, counts = run_stages(xml)
+
+        for stage in runs:
+            runs[stage].append(times[stage])
+
+    stages = {stage: dict(min=min(runs[stage]), median=float(np.median(runs[stage])), runs=runs[stage]) for stage in runs}
+    stages["total"] = dict(min=sum(stages[stage]["min"] for stage in STAGES), median=sum(stages[stage]["median"] for stage in STAGES))
+
+    return dict(name=name, params=params, size=len(xml), counts=counts, stages=stages)
+
+
+def format_result(result, baseline=None):
+
+    lines = ["{name}: {counts[roads]} roads, {counts[junctions]} junctions, {counts[lanelets]} lanelets, {counts[vertices]} vertices".format(**result)]
+
+    for stage in STAGES + ["total", CONVERSION]:
+        line = "    {:<22s} {:9.4f}s".format(stage, result["stages"][stage]["min"])
+
+        if baseline is not None and stage in baseline["stages"]:
+            before = baseline["stages"][stage]["min"]
+            line += "   baseline {:9.4f}s   speedup {:6.2f}x".format(before, before / max(result["stages"][stage]["min"], 1e-12))
+
+        lines.append(line)
+
+    return "\n".join(lines)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Time the conversion stages on synthetic OpenDRIVE networks.")
+    parser.add_argument("-o", "--output", default=None, help="write the results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="JSON result file of a previous run to compare with")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per scenario, the minimum is reported")
+    parser.add_argument("--quick", action="store_true", help="run a small set of scenarios")
+    parser.add_argument("--scenario", action="append", default=None, help="run only the named scenarios")
+    add_generator_arguments(parser)
+
+    # Generator arguments given explicitly replace the predefined scenarios by a single custom one
+    parser.set_defaults(**{name: None for name in BASE_SCENARIO})
+    args = parser.parse_args(argv)
+
+    custom = {name: getattr(args, name) for name in BASE_SCENARIO if getattr(args, name) is not None}
+
+    if custom:
+        scenarios = [("custom", dict(BASE_SCENARIO, **custom))]
+    else:
+        scenarios = [(name, dict(BASE_SCENARIO, **params)) for name, params in (QUICK_SCENARIOS if args.quick else SCENARIOS)]
+
+    if args.scenario:
+        scenarios = [(name, params) for name, params in scenarios if name in args.scenario]
+
+    baseline = {}
+
+    if args.compare is not None:
+        with open(args.compare) as fh:
+            baseline = {result["name"]: result for result in json.load(fh)["results"]}
+
+    results = []
+
+    for name, params in scenarios:
+        result = run_scenario(name, params, args.repeat, seed=args.seed)
+        results.append(result)
+
+        print(format_result(result, baseline.get(name)))
+        sys.stdout.flush()
+
+    if args.output is not None:
+        report = dict(
+            revision=git_revision(),
+            date=datetime.datetime.now().isoformat(),
+            python=platform.python_version(),
+            numpy=np.__version__,
+            machine=platform.machine(),
+            repeat=args.repeat,
+            results=results,
+        )
+
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
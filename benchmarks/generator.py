@@ -0,0 +1,268 @@
+
+""" Generator for synthetic OpenDRIVE networks of arbitrary size
+
+The network consists of parallel chains of roads. Consecutive roads of a chain are either linked
+directly or through a junction with one connecting road. Each road is built from random geometries
+of the requested mix, every lane has the requested number of width records.
+
+Usage: python benchmarks/generator.py output.xodr [--roads N] [--lanes N] [--widths N] [--geometries line=1,arc=1] [--junctions P]
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+from lxml import etree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+from opendriveparser.elements.roadPlanView import PlanView
+
+
+GEOMETRY_TYPES = ["line", "arc", "spiral", "poly3", "paramPoly3"]
+
+
+def parse_geometry_mix(text):
+    """ Parse "line=2,arc=1" to a dict of relative weights """
+
+    mix = {}
+
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+
+        if name not in GEOMETRY_TYPES:
+            raise ValueError("Unknown geometry type {}, valid are {}".format(name, ", ".join(GEOMETRY_TYPES)))
+
+        mix[name] = float(weight) if weight else 1.0
+
+    return mix
+
+
+class SyntheticOpenDrive(object):
+    """ Builds the XML tree of a synthetic OpenDRIVE network """
+
+    def __init__(self, roads=100, lanes=2, widths=1, geometries=None, junctions=0.0, roadsPerChain=20, geometriesPerRoad=3, seed=0):
+        self.roads = int(roads)
+        self.lanes = int(lanes)
+        self.widths = int(widths)
+        self.geometries = geometries if geometries is not None else {name: 1.0 for name in GEOMETRY_TYPES}
+        self.junctions = float(junctions)
+        self.roadsPerChain = int(roadsPerChain)
+        self.geometriesPerRoad = int(geometriesPerRoad)
+
+        self._random = np.random.RandomState(seed)
+
+        self._nextRoadId = 1
+        self._nextJunctionId = 1
+
+    def build(self):
+        """ Returns the root element of the generated OpenDRIVE file """
+
+        root = etree.Element("OpenDRIVE")
+        etree.SubElement(root, "header", revMajor="1", revMinor="4", name="synthetic", version="1", date="2018")
+
+        names = list(self.geometries)
+        weights = np.array([self.geometries[n] for n in names])
+        self._geometryNames = names
+        self._geometryWeights = weights / weights.sum()
+
+        generated = 0
+        chainIdx = 0
+
+        while generated < self.roads:
+            chainLength = min(self.roadsPerChain, self.roads - generated)
+
+            # Chains are placed far enough apart that they do not overlap, away from the origin
+            generated += self._buildChain(root, chainLength, np.array([1000.0, 1000.0 + 500.0 * chainIdx]))
+            chainIdx += 1
+
+        return root
+
+    def tostring(self):
+        return etree.tostring(self.build(), pretty_print=True, xml_declaration=True, encoding="utf-8")
+
+    def _buildChain(self, root, numRoads, startPosition):
+
+        position = startPosition
+        heading = 0.0
+        previousRoad = None
+        generated = 0
+
+        while generated < numRoads:
+            useJunction = previousRoad is not None and generated + 1 < numRoads and self._random.rand() < self.junctions
+
+            if useJunction:
+                junctionId = self._nextJunctionId
+                self._nextJunctionId += 1
+
+                connectingRoad, position, heading = self._buildRoad(root, position, heading, ["line"], junctionId=junctionId)
+                nextRoad, position, heading = self._buildRoad(root, position, heading)
+
+                # The incoming road ends in the junction, the connecting road leads directly into the next road
+                self._link(previousRoad, "successor", "junction", junctionId)
+                self._link(nextRoad, "predecessor", "road", connectingRoad.get("id"), "end")
+                self._link(connectingRoad, "predecessor", "road", previousRoad.get("id"), "end")
+                self._link(connectingRoad, "successor", "road", nextRoad.get("id"), "start")
+                self._laneLinks(connectingRoad, predecessor=True, successor=True)
+                self._laneLinks(nextRoad, predecessor=True)
+
+                junction = etree.SubElement(root, "junction", id=str(junctionId), name="junction{}".format(junctionId))
+                connection = etree.SubElement(junction, "connection", id="0", incomingRoad=previousRoad.get("id"), connectingRoad=connectingRoad.get("id"), contactPoint="start")
+
+                for laneId in self._laneIds():
+                    etree.SubElement(connection, "laneLink", **{"from": str(laneId), "to": str(laneId)})
+
+                generated += 2
+
+            else:
+                nextRoad, position, heading = self._buildRoad(root, position, heading)
+
+                if previousRoad is not None:
+                    self._link(previousRoad, "successor", "road", nextRoad.get("id"), "start")
+                    self._link(nextRoad, "predecessor", "road", previousRoad.get("id"), "end")
+                    self._laneLinks(previousRoad, successor=True)
+                    self._laneLinks(nextRoad, predecessor=True)
+
+                generated += 1
+
+            previousRoad = nextRoad
+
+        return generated
+
+    def _laneIds(self):
+        return [i for i in range(-self.lanes, self.lanes + 1) if i != 0]
+
+    def _buildRoad(self, root, position, heading, geometryTypes=None, junctionId=None):
+
+        roadId = self._nextRoadId
+        self._nextRoadId += 1
+
+        planView = PlanView()
+        geometryElements = []
+
+        numGeometries = 1 if geometryTypes is not None else self.geometriesPerRoad
+
+        for _ in range(numGeometries):
+            geometryType = geometryTypes[0] if geometryTypes is not None else self._random.choice(self._geometryNames, p=self._geometryWeights)
+            length = float(self._random.uniform(20.0, 60.0))
+
+            attributes = dict(s=repr(planView.getLength()), x=repr(float(position[0])), y=repr(float(position[1])), hdg=repr(float(heading)), length=repr(length))
+            curvature = float(self._random.uniform(-0.01, 0.01))
+
+            if geometryType == "line":
+                planView.addLine(position, heading, length)
+                geometryElements.append((attributes, "line", {}))
+
+            elif geometryType == "arc":
+                planView.addArc(position, heading, length, curvature)
+                geometryElements.append((attributes, "arc", dict(curvature=repr(curvature))))
+
+            elif geometryType == "spiral":
+                planView.addSpiral(position, heading, length, 0.0, curvature)
+                geometryElements.append((attributes, "spiral", dict(curvStart="0.0", curvEnd=repr(curvature))))
+
+            elif geometryType == "poly3":
+                # Gentle S-curve, v(u) = c u^2 + d u^3 with v(length) = 0
+                c = float(self._random.uniform(-0.1, 0.1)) / length
+                planView.addPoly3(position, heading, length, 0.0, 0.0, c, -c / length)
+                geometryElements.append((attributes, "poly3", dict(a="0.0", b="0.0", c=repr(c), d=repr(-c / length))))
+
+            else:
+                # Gentle S-curve, v(p) = c p^2 + d p^3 with v(1) = 0
+                bend = float(self._random.uniform(-0.1, 0.1)) * length
+                coeffs = dict(aU="0.0", bU=repr(length), cU="0.0", dU="0.0", aV="0.0", bV="0.0", cV=repr(bend), dV=repr(-bend), pRange="normalized")
+                planView.addParamPoly3(position, heading, length, 0.0, length, 0.0, 0.0, 0.0, 0.0, bend, -bend, None)
+                geometryElements.append((attributes, "paramPoly3", coeffs))
+
+            pos, d1, _ = planView.calcDerivatives(np.array([planView.getLength()]))
+            position = pos[0]
+            heading = float(np.arctan2(d1[0, 1], d1[0, 0]))
+
+        road = etree.SubElement(root, "road", name="road{}".format(roadId), length=repr(planView.getLength()), id=str(roadId), junction=str(junctionId) if junctionId is not None else "-1")
+        etree.SubElement(road, "link")
+
+        planViewElement = etree.SubElement(road, "planView")
+
+        for attributes, geometryType, geometryAttributes in geometryElements:
+            geometry = etree.SubElement(planViewElement, "geometry", **attributes)
+            etree.SubElement(geometry, geometryType, **geometryAttributes)
+
+        lanes = etree.SubElement(road, "lanes")
+        laneSection = etree.SubElement(lanes, "laneSection", s="0.0")
+
+        sectionLength = planView.getLength()
+
+        for side, laneIds in [("left", range(self.lanes, 0, -1)), ("center", [0]), ("right", range(-1, -self.lanes - 1, -1))]:
+            sideElement = etree.SubElement(laneSection, side)
+
+            for laneId in laneIds:
+                lane = etree.SubElement(sideElement, "lane", id=str(laneId), type="driving", level="false")
+                etree.SubElement(lane, "link")
+
+                if laneId == 0:
+                    continue
+
+                # Width records with small variations that keep the lane width continuous
+                width = 3.5
+
+                for widthIdx in range(self.widths):
+                    sOffset = sectionLength * widthIdx / self.widths
+                    recordLength = sectionLength / self.widths
+                    slope = float(self._random.uniform(-0.2, 0.2)) / recordLength if widthIdx + 1 < self.widths else 0.0
+
+                    etree.SubElement(lane, "width", sOffset=repr(sOffset), a=repr(width), b=repr(slope), c="0.0", d="0.0")
+
+                    width += slope * recordLength
+
+        return road, position, heading
+
+    @staticmethod
+    def _link(road, tag, elementType, elementId, contactPoint=None):
+        link = road.find("link")
+        attributes = dict(elementType=elementType, elementId=str(elementId))
+
+        if contactPoint is not None:
+            attributes["contactPoint"] = contactPoint
+
+        etree.SubElement(link, tag, **attributes)
+
+    def _laneLinks(self, road, predecessor=False, successor=False):
+        for lane in road.iter("lane"):
+            laneId = lane.get("id")
+
+            if laneId == "0":
+                continue
+
+            if predecessor and lane.find("link").find("predecessor") is None:
+                etree.SubElement(lane.find("link"), "predecessor", id=laneId)
+
+            if successor and lane.find("link").find("successor") is None:
+                etree.SubElement(lane.find("link"), "successor", id=laneId)
+
+
+def add_generator_arguments(parser):
+    parser.add_argument("--roads", type=int, default=100, help="number of roads")
+    parser.add_argument("--lanes", type=int, default=2, help="number of lanes on each side of a road")
+    parser.add_argument("--widths", type=int, default=1, help="number of width records per lane")
+    parser.add_argument("--geometries", type=parse_geometry_mix, default="line=1,arc=1,spiral=1,poly3=1,paramPoly3=1", help="relative weights of the geometry types, e.g. line=2,arc=1")
+    parser.add_argument("--junctions", type=float, default=0.2, help="probability that two consecutive roads are linked through a junction")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic OpenDRIVE file.")
+    parser.add_argument("output", help="path of the OpenDRIVE file to write")
+    add_generator_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    generator = SyntheticOpenDrive(roads=args.roads, lanes=args.lanes, widths=args.widths, geometries=args.geometries, junctions=args.junctions, seed=args.seed)
+
+    with open(args.output, "wb") as fh:
+        fh.write(generator.tostring())
+
+
+if __name__ == "__main__":
+    main()
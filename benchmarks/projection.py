@@ -0,0 +1,76 @@
+
+""" Benchmark of the inverse projection from world coordinates to road coordinates (s, t)
+
+Usage: python benchmarks/projection.py [number of points]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+from opendriveparser.elements.roadPlanView import PlanView
+
+
+def create_plan_view():
+    """ Reference line with all supported geometry types, each geometry starts at the end of the previous one """
+
+    planView = PlanView()
+
+    def end_of_plan_view():
+        pos, d1, _ = planView.calcDerivatives(np.array([planView.getLength()]))
+        return pos[0], np.arctan2(d1[0, 1], d1[0, 0])
+
+    planView.addLine([0.0, 0.0], 0.0, 100.0)
+
+    pos, hdg = end_of_plan_view()
+    planView.addSpiral(pos, hdg, 50.0, 0.0, 0.01)
+
+    pos, hdg = end_of_plan_view()
+    planView.addArc(pos, hdg, 150.0, 0.01)
+
+    pos, hdg = end_of_plan_view()
+    planView.addSpiral(pos, hdg, 50.0, 0.01, 0.0)
+
+    pos, hdg = end_of_plan_view()
+    planView.addParamPoly3(pos, hdg, 100.0, 0.0, 100.0, 0.0, 0.0, 0.0, 0.0, 20.0, -10.0, None)
+
+    return planView
+
+
+def main(numPoints):
+
+    planView = create_plan_view()
+    length = planView.getLength()
+
+    random = np.random.RandomState(0)
+    sPos = random.uniform(0.0, length, numPoints)
+    tPos = random.uniform(-5.0, 5.0, numPoints)
+
+    start = time.time()
+    points = planView.stToXY(sPos, tPos)
+    forwardTime = time.time() - start
+
+    # First call includes sampling the reference line and building the KD-tree
+    start = time.time()
+    planView.xyToST(points[:1])
+    setupTime = time.time() - start
+
+    start = time.time()
+    sResult, tResult, _ = planView.xyToST(points)
+    inverseTime = time.time() - start
+
+    print("Points:             {}".format(numPoints))
+    print("Reference length:   {:.1f} m".format(length))
+    print("(s, t) -> (x, y):   {:.3f} s".format(forwardTime))
+    print("Sampling + index:   {:.3f} s".format(setupTime))
+    print("(x, y) -> (s, t):   {:.3f} s ({:.2f} us per point)".format(inverseTime, inverseTime / numPoints * 1e6))
+    print("Max error s:        {:.3e} m".format(np.abs(sResult - sPos).max()))
+    print("Max error t:        {:.3e} m".format(np.abs(tResult - tPos).max()))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) >= 2 else 1000000)
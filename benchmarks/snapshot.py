@@ -0,0 +1,93 @@
+""" Benchmark of snapshots against pickle for Network and LaneletNetwork
+
+The network is generated with benchmarks/generator.py and converted once, then the Network and the exported
+LaneletNetwork are saved to and loaded from memory with opendrive2lanelet.snapshot and with pickle. The best
+time of all runs is reported together with the ratio of the pickle time to the snapshot time, a ratio below 1
+means the snapshot is slower than pickle.
+
+Usage:
+    python benchmarks/snapshot.py [--repeat N] [--roads 1000 --lanes 6 --widths 4 ...]
+"""
+
+import argparse
+import io
+import os
+import pickle
+import sys
+import time
+
+from lxml import etree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+from generator import SyntheticOpenDrive, add_generator_arguments
+
+from opendriveparser import parse_opendrive
+from opendrive2lanelet.network import Network
+from opendrive2lanelet import snapshot
+
+
+def best_time(function, repeat):
+    """ Shortest time of repeat calls of function """
+
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def run(name, obj, save, load, repeat):
+
+    buf = io.BytesIO()
+    save(obj, buf)
+    data = buf.getvalue()
+
+    pickled = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    times = dict(
+        snapshot_save=best_time(lambda: save(obj, io.BytesIO()), repeat),
+        snapshot_load=best_time(lambda: load(io.BytesIO(data)), repeat),
+        pickle_save=best_time(lambda: pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), repeat),
+        pickle_load=best_time(lambda: pickle.loads(pickled), repeat),
+    )
+
+    print("{}: snapshot {:.1f} MB, pickle {:.1f} MB".format(name, len(data) / 1e6, len(pickled) / 1e6))
+
+    for operation in ["save", "load"]:
+        print("    {:<6s} snapshot {:8.3f}s   pickle {:8.3f}s   pickle/snapshot {:6.2f}".format(
+            operation, times["snapshot_" + operation], times["pickle_" + operation], times["pickle_" + operation] / max(times["snapshot_" + operation], 1e-12)))
+
+    sys.stdout.flush()
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Time snapshots and pickle of a converted synthetic OpenDRIVE network.")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs, the minimum is reported")
+    add_generator_arguments(parser)
+    parser.set_defaults(roads=1000, lanes=6, widths=4)
+
+    args = parser.parse_args(argv)
+
+    xml = SyntheticOpenDrive(roads=args.roads, lanes=args.lanes, widths=args.widths, geometries=args.geometries, junctions=args.junctions, seed=args.seed).tostring()
+
+    roadNetwork = Network()
+    roadNetwork.loadOpenDrive(parse_opendrive(etree.fromstring(xml)))
+
+    laneletNetwork = roadNetwork.exportLaneletNetwork()
+
+    # Border chains are deeper than the default recursion limit of pickle
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 100000))
+
+    print("{} parametric lanes, {} lanelets".format(len(roadNetwork._planes), len(laneletNetwork.lanelets)))
+
+    run("LaneletNetwork", laneletNetwork, snapshot.save_lanelet_network, snapshot.load_lanelet_network, args.repeat)
+    run("Network", roadNetwork, snapshot.save_network, snapshot.load_network, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
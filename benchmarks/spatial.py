@@ -0,0 +1,70 @@
+""" Benchmark of point queries against the spatial index of a LaneletNetwork
+
+The network is generated with benchmarks/generator.py and converted once, then random points around the lanelet
+vertices are located with LaneletNetwork.find_lanelet_indices_by_position and, for comparison, projected onto the
+centerlines with LaneletNetwork.project_points.
+
+Usage:
+    python benchmarks/spatial.py [--points N] [--roads 300 --lanes 3 ...]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from lxml import etree
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+from generator import SyntheticOpenDrive, add_generator_arguments
+
+from opendriveparser import parse_opendrive
+from opendrive2lanelet.network import Network
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Time point queries on a converted synthetic OpenDRIVE network.")
+    parser.add_argument("--points", type=int, default=1000000, help="number of query points")
+    add_generator_arguments(parser)
+    parser.set_defaults(roads=300, lanes=3)
+
+    args = parser.parse_args(argv)
+
+    xml = SyntheticOpenDrive(roads=args.roads, lanes=args.lanes, widths=args.widths, geometries=args.geometries, junctions=args.junctions, seed=args.seed).tostring()
+
+    roadNetwork = Network()
+    roadNetwork.loadOpenDrive(parse_opendrive(etree.fromstring(xml)))
+
+    laneletNetwork = roadNetwork.exportLaneletNetwork()
+
+    random = np.random.RandomState(args.seed)
+    vertices = np.vstack([lanelet.left_vertices for lanelet in laneletNetwork.lanelets] + [lanelet.right_vertices for lanelet in laneletNetwork.lanelets])
+    points = vertices[random.randint(len(vertices), size=args.points)] + random.uniform(-3.0, 3.0, (args.points, 2))
+
+    # First calls include building the grid and the KD-tree
+    start = time.time()
+    laneletNetwork.find_lanelet_indices_by_position(points[:1])
+    laneletNetwork.project_points(points[:1])
+    setupTime = time.time() - start
+
+    start = time.time()
+    pointIdx, _ = laneletNetwork.find_lanelet_indices_by_position(points)
+    queryTime = time.time() - start
+
+    start = time.time()
+    laneletNetwork.project_points(points)
+    projectionTime = time.time() - start
+
+    print("Lanelets:           {}".format(len(laneletNetwork.lanelets)))
+    print("Quads:              {}".format(len(laneletNetwork.spatial_index._quads)))
+    print("Points:             {} ({} hits)".format(args.points, len(pointIdx)))
+    print("Grid + KD-tree:     {:.3f} s".format(setupTime))
+    print("Point queries:      {:.3f} s ({:.2f} us per point)".format(queryTime, queryTime / args.points * 1e6))
+    print("Projection:         {:.3f} s ({:.2f} us per point)".format(projectionTime, projectionTime / args.points * 1e6))
+
+
+if __name__ == "__main__":
+    main()
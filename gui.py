@@ -5,28 +5,80 @@ import sys
 
 from lxml import etree
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtWidgets import QApplication, QWidget, QLineEdit, QFileDialog, QMainWindow
-from PyQt5.QtWidgets import QPushButton, QMessageBox, QLabel
+from PyQt5.QtWidgets import QPushButton, QMessageBox, QLabel, QProgressBar
 
 from opendriveparser import parse_opendrive
 from opendrive2lanelet import Network
+from opendrive2lanelet.progress import CancellationToken, ConversionCanceled
 
 from viewer import MainWindow as ViewerWidget
 
+class Worker(QThread):
+    """ Runs a job outside of the main thread
+
+    The job is called with the worker, whose report function takes the progress in percent and a message
+    and raises ConversionCanceled after cancel() was called. The cancellation token of the worker
+    also stops a running conversion.
+    """
+
+    progress = pyqtSignal(int, str)
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    canceled = pyqtSignal()
+
+    def __init__(self, job, parent=None):
+        super().__init__(parent)
+
+        self._job = job
+        self._lastProgress = None
+        self.cancelToken = CancellationToken()
+
+    def cancel(self):
+        self.cancelToken.cancel()
+
+    def report(self, percent, message):
+        self.cancelToken.check()
+
+        # Only changes are sent to the main thread
+        if (percent, message) != self._lastProgress:
+            self._lastProgress = (percent, message)
+            self.progress.emit(percent, message)
+
+    def conversionProgress(self, steps):
+        """ Progress callback of a conversion, steps maps the steps to their message and range in percent """
+
+        def progress(step, done, total):
+            message, start, end = steps[step]
+            self.report(start + (end - start) * done // total, message)
+
+        return progress
+
+    def run(self):
+        try:
+            result = self._job(self)
+        except ConversionCanceled:
+            self.canceled.emit()
+        except Exception as e:
+            self.failed.emit(e)
+        else:
+            self.succeeded.emit(result)
+
 class MainWindow(QWidget):
 
     def __init__(self, argv):
         super().__init__()
 
         self.loadedRoadNetwork = None
+        self.convertedScenario = None
+        self.worker = None
 
         self._initUserInterface()
         self.show()
 
         if len(argv) >= 2:
-            self.loadOpenDriveFile(argv[1])
-            self.viewLaneletNetwork()
+            self.loadOpenDriveFile(argv[1], view=True)
 
     def _initUserInterface(self):
 
@@ -63,10 +115,59 @@ class MainWindow(QWidget):
         self.viewOutputButton.setDisabled(True)
         self.viewOutputButton.clicked.connect(self.viewLaneletNetwork)
 
+        self.progressBar = QProgressBar(self)
+        self.progressBar.move(370, 300)
+        self.progressBar.resize(110, 35)
+        self.progressBar.setRange(0, 100)
+        self.progressBar.setVisible(False)
+
+        self.cancelButton = QPushButton('Cancel', self)
+        self.cancelButton.move(485, 300)
+        self.cancelButton.resize(65, 35)
+        self.cancelButton.setVisible(False)
+        self.cancelButton.clicked.connect(self.cancelWorker)
+
     def resetOutputElements(self):
         self.exportCommonRoadButton.setDisabled(True)
         self.viewOutputButton.setDisabled(True)
 
+    def startWorker(self, job, onSucceeded, onFailed):
+        """ Run a job in a worker thread, the window stays responsive and shows its progress """
+
+        self.loadButton.setDisabled(True)
+        self.resetOutputElements()
+
+        self.progressBar.setValue(0)
+        self.progressBar.setVisible(True)
+        self.cancelButton.setVisible(True)
+
+        self.worker = Worker(job, self)
+        self.worker.progress.connect(self.onWorkerProgress)
+        self.worker.succeeded.connect(onSucceeded)
+        self.worker.failed.connect(onFailed)
+        self.worker.finished.connect(self.onWorkerFinished)
+        self.worker.start()
+
+    def cancelWorker(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancelButton.setDisabled(True)
+
+    def onWorkerProgress(self, percent, message):
+        self.progressBar.setValue(percent)
+        self.progressBar.setFormat("{} %p%".format(message))
+
+    def onWorkerFinished(self):
+        self.worker = None
+
+        self.progressBar.setVisible(False)
+        self.cancelButton.setVisible(False)
+        self.cancelButton.setDisabled(False)
+
+        self.loadButton.setDisabled(False)
+        self.exportCommonRoadButton.setDisabled(self.convertedScenario is None)
+        self.viewOutputButton.setDisabled(self.convertedScenario is None)
+
     def openOpenDriveFileDialog(self):
         self.resetOutputElements()
 
@@ -83,44 +184,71 @@ class MainWindow(QWidget):
 
         self.loadOpenDriveFile(path)
 
-    def loadOpenDriveFile(self, path):
+    def loadOpenDriveFile(self, path, view=False):
 
         filename = os.path.basename(path)
         self.inputOpenDriveFile.setText(filename)
 
-        # Load road network and print some statistics
-        try:
-            fh = open(path, 'r')
-            openDriveXml = parse_opendrive(etree.parse(fh).getroot())
-            fh.close()
-        except (etree.XMLSyntaxError) as e:
-            errorMsg = 'XML Syntax Error: {}'.format(e)
-            QMessageBox.warning(self, 'OpenDRIVE error', 'There was an error during the loading of the selected OpenDRIVE file.\n\n{}'.format(errorMsg), QMessageBox.Ok)
-            return
-        except (TypeError, AttributeError, ValueError) as e:
-            errorMsg = 'Value Error: {}'.format(e)
-            QMessageBox.warning(self, 'OpenDRIVE error', 'There was an error during the loading of the selected OpenDRIVE file.\n\n{}'.format(errorMsg), QMessageBox.Ok)
-            return
-
-        self.loadedRoadNetwork = Network()
-        self.loadedRoadNetwork.loadOpenDrive(openDriveXml)
+        self.loadedRoadNetwork = None
+        self.convertedScenario = None
+        self.statsText.setText("")
+
+        # The scenario is converted once and reused for viewing and export
+        def job(worker):
+            worker.report(0, "Reading")
+
+            with open(path, 'r') as fh:
+                root = etree.parse(fh).getroot()
+
+            # Roads are built while loading, which reports progress per road
+            worker.report(10, "Parsing")
+            openDriveXml = parse_opendrive(root, lazy=True)
+
+            worker.report(20, "Loading")
+            roadNetwork = Network()
+            roadNetwork.loadOpenDrive(openDriveXml, progress=worker.conversionProgress({"roads": ("Loading roads", 20, 40)}), cancelToken=worker.cancelToken)
+
+            worker.report(40, "Converting")
+            scenario = roadNetwork.exportCommonRoadScenario(
+                progress=worker.conversionProgress({"planes": ("Sampling lanes", 40, 90), "lanelets": ("Linking lanelets", 90, 100)}),
+                cancelToken=worker.cancelToken
+            )
+
+            worker.report(100, "Done")
+
+            return openDriveXml, roadNetwork, scenario
+
+        def onSucceeded(result):
+            openDriveXml, self.loadedRoadNetwork, self.convertedScenario = result
+
+            self.statsText.setText("Name: {}<br>Version: {}<br>Date: {}<br><br>OpenDRIVE Version {}.{}<br><br>Number of roads: {}<br>Total length of road network: {:.2f} meters".format(
+                openDriveXml.header.name if openDriveXml.header.name else "<i>unset</i>",
+                openDriveXml.header.version,
+                openDriveXml.header.date,
+                openDriveXml.header.revMajor,
+                openDriveXml.header.revMinor,
+                len(openDriveXml.roadIndex),
+                sum([road.length for road in openDriveXml.roadIndex])
+            ))
+
+            if view:
+                self.viewLaneletNetwork()
+
+        def onFailed(e):
+            if isinstance(e, etree.XMLSyntaxError):
+                errorMsg = 'XML Syntax Error: {}'.format(e)
+            elif isinstance(e, (TypeError, AttributeError, ValueError)):
+                errorMsg = 'Value Error: {}'.format(e)
+            else:
+                errorMsg = '{}'.format(e)
 
-        self.statsText.setText("Name: {}<br>Version: {}<br>Date: {}<br><br>OpenDRIVE Version {}.{}<br><br>Number of roads: {}<br>Total length of road network: {:.2f} meters".format(
-            openDriveXml.header.name if openDriveXml.header.name else "<i>unset</i>",
-            openDriveXml.header.version,
-            openDriveXml.header.date,
-            openDriveXml.header.revMajor,
-            openDriveXml.header.revMinor,
-            len(openDriveXml.roads),
-            sum([road.length for road in openDriveXml.roads])
-        ))
+            QMessageBox.warning(self, 'OpenDRIVE error', 'There was an error during the loading of the selected OpenDRIVE file.\n\n{}'.format(errorMsg), QMessageBox.Ok)
 
-        self.exportCommonRoadButton.setDisabled(False)
-        self.viewOutputButton.setDisabled(False)
+        self.startWorker(job, onSucceeded, onFailed)
 
     def exportAsCommonRoad(self):
 
-        if not self.loadedRoadNetwork:
+        if self.convertedScenario is None:
             return
 
         path, _ = QFileDialog.getSaveFileName(
@@ -134,18 +262,32 @@ class MainWindow(QWidget):
         if not path:
             return
 
-        try:
-            fh = open(path, "wb")
-            fh.write(self.loadedRoadNetwork.exportCommonRoadScenario().export_to_string())
-            fh.close()
-        except (IOError) as e:
+        scenario = self.convertedScenario
+
+        def job(worker):
+            worker.report(0, "Exporting")
+            data = scenario.export_to_string()
+
+            worker.report(90, "Writing")
+
+            with open(path, "wb") as fh:
+                fh.write(data)
+
+            worker.report(100, "Done")
+
+        def onSucceeded(result):
+            QMessageBox.information(self, 'CommonRoad file created!', 'The CommonRoad file was successfully exported.', QMessageBox.Ok)
+
+        def onFailed(e):
             QMessageBox.critical(self, 'CommonRoad file not created!', 'The CommonRoad file was not exported due to an error.\n\n{}'.format(e), QMessageBox.Ok)
-            return
 
-        QMessageBox.information(self, 'CommonRoad file created!', 'The CommonRoad file was successfully exported.', QMessageBox.Ok)
+        self.startWorker(job, onSucceeded, onFailed)
 
     def viewLaneletNetwork(self):
 
+        if self.convertedScenario is None:
+            return
+
         class ViewerWindow(QMainWindow):
             def __init__(self, parent=None):
                 super(ViewerWindow, self).__init__(parent)
@@ -154,7 +296,7 @@ class MainWindow(QWidget):
                 self.setCentralWidget(self.viewer)
 
         viewer = ViewerWindow(self)
-        viewer.viewer.openScenario(self.loadedRoadNetwork.exportCommonRoadScenario())
+        viewer.viewer.openScenario(self.convertedScenario)
         viewer.show()
 
     # def viewLaneletNetwork(self):
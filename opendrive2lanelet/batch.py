@@ -0,0 +1,256 @@
+
+""" Convert many OpenDRIVE files to CommonRoad in parallel
+
+Usage: python -m opendrive2lanelet.batch [-o OUTPUT_DIR] [-j JOBS] [--simplify TOLERANCE] [--memory] [--json REPORT] INPUT [INPUT ...]
+
+Inputs can be files, directories (all *.xodr files in it) or glob patterns. The files are converted
+in a pool of worker processes, a failing file is reported and does not stop the other conversions. If a
+worker dies, the files which were not finished are converted again each in its own process, so only the
+file which crashed fails.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+
+
+def glob_recursive(pattern):
+    """ Files and directories matching a glob pattern, a ** component matches any number of directories
+
+    Same as glob.glob(pattern, recursive=True), which needs Python 3.5.
+    """
+
+    head, separator, tail = pattern.partition("**")
+
+    # Only a whole path component ** is recursive
+    if not separator or (head and not head.endswith(("/", os.sep))) or (tail and not tail.startswith(("/", os.sep))):
+        return glob.glob(pattern)
+
+    tail = tail.lstrip("/" + os.sep)
+    matches = []
+
+    for root in (glob.glob(head) if head else [os.curdir]):
+        for directory, directories, _ in os.walk(root):
+            # Hidden directories are skipped like by glob
+            directories[:] = sorted(d for d in directories if not d.startswith("."))
+
+            if tail:
+                matches.extend(glob_recursive(os.path.join(directory, tail)))
+            else:
+                matches.extend(os.path.join(directory, name) for name in sorted(os.listdir(directory)) if not name.startswith("."))
+
+    return matches
+
+
+def collect_input_files(inputs):
+    """ Expand files, directories and glob patterns to a sorted list of files without duplicates """
+
+    files = []
+
+    for entry in inputs:
+        if os.path.isdir(entry):
+            files.extend(glob.glob(os.path.join(entry, "*.xodr")))
+        elif os.path.isfile(entry):
+            files.append(entry)
+        else:
+            files.extend(f for f in glob_recursive(entry) if os.path.isfile(f))
+
+    return sorted(set(os.path.abspath(f) for f in files))
+
+
+def output_path_for(input_path, output_dir=None):
+    """ CommonRoad file next to the input file or in the output directory """
+
+    base = os.path.splitext(os.path.basename(input_path))[0] + ".xml"
+
+    return os.path.join(output_dir if output_dir is not None else os.path.dirname(input_path), base)
+
+
+def convert_file(input_path, output_path, memory=False, simplify=None):
+    """ Convert a single file, returns a summary dict; errors are returned instead of raised
+
+    With memory, the conversion is traced and the memory report is part of the summary. With a simplify
+    tolerance, the lanelet bounds are simplified and the number of vertices before is part of the summary.
+    """
+
+    from lxml import etree
+
+    from opendriveparser import parse_opendrive
+    from opendrive2lanelet.network import Network
+    from opendrive2lanelet.memory import profile_conversion
+
+    summary = dict(input=input_path, output=output_path, ok=False, time=0.0, roads=0, lanelets=0, vertices=0, error=None)
+
+    start = time.time()
+
+    try:
+        if memory:
+            report = profile_conversion(input_path, output_path, simplify=simplify)
+
+            summary.update(report.counts)
+            summary["memory"] = report.to_dict()
+            summary["ok"] = True
+            summary["time"] = time.time() - start
+
+            return summary
+
+        openDrive = parse_opendrive(etree.parse(input_path).getroot())
+        summary["roads"] = len(openDrive.roads)
+
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(openDrive)
+
+        scenario = roadNetwork.exportCommonRoadScenario()
+
+        if simplify is not None:
+            summary["vertices_before"], _ = scenario.lanelet_network.simplify(simplify)
+
+        lanelets = scenario.lanelet_network.lanelets
+        summary["lanelets"] = len(lanelets)
+        summary["vertices"] = sum(len(lanelet.left_vertices) + len(lanelet.right_vertices) for lanelet in lanelets)
+
+        with open(output_path, "wb") as fh:
+            fh.write(scenario.export_to_string())
+
+        summary["ok"] = True
+
+    except Exception as e:
+        summary["error"] = "{}: {}\n{}".format(type(e).__name__, e, traceback.format_exc())
+
+    summary["time"] = time.time() - start
+
+    return summary
+
+
+def format_summary(summary):
+    if summary["ok"] and "memory" in summary:
+        return "ok     {:8.2f}s  roads={:<6d} lanelets={:<7d} vertices={:<9d} peak={:.1f}MB {}".format(
+            summary["time"], summary["roads"], summary["lanelets"], summary["vertices"], summary["memory"]["peak"] / 1e6, summary["input"])
+
+    if summary["ok"] and "vertices_before" in summary:
+        return "ok     {:8.2f}s  roads={:<6d} lanelets={:<7d} vertices={:<9d} (from {}) {}".format(
+            summary["time"], summary["roads"], summary["lanelets"], summary["vertices"], summary["vertices_before"], summary["input"])
+
+    if summary["ok"]:
+        return "ok     {:8.2f}s  roads={:<6d} lanelets={:<7d} vertices={:<9d} {}".format(
+            summary["time"], summary["roads"], summary["lanelets"], summary["vertices"], summary["input"])
+
+    return "FAILED {:8.2f}s  {}\n       {}".format(summary["time"], summary["input"], summary["error"].splitlines()[0])
+
+
+def failed_summary(input_path, error):
+    """ Summary of a file whose conversion did not return a summary """
+
+    return dict(input=input_path, output=None, ok=False, time=0.0, roads=0, lanelets=0, vertices=0,
+                error="{}: {}".format(type(error).__name__, error))
+
+
+def convert_files(files, output_dir=None, jobs=None, report=print, memory=False, simplify=None, convert=convert_file):
+    """ Convert all files with a pool of at most jobs worker processes, returns the list of summaries
+
+    convert is called in the workers with the input path, output path, memory and simplify arguments.
+    """
+
+    if output_dir is not None and not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    jobs = max(1, min(jobs if jobs is not None else (os.cpu_count() or 1), len(files) or 1))
+    summaries = []
+
+    def finish(summary):
+        summaries.append(summary)
+
+        if report is not None:
+            report(format_summary(summary))
+
+    unfinished = []
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(convert, f, output_path_for(f, output_dir), memory, simplify): f for f in files}
+
+        for future in as_completed(futures):
+            try:
+                finish(future.result())
+            except BrokenProcessPool:
+                # A worker process died, e.g. killed because it ran out of memory, and took the pool with it
+                unfinished.append(futures[future])
+            except Exception as e:
+                finish(failed_summary(futures[future], e))
+
+    # Each unfinished file gets its own process, a file which kills its process again is the one that failed
+    unfinished.sort()
+    running = {}
+
+    while unfinished or running:
+        while unfinished and len(running) < jobs:
+            f = unfinished.pop(0)
+            executor = ProcessPoolExecutor(max_workers=1)
+            running[executor.submit(convert, f, output_path_for(f, output_dir), memory, simplify)] = (executor, f)
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            executor, f = running.pop(future)
+            executor.shutdown()
+
+            try:
+                finish(future.result())
+            except Exception as e:
+                finish(failed_summary(f, e))
+
+    return summaries
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Convert OpenDRIVE files to CommonRoad files in parallel.")
+    parser.add_argument("inputs", nargs="+", help="OpenDRIVE files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default=None, help="directory for the CommonRoad files (default: next to the input file)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: number of cores)")
+    parser.add_argument("--simplify", type=float, default=None, metavar="TOLERANCE", help="remove lanelet vertices deviating less than TOLERANCE meters from the simplified bounds")
+    parser.add_argument("--memory", action="store_true", help="trace the allocations of every conversion (slow), see opendrive2lanelet.memory")
+    parser.add_argument("--json", default=None, help="write the summaries of all files as JSON to this file")
+
+    args = parser.parse_args(argv)
+
+    files = collect_input_files(args.inputs)
+
+    if not files:
+        print("No OpenDRIVE files found.", file=sys.stderr)
+        return 1
+
+    start = time.time()
+    summaries = convert_files(files, output_dir=args.output_dir, jobs=args.jobs, memory=args.memory, simplify=args.simplify)
+    failed = [s for s in summaries if not s["ok"]]
+
+    print("\nConverted {} of {} files in {:.2f}s: {} roads, {} lanelets, {} vertices".format(
+        len(summaries) - len(failed),
+        len(summaries),
+        time.time() - start,
+        sum(s["roads"] for s in summaries if s["ok"]),
+        sum(s["lanelets"] for s in summaries),
+        sum(s["vertices"] for s in summaries)
+    ))
+
+    if args.simplify is not None:
+        print("Simplified from {} vertices".format(sum(s.get("vertices_before", 0) for s in summaries)))
+
+    if args.json is not None:
+        with open(args.json, "w") as fh:
+            json.dump(summaries, fh, indent=2)
+
+    for summary in failed:
+        print("\nFailed: {}\n{}".format(summary["input"], summary["error"]), file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
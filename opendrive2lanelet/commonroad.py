@@ -8,6 +8,11 @@ from lxml import etree, objectify
 from lxml import etree
 from lxml.builder import E
 
+from opendriveparser import instrumentation
+
+from opendrive2lanelet.spatial import SpatialIndex, CenterlineIndex
+from opendrive2lanelet.simplification import simplify_bounds
+
 
 
 class Scenario(object):
@@ -29,6 +34,7 @@ class Scenario(object):
         else:
             raise ScenarioError
 
+    @instrumentation.stage("export_to_string")
     def export_to_string(self, benchmarkId=None, date=None, timeStepSize=None, author=None, affiliation=None, source=None, tags=None):
 
         rootElement = E(
@@ -100,6 +106,11 @@ class Scenario(object):
 
         commonRoadScenarioStr = etree.tostring(rootElement, pretty_print=True, xml_declaration=True, encoding='utf-8')
 
+        report = instrumentation.activeReport()
+
+        if report is not None:
+            report.count("outputBytes", len(commonRoadScenarioStr))
+
         # Make sure the XML is a valid
         schema = etree.XMLSchema(file=open(os.path.dirname(os.path.abspath(__file__)) + "/XML_commonRoad_XSD.xsd", "rb"))
         parser = objectify.makeparser(schema=schema, encoding='utf-8')
@@ -137,12 +148,10 @@ class Scenario(object):
             for pt in lanelet.rightBound.getchildren():
                 right_vertices.append(np.array([float(pt.x), float(pt.y)]))
 
-            center_vertices = [(l + r) / 2 for (l, r) in zip(left_vertices, right_vertices)]
-
             scenario.lanelet_network.add_lanelet(Lanelet(
-                left_vertices=np.array([np.array([x, y]) for x, y in left_vertices]),
-                center_vertices=np.array([np.array([x, y]) for x, y in center_vertices]),
-                right_vertices=np.array([np.array([x, y]) for x, y in right_vertices]),
+                left_vertices=np.array(left_vertices).reshape(-1, 2),
+                center_vertices=None,
+                right_vertices=np.array(right_vertices).reshape(-1, 2),
                 lanelet_id=int(lanelet.attrib['id']),
                 predecessor=[int(el.attrib['ref']) for el in lanelet.iterchildren(tag='predecessor')],
                 successor=[int(el.attrib['ref']) for el in lanelet.iterchildren(tag='successor')],
@@ -163,6 +172,8 @@ class LaneletNetwork(object):
 
     def __init__(self):
         self.lanelets = []
+        self._spatial_index = None
+        self._centerline_index = None
 
     def find_lanelet_by_id(self, lanelet_id):
         for l in self.lanelets:
@@ -179,9 +190,154 @@ class LaneletNetwork(object):
                 self.find_lanelet_by_id(lanelet.lanelet_id)
             except ScenarioError:
                 self.lanelets.append(lanelet)
+
+                if self._spatial_index is not None:
+                    self._spatial_index.add(lanelet.left_vertices, lanelet.right_vertices)
+
+                # The KD-tree can not be updated, it is built again on the next query
+                self._centerline_index = None
             else:
                 raise Exception("Lanelet with id {} already in network.".format(lanelet.lanelet_id))
 
+    @property
+    def spatial_index(self):
+        """ Grid index over the lanelet polygons, created on first use and updated when lanelets are added
+
+        Changes of the vertices of lanelets already in the network are not tracked, call invalidate_spatial_index() after modifying them.
+        """
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex()
+
+            for lanelet in self.lanelets:
+                self._spatial_index.add(lanelet.left_vertices, lanelet.right_vertices)
+
+        return self._spatial_index
+
+    def invalidate_spatial_index(self):
+        self._spatial_index = None
+        self._centerline_index = None
+
+    def set_vertex_storage(self, dtype="float32", origin=None, resolution=0.001):
+        """ Store the vertices of all lanelets compactly, see VertexStorage, dtype None restores float64 arrays
+
+        Without origin, the lower left corner of the network rounded down to full kilometers is the origin.
+        Returns the vertex storage.
+        """
+
+        if dtype is None:
+            storage = None
+        else:
+            if origin is None:
+                vertices = [lanelet.left_vertices for lanelet in self.lanelets] + [lanelet.right_vertices for lanelet in self.lanelets]
+                origin = np.floor(np.min(np.vstack(vertices), axis=0) / 1000.0) * 1000.0 if vertices else (0.0, 0.0)
+
+            storage = VertexStorage(dtype, origin, resolution)
+
+        for lanelet in self.lanelets:
+            lanelet.vertex_storage = storage
+
+        return storage
+
+    def simplify(self, tolerance=0.01):
+        """ Remove vertices of all lanelets which deviate less than tolerance from the simplified bounds
+
+        Returns the number of vertices of all left and right bounds before and after the simplification.
+        """
+
+        before = sum(len(lanelet.left_vertices) + len(lanelet.right_vertices) for lanelet in self.lanelets)
+
+        for lanelet in self.lanelets:
+            lanelet.simplify(tolerance)
+
+        after = sum(len(lanelet.left_vertices) + len(lanelet.right_vertices) for lanelet in self.lanelets)
+
+        self.invalidate_spatial_index()
+
+        report = instrumentation.activeReport()
+
+        if report is not None:
+            report.count("verticesBeforeSimplification", before)
+            report.count("verticesAfterSimplification", after)
+
+        return before, after
+
+    def find_lanelet_by_position(self, point_list):
+        """ Ids of all lanelets containing each of the points, as list of lists """
+
+        point_idx, lanelet_idx = self.spatial_index.query_points(point_list)
+
+        result = [[] for _ in range(len(np.asarray(point_list).reshape(-1, 2)))]
+
+        for p, l in zip(point_idx.tolist(), lanelet_idx.tolist()):
+            result[p].append(self.lanelets[l].lanelet_id)
+
+        return result
+
+    def find_lanelet_indices_by_position(self, point_list):
+        """ Batched point query, returns arrays of point indices and indices into self.lanelets """
+        return self.spatial_index.query_points(point_list)
+
+    def find_lanelets_by_box(self, x_min, y_min, x_max, y_max):
+        """ All lanelets intersecting an axis aligned box """
+        return [self.lanelets[idx] for idx in self.spatial_index.query_box(x_min, y_min, x_max, y_max)]
+
+    @property
+    def centerline_index(self):
+        """ KD-tree over the center line segments, created on first use """
+        if self._centerline_index is None:
+            self._centerline_index = CenterlineIndex(
+                [lanelet.center_vertices for lanelet in self.lanelets],
+                [lanelet.distance for lanelet in self.lanelets]
+            )
+
+        return self._centerline_index
+
+    def project_points(self, point_list):
+        """ Project a batch of points onto the center line of their nearest lanelet
+
+        Returns arrays with the lanelet id, the arc length s along the center line and the lateral offset (positive to the left).
+        """
+
+        lanelet_idx, s, t, _ = self.centerline_index.project(point_list)
+
+        lanelet_ids = np.array([lanelet.lanelet_id for lanelet in self.lanelets] + [-1])
+
+        return lanelet_ids[lanelet_idx], s, t
+
+class VertexStorage(object):
+    """ Compact encoding of vertex arrays relative to an origin, e.g. the corner of a map tile
+
+    dtype float32 stores offsets to the origin as 32 bit floats, dtype fixed as 32 bit integer multiples of
+    resolution (a resolution of 1 mm covers +-2147 km around the origin). Decoded vertices are float64.
+    """
+
+    def __init__(self, dtype="float32", origin=(0.0, 0.0), resolution=0.001):
+        if dtype not in ("float32", "fixed"):
+            raise ValueError("Vertex storage dtype must be float32 or fixed, not {}".format(dtype))
+
+        self.dtype = dtype
+        self.origin = np.array(origin, dtype=float)
+        self.resolution = float(resolution)
+
+    def encode(self, vertices):
+        offsets = np.asarray(vertices, dtype=float).reshape(-1, 2) - self.origin
+
+        if self.dtype == "float32":
+            return offsets.astype(np.float32)
+
+        steps = np.round(offsets / self.resolution)
+
+        if len(steps) and np.abs(steps).max() > np.iinfo(np.int32).max:
+            raise ValueError("Vertices are too far from the origin of the vertex storage")
+
+        return steps.astype(np.int32)
+
+    def decode(self, data):
+        if self.dtype == "float32":
+            return data.astype(float) + self.origin
+
+        return data * self.resolution + self.origin
+
 class Lanelet(object):
 
     def __init__(self, left_vertices, center_vertices, right_vertices,
@@ -189,10 +345,14 @@ class Lanelet(object):
                  predecessor=None, successor=None,
                  adjacent_left=None, adjacent_left_same_direction=None,
                  adjacent_right=None, adjacent_right_same_direction=None,
-                 speed_limit=None):
-        if (len(left_vertices) != len(center_vertices) and
+                 speed_limit=None, vertex_storage=None):
+        if center_vertices is not None and (len(left_vertices) != len(center_vertices) and
                     len(center_vertices) != len(right_vertices)):
             raise ScenarioError
+        self._vertex_storage = vertex_storage
+        self._center_vertices = None
+        self._center_derived = True
+        self._distance = None
         self.left_vertices = left_vertices
         self.center_vertices = center_vertices
         self.right_vertices = right_vertices
@@ -213,12 +373,101 @@ class Lanelet(object):
         self.speed_limit = speed_limit
         self.description = ""
 
-        self.distance = [0]
-        for i in range(1, len(self.center_vertices)):
-            self.distance.append(self.distance[i-1] +
-                                 np.linalg.norm(self.center_vertices[i] -
-                                                self.center_vertices[i-1]))
-        self.distance = np.array(self.distance)
+    # The center line (unless given explicitly) and the distance along it are derived on first access and
+    # cached until the vertices are assigned again; changes inside the arrays are not tracked. With a vertex
+    # storage, the bounds are stored encoded and center line and distance are derived on every access.
+
+    @property
+    def vertex_storage(self):
+        return self._vertex_storage
+
+    @vertex_storage.setter
+    def vertex_storage(self, value):
+        """ Store the vertices with another encoding, None stores plain float64 arrays """
+
+        left_vertices, right_vertices = self.left_vertices, self.right_vertices
+        center_vertices = None if self._center_derived else self.center_vertices
+
+        self._vertex_storage = value
+
+        self.left_vertices = left_vertices
+        self.right_vertices = right_vertices
+        self.center_vertices = center_vertices
+
+    @property
+    def left_vertices(self):
+        if self._vertex_storage is None:
+            return self._left_vertices
+        return self._vertex_storage.decode(self._left_vertices)
+
+    @left_vertices.setter
+    def left_vertices(self, value):
+        self._left_vertices = value if self._vertex_storage is None else self._vertex_storage.encode(value)
+        self._invalidate_derived()
+
+    @property
+    def right_vertices(self):
+        if self._vertex_storage is None:
+            return self._right_vertices
+        return self._vertex_storage.decode(self._right_vertices)
+
+    @right_vertices.setter
+    def right_vertices(self, value):
+        self._right_vertices = value if self._vertex_storage is None else self._vertex_storage.encode(value)
+        self._invalidate_derived()
+
+    def _invalidate_derived(self):
+        if self._center_derived:
+            self._center_vertices = None
+            self._distance = None
+
+    @property
+    def center_vertices(self):
+        if self._vertex_storage is not None:
+            return (self.left_vertices + self.right_vertices) / 2
+
+        if self._center_vertices is None:
+            self._center_vertices = (np.asarray(self._left_vertices, dtype=float) + np.asarray(self._right_vertices, dtype=float)) / 2
+
+        return self._center_vertices
+
+    @center_vertices.setter
+    def center_vertices(self, value):
+        """ Explicit center line, None derives it from the bounds (always the case with a vertex storage) """
+        self._center_derived = value is None or self._vertex_storage is not None
+        self._center_vertices = None if self._center_derived else value
+        self._distance = None
+
+    @property
+    def distance(self):
+        """ Cumulated length of the center line at each vertex """
+
+        if self._distance is None or self._vertex_storage is not None:
+            center_vertices = np.asarray(self.center_vertices, dtype=float).reshape(-1, 2)
+            distance = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(center_vertices, axis=0), axis=1))])
+
+            if self._vertex_storage is not None:
+                return distance
+
+            self._distance = distance
+
+        return self._distance
+
+    @property
+    def vertex_nbytes(self):
+        """ Memory used by the stored vertex arrays """
+        return sum(np.asarray(data).nbytes for data in (self._left_vertices, self._right_vertices, self._center_vertices, self._distance) if data is not None)
+
+    def simplify(self, tolerance):
+        """ Douglas-Peucker simplification of the bounds, left and right bound keep the same vertex indices """
+
+        keep = simplify_bounds([self.left_vertices, self.right_vertices], tolerance)
+
+        center_vertices = None if self._center_derived else np.asarray(self.center_vertices)[keep]
+
+        self.left_vertices = np.asarray(self.left_vertices)[keep]
+        self.right_vertices = np.asarray(self.right_vertices)[keep]
+        self.center_vertices = center_vertices
 
     def calc_width_at_start(self):
         return np.linalg.norm(self.left_vertices[0], self.right_vertices[0])
@@ -245,8 +494,11 @@ class Lanelet(object):
 
         left_vertices = np.vstack((laneletA.left_vertices,
                                    laneletB.left_vertices[1:]))
-        center_vertices = np.vstack((laneletA.center_vertices,
-                                     laneletB.center_vertices[1:]))
+        if laneletA._center_derived and laneletB._center_derived:
+            center_vertices = None
+        else:
+            center_vertices = np.vstack((laneletA.center_vertices,
+                                         laneletB.center_vertices[1:]))
         right_vertices = np.vstack((laneletA.right_vertices,
                                     laneletB.right_vertices[1:]))
         return Lanelet(center_vertices=center_vertices,
@@ -0,0 +1,215 @@
+
+""" Memory report of a conversion
+
+Usage: python -m opendrive2lanelet.memory [--json REPORT] [-o OUTPUT] INPUT
+
+Runs all stages of a conversion with tracemalloc and reports the peak and retained allocations of each stage
+and the memory attributed to the main object families. The XML tree and the output buffers are allocated by
+libxml2, which is invisible to tracemalloc, their size is the change of the resident set size instead.
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+from lxml import etree
+
+from opendriveparser import parse_opendrive
+from opendrive2lanelet.network import Network
+from opendrive2lanelet.commonroad import Scenario
+
+
+def resident_set_size():
+    """ Resident set size of the process in bytes, None if not available on this platform """
+
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryReport(object):
+    """ Allocations of the stages and object families of a conversion, all sizes in bytes """
+
+    def __init__(self):
+        self.stages = []
+        self.families = {}
+        self.counts = {}
+        self.peak = 0
+        self.top_allocations = []
+
+    def add_stage(self, name, allocated, peak, rss):
+        self.stages.append(dict(name=name, allocated=allocated, peak=peak, rss=rss))
+
+    def stage(self, name):
+        return next(stage for stage in self.stages if stage["name"] == name)
+
+    def to_dict(self):
+        return dict(stages=self.stages, families=self.families, counts=self.counts, peak=self.peak, top_allocations=self.top_allocations)
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def __str__(self):
+
+        def mb(value):
+            return "{:10.2f} MB".format(value / 1e6) if value is not None else "         n/a"
+
+        lines = ["Stages:                  retained          peak           rss"]
+
+        for stage in self.stages:
+            lines.append("    {:<20s} {} {} {}".format(stage["name"], mb(stage["allocated"]), mb(stage["peak"]), mb(stage["rss"])))
+
+        lines.append("Object families:")
+
+        for family, size in sorted(self.families.items(), key=lambda item: -(item[1] or 0)):
+            lines.append("    {:<20s} {}".format(family, mb(size)))
+
+        lines.append("Peak of traced allocations: {}".format(mb(self.peak).strip()))
+
+        if self.top_allocations:
+            lines.append("Largest allocation sites:")
+
+            for site in self.top_allocations:
+                lines.append("    {} {}".format(mb(site["size"]), site["location"]))
+
+        return "\n".join(lines)
+
+
+class _StageTracker(object):
+    """ Measures the traced allocations and resident set size between two calls of next_stage
+
+    Before Python 3.9 tracemalloc has no reset_peak, the trace is restarted for each stage instead if restart is
+    set. Memory of previous stages is not traced anymore then, so memory freed by a stage is not subtracted from
+    its retained allocations. Without restart the peaks are the peaks since the start of the trace.
+    """
+
+    def __init__(self, report, restart=True):
+        self.report = report
+        self.restart = restart
+        self._begin()
+
+    def _begin(self):
+        gc.collect()
+
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        elif self.restart:
+            tracemalloc.stop()
+            tracemalloc.start()
+
+        self.current, _ = tracemalloc.get_traced_memory()
+        self.rss = resident_set_size()
+
+    def next_stage(self, name):
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        rss = resident_set_size()
+
+        self.report.peak = max(self.report.peak, peak)
+        self.report.add_stage(name, current - self.current, peak - self.current, rss - self.rss if rss is not None and self.rss is not None else None)
+
+        self._begin()
+
+
+def profile_conversion(input_path, output_path=None, top=10, simplify=None):
+    """ Convert an OpenDRIVE file while tracing all allocations, returns a MemoryReport """
+
+    report = MemoryReport()
+
+    was_tracing = tracemalloc.is_tracing()
+
+    if not was_tracing:
+        tracemalloc.start()
+
+    try:
+        tracker = _StageTracker(report, restart=not was_tracing)
+
+        root = etree.parse(input_path).getroot()
+        tracker.next_stage("parse_xml")
+
+        openDrive = parse_opendrive(root)
+        tracker.next_stage("parse_opendrive")
+
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(openDrive)
+        tracker.next_stage("loadOpenDrive")
+
+        laneletNetwork = roadNetwork.exportLaneletNetwork(filterTypes=['driving', 'onRamp', 'offRamp', 'exit', 'entry'])
+
+        if simplify is not None:
+            laneletNetwork.simplify(simplify)
+
+        tracker.next_stage("exportLaneletNetwork")
+
+        scenario = Scenario(dt=0.1)
+        scenario.lanelet_network = laneletNetwork
+
+        output = scenario.export_to_string()
+        tracker.next_stage("export_to_string")
+
+        if top:
+            statistics = tracemalloc.take_snapshot().statistics("lineno")
+
+            report.top_allocations = [
+                dict(location="{}:{}".format(stat.traceback[0].filename, stat.traceback[0].lineno), size=stat.size, count=stat.count)
+                for stat in statistics[:top]
+            ]
+
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    lanelets = laneletNetwork.lanelets
+
+    vertex_bytes = sum(lanelet.vertex_nbytes for lanelet in lanelets)
+
+    report.families = dict(
+        xml_tree=report.stage("parse_xml")["rss"],
+        road_model=report.stage("parse_opendrive")["allocated"],
+        plane_graph=report.stage("loadOpenDrive")["allocated"],
+        lanelet_vertices=vertex_bytes,
+        lanelet_objects=report.stage("exportLaneletNetwork")["allocated"] - vertex_bytes,
+        output_buffer=report.stage("export_to_string")["rss"] if report.stage("export_to_string")["rss"] is not None else len(output),
+    )
+
+    report.counts = dict(
+        roads=len(openDrive.roads),
+        lanelets=len(lanelets),
+        vertices=sum(len(lanelet.left_vertices) + len(lanelet.right_vertices) for lanelet in lanelets),
+    )
+
+    if output_path is not None:
+        with open(output_path, "wb") as fh:
+            fh.write(output)
+
+    return report
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Report the memory used by the conversion of an OpenDRIVE file.")
+    parser.add_argument("input", help="OpenDRIVE file")
+    parser.add_argument("-o", "--output", default=None, help="also write the CommonRoad file")
+    parser.add_argument("--json", default=None, help="write the report as JSON to this file")
+    parser.add_argument("--top", type=int, default=10, help="number of largest allocation sites to report")
+
+    args = parser.parse_args(argv)
+
+    report = profile_conversion(args.input, args.output, top=args.top)
+
+    print(report)
+
+    if args.json is not None:
+        with open(args.json, "w") as fh:
+            fh.write(report.to_json(indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,17 @@
 
 import copy
+import time
 
 import numpy as np
 
+from opendriveparser import instrumentation
 from opendriveparser.elements.openDrive import OpenDrive
+from opendriveparser.region import linkDependencies
 
 from opendrive2lanelet.plane_elements.plane import PLane
 from opendrive2lanelet.plane_elements.plane_group import PLaneGroup
 from opendrive2lanelet.plane_elements.border import Border
-from opendrive2lanelet.utils import encode_road_section_lane_width_id, decode_road_section_lane_width_id, allCloseToZero
+from opendrive2lanelet.utils import encode_road_section_lane_width_id, decode_road_section_lane_width_id, allCloseToZero, content_hash
 
 from opendrive2lanelet.commonroad import LaneletNetwork, Scenario, ScenarioError
 
@@ -16,50 +19,176 @@ from opendrive2lanelet.commonroad import LaneletNetwork, Scenario, ScenarioError
 class Network(object):
     """ Represents a network of parametric lanes """
 
-    def __init__(self):
+    def __init__(self, incremental=False):
         self._planes = []
         self._linkIndex = None
 
-    def loadOpenDrive(self, openDrive):
-        """ Load all elements of an OpenDRIVE network to a parametric lane representation """
+        # Ids of the roads of a partial conversion, lanelets of other roads are only loaded for their links
+        self._regionRoadIds = None
+
+        # Incremental mode keeps the state of the last load to be able to reconvert only changed roads
+        self._incremental = incremental
+        self._roadHashes = {}
+        self._junctionHashes = {}
+        self._roadPLanes = {}
+        self._laneletCache = {}
+
+    @instrumentation.stage("loadOpenDrive")
+    def loadOpenDrive(self, openDrive, progress=None, cancelToken=None, region=None):
+        """ Load all elements of an OpenDRIVE network to a parametric lane representation
+
+        The optional progress callback and cancellation token are described in opendrive2lanelet.progress,
+        the network is incomplete after a cancellation. With a Region (or a network parsed with one) only
+        the lanelets of the roads in the region are exported.
+        """
 
         if not isinstance(openDrive, OpenDrive):
             raise TypeError()
 
+        if region is not None:
+            openDrive = Network.regionOpenDrive(openDrive, region)
+
+        self._regionRoadIds = openDrive.regionRoadIds
+
         self._linkIndex = self.createLinkIndex(openDrive)
 
+        report = instrumentation.activeReport()
+
         # Convert all parts of a road to parametric lanes (planes)
+        for roadIdx, road in enumerate(openDrive.roads):
+
+            if cancelToken is not None:
+                cancelToken.check()
+
+            if report is not None:
+                roadStart = time.perf_counter()
+
+            pLanes = Network.roadToPLanes(road)
+
+            if report is not None:
+                report.addRoadTime("roadToPLanes", road.id, time.perf_counter() - roadStart)
+
+            self._planes.extend(pLanes)
+
+            if self._incremental:
+                self._roadPLanes[road.id] = pLanes
+                self._roadHashes[road.id] = content_hash(road)
+
+            if progress is not None:
+                progress("roads", roadIdx + 1, len(openDrive.roads))
+
+        if self._incremental:
+            self._junctionHashes = {junction.id: content_hash(junction) for junction in openDrive.junctions}
+            self._laneletCache = {}
+
+    @instrumentation.stage("updateOpenDrive")
+    def updateOpenDrive(self, openDrive):
+        """ Reload a changed version of the last loaded OpenDRIVE network, only roads with changed content are converted again
+
+        Returns the ids of all roads which were converted again.
+        """
+
+        if not isinstance(openDrive, OpenDrive):
+            raise TypeError()
+
+        if not self._incremental or self._linkIndex is None:
+            raise Exception("Incremental update requires a previous load of a network created with incremental=True")
+
+        self._regionRoadIds = openDrive.regionRoadIds
+
+        roadHashes = {road.id: content_hash(road) for road in openDrive.roads}
+        junctionHashes = {junction.id: content_hash(junction) for junction in openDrive.junctions}
+
+        changedRoads = set(roadId for roadId, roadHash in roadHashes.items() if self._roadHashes.get(roadId) != roadHash)
+        removedRoads = set(self._roadHashes) - set(roadHashes)
+        changedJunctions = set(junctionId for junctionId, junctionHash in junctionHashes.items() if self._junctionHashes.get(junctionId) != junctionHash)
+        changedJunctions |= set(self._junctionHashes) - set(junctionHashes)
+
+        # Links of a road also depend on the lane sections of linked roads and junctions
+        dirtyRoads = changedRoads | removedRoads
+        affectedRoads = set(changedRoads)
+
+        for road in openDrive.roads:
+            roadDependencies, junctionDependencies = Network.linkDependencies(openDrive, road)
+
+            if roadDependencies & dirtyRoads or junctionDependencies & changedJunctions:
+                affectedRoads.add(road.id)
+
+        # Convert only changed roads, reuse the parametric lanes of all others
+        planes = []
+
         for road in openDrive.roads:
+            if road.id in changedRoads:
+                self._roadPLanes[road.id] = Network.roadToPLanes(road)
 
-            # The reference border is the base line for the whole road
-            referenceBorder = Network.createReferenceBorder(road.planView, road.lanes.laneOffsets)
+            planes.extend(self._roadPLanes[road.id])
 
-            # A lane section is the smallest part that can be converted at once
-            for laneSection in road.lanes.laneSections:
+        for roadId in removedRoads:
+            del self._roadPLanes[roadId]
 
-                pLanes = Network.laneSectionToPLanes(laneSection, referenceBorder)
+        self._planes = planes
 
-                self._planes.extend(pLanes)
+        # Rebuild the links of all affected roads, the order of both passes is the same as in createLinkIndex
+        for roadId in affectedRoads | removedRoads:
+            self._linkIndex.removeSource(roadId)
+
+        for road in openDrive.roads:
+            if road.id in affectedRoads:
+                Network.addRoadLaneLinks(self._linkIndex, openDrive, road)
+
+        for road in openDrive.roads:
+            if road.id in affectedRoads:
+                Network.addRoadJunctionLinks(self._linkIndex, openDrive, road)
+
+        # Sampled lanelets of changed roads are outdated
+        self._laneletCache = {
+            pLaneId: lanelet for pLaneId, lanelet in self._laneletCache.items()
+            if decode_road_section_lane_width_id(pLaneId)[0] not in dirtyRoads
+        }
+
+        self._roadHashes = roadHashes
+        self._junctionHashes = junctionHashes
+
+        return changedRoads
 
     def addPLane(self, pLane):
         if not isinstance(pLane, PLane):
             raise TypeError()
         self._planes.append(pLane)
 
-    def exportLaneletNetwork(self, filterTypes=None):
-        """ Export lanelet as lanelet network """
+    @instrumentation.stage("exportLaneletNetwork")
+    def exportLaneletNetwork(self, filterTypes=None, progress=None, cancelToken=None):
+        """ Export lanelet as lanelet network
+
+        The optional progress callback and cancellation token are described in opendrive2lanelet.progress.
+        """
+
+        report = instrumentation.activeReport()
 
         # Convert groups to lanelets
         laneletNetwork = LaneletNetwork()
 
-        for pLane in self._planes:
+        for pLaneIdx, pLane in enumerate(self._planes):
+
+            if cancelToken is not None:
+                cancelToken.check()
+
+            if progress is not None:
+                progress("planes", pLaneIdx + 1, len(self._planes))
+
             if filterTypes is not None and pLane.type not in filterTypes:
                 continue
 
-            lanelet = pLane.convertToLanelet()
+            if report is not None:
+                pLaneStart = time.perf_counter()
+
+            lanelet = self.convertPLane(pLane)
+
+            if report is not None:
+                report.addRoadTime("convertPLane", decode_road_section_lane_width_id(pLane.id)[0], time.perf_counter() - pLaneStart)
 
-            lanelet.predecessor = self._linkIndex.getPredecessors(pLane.id)
-            lanelet.successor = self._linkIndex.getSuccessors(pLane.id)
+            lanelet.predecessor = list(self._linkIndex.getPredecessors(pLane.id))
+            lanelet.successor = list(self._linkIndex.getSuccessors(pLane.id))
 
             lanelet.refPLane = pLane
 
@@ -68,6 +197,9 @@ class Network(object):
         # Prune all not existing references
         lanelet_ids = [x.lanelet_id for x in laneletNetwork.lanelets]
 
+        if report is not None:
+            linksBefore = sum(len(lanelet.predecessor) + len(lanelet.successor) for lanelet in laneletNetwork.lanelets)
+
         for lanelet in laneletNetwork.lanelets:
             for predecessor in lanelet.predecessor:
                 if predecessor not in lanelet_ids:
@@ -80,40 +212,42 @@ class Network(object):
             if lanelet.adj_right not in lanelet_ids:
                 lanelet.adj_right = None
 
+        if report is not None:
+            report.count("linksPruned", linksBefore - sum(len(lanelet.predecessor) + len(lanelet.successor) for lanelet in laneletNetwork.lanelets))
+
         # Perform lane merges
         # Condition for lane merge:
         # - Lanelet ends (has no successor or predecessor)
         # - Has an adjacent (left or right) with same type
+        # The ramp is a linear lateral offset of one bound, it is added to the already sampled vertices.
+        # Every merge starts from the vertices of the pLane, so a later merge replaces an earlier one.
+        def mergeLanelet(lanelet, sampledVertices, ref, refDistance):
+            leftDisplacement, rightDisplacement = lanelet.refPLane.calcRefDisplacement(ref=ref, refDistance=refDistance)
+
+            lanelet.left_vertices = sampledVertices[0] + leftDisplacement
+            lanelet.right_vertices = sampledVertices[1] + rightDisplacement
+
         if True:
             for lanelet in laneletNetwork.lanelets:
 
+                if cancelToken is not None:
+                    cancelToken.check()
+
+                sampledVertices = (lanelet.left_vertices, lanelet.right_vertices)
+
                 if len(lanelet.successor) == 0:
 
                     if lanelet.adj_left is not None:
                         adj_left_lanelet = laneletNetwork.find_lanelet_by_id(lanelet.adj_left)
 
-                        newLanelet = lanelet.refPLane.convertToLanelet(
-                            ref="right",
-                            refDistance=[adj_left_lanelet.calc_width_at_end(), 0.0]
-                        )
-
-                        lanelet.left_vertices = newLanelet.left_vertices
-                        lanelet.center_vertices = newLanelet.center_vertices
-                        lanelet.right_vertices = newLanelet.right_vertices
+                        mergeLanelet(lanelet, sampledVertices, "right", [adj_left_lanelet.calc_width_at_end(), 0.0])
 
                         lanelet.successor.extend(adj_left_lanelet.successor)
 
                     if lanelet.adj_right is not None:
                         adj_right_lanelet = laneletNetwork.find_lanelet_by_id(lanelet.adj_right)
 
-                        newLanelet = lanelet.refPLane.convertToLanelet(
-                            ref="left",
-                            refDistance=[-1 * adj_right_lanelet.calc_width_at_end(), 0.0]
-                        )
-
-                        lanelet.left_vertices = newLanelet.left_vertices
-                        lanelet.center_vertices = newLanelet.center_vertices
-                        lanelet.right_vertices = newLanelet.right_vertices
+                        mergeLanelet(lanelet, sampledVertices, "left", [-1 * adj_right_lanelet.calc_width_at_end(), 0.0])
 
                         lanelet.successor.extend(adj_right_lanelet.successor)
 
@@ -122,32 +256,37 @@ class Network(object):
                     if lanelet.adj_left is not None:
                         adj_left_lanelet = laneletNetwork.find_lanelet_by_id(lanelet.adj_left)
 
-                        newLanelet = lanelet.refPLane.convertToLanelet(
-                            ref="right",
-                            refDistance=[0.0, -1 * adj_left_lanelet.calc_width_at_end()]
-                        )
-
-                        lanelet.left_vertices = newLanelet.left_vertices
-                        lanelet.center_vertices = newLanelet.center_vertices
-                        lanelet.right_vertices = newLanelet.right_vertices
+                        mergeLanelet(lanelet, sampledVertices, "right", [0.0, -1 * adj_left_lanelet.calc_width_at_end()])
 
                         lanelet.predecessor.extend(adj_left_lanelet.predecessor)
 
                     if lanelet.adj_right is not None:
                         adj_right_lanelet = laneletNetwork.find_lanelet_by_id(lanelet.adj_right)
 
-                        newLanelet = lanelet.refPLane.convertToLanelet(
-                            ref="left",
-                            refDistance=[0.0, adj_right_lanelet.calc_width_at_end()]
-                        )
-
-                        lanelet.left_vertices = newLanelet.left_vertices
-                        lanelet.center_vertices = newLanelet.center_vertices
-                        lanelet.right_vertices = newLanelet.right_vertices
+                        mergeLanelet(lanelet, sampledVertices, "left", [0.0, adj_right_lanelet.calc_width_at_end()])
 
                         lanelet.predecessor.extend(adj_right_lanelet.predecessor)
 
 
+        # Remove the lanelets of roads outside of the region and all links to them
+        if self._regionRoadIds is not None:
+            laneletNetwork.lanelets = [
+                lanelet for lanelet in laneletNetwork.lanelets
+                if decode_road_section_lane_width_id(lanelet.lanelet_id)[0] in self._regionRoadIds
+            ]
+
+            regionLaneletIds = set(lanelet.lanelet_id for lanelet in laneletNetwork.lanelets)
+
+            for lanelet in laneletNetwork.lanelets:
+                lanelet.predecessor = [x for x in lanelet.predecessor if x in regionLaneletIds]
+                lanelet.successor = [x for x in lanelet.successor if x in regionLaneletIds]
+
+                if lanelet.adj_left not in regionLaneletIds:
+                    lanelet.adj_left = None
+
+                if lanelet.adj_right not in regionLaneletIds:
+                    lanelet.adj_right = None
+
         # Assign an integer id to each lanelet
         def convert_to_new_id(old_lanelet_id):
             if old_lanelet_id in convert_to_new_id.id_assign:
@@ -162,7 +301,7 @@ class Network(object):
         convert_to_new_id.id_assign = {}
         convert_to_new_id.lanelet_id = 100
 
-        for lanelet in laneletNetwork.lanelets:
+        for laneletIdx, lanelet in enumerate(laneletNetwork.lanelets):
             lanelet.description = lanelet.lanelet_id
             lanelet.lanelet_id = convert_to_new_id(lanelet.lanelet_id)
 
@@ -171,25 +310,104 @@ class Network(object):
             lanelet.adj_left = None if lanelet.adj_left is None else convert_to_new_id(lanelet.adj_left)
             lanelet.adj_right = None if lanelet.adj_right is None else convert_to_new_id(lanelet.adj_right)
 
+            if progress is not None:
+                progress("lanelets", laneletIdx + 1, len(laneletNetwork.lanelets))
+
+        if report is not None:
+            report.count("lanelets", len(laneletNetwork.lanelets))
+            report.count("vertices", sum(len(lanelet.left_vertices) + len(lanelet.right_vertices) for lanelet in laneletNetwork.lanelets))
+
         return laneletNetwork
 
-    def exportCommonRoadScenario(self, dt=0.1, benchmark_id=None, filterTypes=None):
-        """ Export a full CommonRoad scenario """
+    def exportCommonRoadScenario(self, dt=0.1, benchmark_id=None, filterTypes=None, simplifyTolerance=None, progress=None, cancelToken=None):
+        """ Export a full CommonRoad scenario, with a tolerance the lanelet bounds are simplified """
 
         scenario = Scenario(
             dt=dt,
             benchmark_id=benchmark_id if benchmark_id is not None else "none"
         )
 
-        scenario.add_objects(self.exportLaneletNetwork(
-            filterTypes=filterTypes if isinstance(filterTypes, list) else ['driving', 'onRamp', 'offRamp', 'exit', 'entry']
-        ))
+        laneletNetwork = self.exportLaneletNetwork(
+            filterTypes=filterTypes if isinstance(filterTypes, list) else ['driving', 'onRamp', 'offRamp', 'exit', 'entry'],
+            progress=progress,
+            cancelToken=cancelToken
+        )
+
+        if simplifyTolerance is not None:
+            laneletNetwork.simplify(simplifyTolerance)
+
+        scenario.add_objects(laneletNetwork)
 
         return scenario
 
+    def convertPLane(self, pLane):
+        """ Sample a pLane to a lanelet, in incremental mode the sampled lanelets are reused """
+
+        report = instrumentation.activeReport()
+
+        if self._incremental and pLane.id in self._laneletCache:
+            if report is not None:
+                report.count("laneletCacheHits")
+
+            # The export modifies the lanelets, hand out a copy
+            return copy.copy(self._laneletCache[pLane.id])
+
+        lanelet = pLane.convertToLanelet()
+
+        if report is not None:
+            report.count("borderSamples", len(lanelet.left_vertices) + len(lanelet.right_vertices))
+
+        if not self._incremental:
+            return lanelet
+
+        self._laneletCache[pLane.id] = lanelet
+
+        return copy.copy(lanelet)
+
     ##############################################################################################
     ## Helper functions
 
+    @staticmethod
+    def roadToPLanes(road):
+        """ Convert all lane sections of a road to a list of planes """
+
+        pLanes = []
+
+        # The reference border is the base line for the whole road
+        referenceBorder = Network.createReferenceBorder(road.planView, road.lanes.laneOffsets)
+
+        # A lane section is the smallest part that can be converted at once
+        for laneSection in road.lanes.laneSections:
+
+            pLanes.extend(Network.laneSectionToPLanes(laneSection, referenceBorder))
+
+        return pLanes
+
+    @staticmethod
+    def linkDependencies(openDrive, road):
+        """ Ids of all roads and junctions the links of a road are built from """
+
+        return linkDependencies(road, openDrive.getJunction)
+
+    @staticmethod
+    def regionOpenDrive(openDrive, region):
+        """ OpenDrive with the roads of a region and all roads their links are built from
+
+        Junctions without roads in the region are skipped, regionRoadIds of the result holds the roads in the region.
+        The roads are selected by the road index, of a lazily parsed network only the selected roads are built.
+        """
+
+        roadIndex = openDrive.roadIndex
+
+        regionRoadIds, roadIds, junctions = region.selectRoads(roadIndex, openDrive.junctions)
+
+        regionOpenDrive = OpenDrive()
+        regionOpenDrive.roads.extend(openDrive.roads[idx] for idx, entry in enumerate(roadIndex) if entry.id in roadIds)
+        regionOpenDrive.junctions.extend(junctions)
+        regionOpenDrive.regionRoadIds = regionRoadIds
+
+        return regionOpenDrive
+
     @staticmethod
     def createReferenceBorder(planView, laneOffsets):
         """ Create the first (most inner) border line for a road, includes the lane Offsets """
@@ -333,159 +551,187 @@ class Network(object):
         return newPLanes
 
     @staticmethod
+    @instrumentation.stage("createLinkIndex")
     def createLinkIndex(openDrive):
         """ Step through all junctions and each single lane to build up a index """
 
-        def add_to_index(linkIndex, pLaneId, successorId, reverse=False):
-            if reverse:
-                linkIndex.addLink(successorId, pLaneId)
-            else:
-                linkIndex.addLink(pLaneId, successorId)
-
         linkIndex = LinkIndex()
 
         # Extract link information from road lanes
         for road in openDrive.roads:
-            for laneSection in road.lanes.laneSections:
-                for lane in laneSection.allLanes:
-                    pLaneId = encode_road_section_lane_width_id(road.id, laneSection.idx, lane.id, -1)
+            Network.addRoadLaneLinks(linkIndex, openDrive, road)
 
-                    # Not the last lane section? > Next lane section in same road
-                    if laneSection.idx < road.lanes.getLastLaneSectionIdx():
+        # Add junctions
+        for road in openDrive.roads:
+            Network.addRoadJunctionLinks(linkIndex, openDrive, road)
 
-                        successorId = encode_road_section_lane_width_id(road.id, laneSection.idx + 1, lane.link.successorId, -1)
+        # for junction in openDrive.junctions:
+        #     for connection in junction.connections:
 
-                        add_to_index(linkIndex, pLaneId, successorId, lane.id >= 0)
+        #         incomingRoad = openDrive.getRoad(connection.incomingRoad)
+        #         connectingRoad = openDrive.getRoad(connection.connectingRoad)
 
-                    # Last lane section! > Next road in first lane section
-                    else:
+        #         if incomingRoad is not None and connectingRoad is not None:
 
-                         # Try to get next road
-                         if road.link.successor is not None and road.link.successor.elementType != "junction":
+        #             for laneLink in connection.laneLinks:
 
-                            nextRoad = openDrive.getRoad(road.link.successor.elementId)
+        #                 pLaneId = encode_road_section_lane_width_id(incomingRoad.id, incomingRoad.lanes.getLastLaneSectionIdx(), laneLink.fromId, -1)
 
-                            if nextRoad is not None:
+        #                 if connection.contactPoint == "end":
+        #                     successorId = encode_road_section_lane_width_id(connectingRoad.id, 0, laneLink.toId, -1)
+        #                 else:
+        #                     successorId = encode_road_section_lane_width_id(connectingRoad.id, connectingRoad.lanes.getLastLaneSectionIdx(), laneLink.toId, -1)
 
-                                if road.link.successor.contactPoint == "start":
-                                    successorId = encode_road_section_lane_width_id(nextRoad.id, 0, lane.link.successorId, -1)
-                                    add_to_index(linkIndex, pLaneId, successorId, lane.id >= 0)
+        #                 add_to_index(linkIndex, pLaneId, successorId, lane.id >= 0)
 
-                                else: # contact point = end
-                                    successorId = encode_road_section_lane_width_id(nextRoad.id, nextRoad.lanes.getLastLaneSectionIdx(), lane.link.successorId, -1)
-                                    add_to_index(linkIndex, pLaneId, successorId, lane.id >= 0)
 
+        report = instrumentation.activeReport()
 
-                    # Not first lane section? > Previous lane section in same road
-                    if laneSection.idx > 0:
-                        predecessorId = encode_road_section_lane_width_id(road.id, laneSection.idx - 1, lane.link.predecessorId, -1)
+        if report is not None:
+            report.count("linksCreated", len(linkIndex))
 
-                        add_to_index(linkIndex, predecessorId, pLaneId, lane.id >= 0)
+        return linkIndex
 
-                    # First lane section! > Previous road
-                    else:
+    @staticmethod
+    def addToLinkIndex(linkIndex, roadId, pLaneId, successorId, reverse=False):
+        """ Add a link to the index, the road is remembered as source of the link """
+        if reverse:
+            linkIndex.addLink(successorId, pLaneId, source=roadId)
+        else:
+            linkIndex.addLink(pLaneId, successorId, source=roadId)
 
-                        # Try to get previous road
-                        if road.link.predecessor is not None and road.link.predecessor.elementType != "junction":
+    @staticmethod
+    def addRoadLaneLinks(linkIndex, openDrive, road):
+        """ Add the links of all lanes of a road to its own lane sections and to the neighbouring roads """
 
-                            prevRoad = openDrive.getRoad(road.link.predecessor.elementId)
+        for laneSection in road.lanes.laneSections:
+            for lane in laneSection.allLanes:
+                pLaneId = encode_road_section_lane_width_id(road.id, laneSection.idx, lane.id, -1)
 
-                            if prevRoad is not None:
+                # Not the last lane section? > Next lane section in same road
+                if laneSection.idx < road.lanes.getLastLaneSectionIdx():
 
-                                if road.link.predecessor.contactPoint == "start":
-                                    predecessorId = encode_road_section_lane_width_id(prevRoad.id, 0, lane.link.predecessorId, -1)
-                                    add_to_index(linkIndex, predecessorId, pLaneId, lane.id >= 0)
+                    successorId = encode_road_section_lane_width_id(road.id, laneSection.idx + 1, lane.link.successorId, -1)
 
-                                else: # contact point = end
-                                    predecessorId = encode_road_section_lane_width_id(prevRoad.id, prevRoad.lanes.getLastLaneSectionIdx(), lane.link.predecessorId, -1)
-                                    add_to_index(linkIndex, predecessorId, pLaneId, lane.id >= 0)
+                    Network.addToLinkIndex(linkIndex, road.id, pLaneId, successorId, lane.id >= 0)
 
-        # Add junctions
-        for road in openDrive.roads:
+                # Last lane section! > Next road in first lane section
+                else:
 
-            # Add junction links to end of road
-            if road.link.successor is not None and road.link.successor.elementType == "junction":
+                     # Try to get next road
+                     if road.link.successor is not None and road.link.successor.elementType != "junction":
 
-                junction = openDrive.getJunction(road.link.successor.elementId)
+                        nextRoad = openDrive.getRoad(road.link.successor.elementId)
 
-                if junction is not None:
+                        if nextRoad is not None:
 
-                    for connection in junction.connections:
+                            if road.link.successor.contactPoint == "start":
+                                successorId = encode_road_section_lane_width_id(nextRoad.id, 0, lane.link.successorId, -1)
+                                Network.addToLinkIndex(linkIndex, road.id, pLaneId, successorId, lane.id >= 0)
 
-                        roadA = openDrive.getRoad(connection.incomingRoad)
-                        roadAcp = "end"
-                        roadB = openDrive.getRoad(connection.connectingRoad)
-                        roadBcp = connection.contactPoint
+                            else: # contact point = end
+                                successorId = encode_road_section_lane_width_id(nextRoad.id, nextRoad.lanes.getLastLaneSectionIdx(), lane.link.successorId, -1)
+                                Network.addToLinkIndex(linkIndex, road.id, pLaneId, successorId, lane.id >= 0)
 
-                        if roadA.id != road.id:
-                            roadA, roadB = [roadB, roadA]
 
-                        for laneLink in connection.laneLinks:
+                # Not first lane section? > Previous lane section in same road
+                if laneSection.idx > 0:
+                    predecessorId = encode_road_section_lane_width_id(road.id, laneSection.idx - 1, lane.link.predecessorId, -1)
 
-                            if roadAcp == "start":
-                                pLaneId = encode_road_section_lane_width_id(roadA.id, 0, laneLink.fromId, -1)
-                            else:
-                                successorId = encode_road_section_lane_width_id(roadA.id, roadA.lanes.getLastLaneSectionIdx(), laneLink.fromId, -1)
+                    Network.addToLinkIndex(linkIndex, road.id, predecessorId, pLaneId, lane.id >= 0)
 
-                            if roadBcp == "start":
-                                pLaneId = encode_road_section_lane_width_id(roadB.id, 0, laneLink.toId, -1)
-                            else:
-                                successorId = encode_road_section_lane_width_id(roadB.id, roadB.lanes.getLastLaneSectionIdx(), laneLink.toId, -1)
+                # First lane section! > Previous road
+                else:
 
-                            add_to_index(linkIndex, pLaneId, successorId, laneLink.fromId < 0)
+                    # Try to get previous road
+                    if road.link.predecessor is not None and road.link.predecessor.elementType != "junction":
 
-            # Add junction links to start of road
-            if road.link.predecessor is not None and road.link.predecessor.elementType == "junction":
+                        prevRoad = openDrive.getRoad(road.link.predecessor.elementId)
 
-                junction = openDrive.getJunction(road.link.predecessor.elementId)
+                        if prevRoad is not None:
 
-                if junction is not None:
+                            if road.link.predecessor.contactPoint == "start":
+                                predecessorId = encode_road_section_lane_width_id(prevRoad.id, 0, lane.link.predecessorId, -1)
+                                Network.addToLinkIndex(linkIndex, road.id, predecessorId, pLaneId, lane.id >= 0)
 
-                    for connection in junction.connections:
+                            else: # contact point = end
+                                predecessorId = encode_road_section_lane_width_id(prevRoad.id, prevRoad.lanes.getLastLaneSectionIdx(), lane.link.predecessorId, -1)
+                                Network.addToLinkIndex(linkIndex, road.id, predecessorId, pLaneId, lane.id >= 0)
 
-                        roadA = openDrive.getRoad(connection.incomingRoad)
-                        roadAcp = "start"
-                        roadB = openDrive.getRoad(connection.connectingRoad)
-                        roadBcp = connection.contactPoint
+    @staticmethod
+    def addRoadJunctionLinks(linkIndex, openDrive, road):
+        """ Add the links between a road and the roads of an adjacent junction """
 
-                        if roadA.id != road.id:
-                            roadA, roadB = [roadB, roadA]
+        # Add junction links to end of road
+        if road.link.successor is not None and road.link.successor.elementType == "junction":
 
-                        for laneLink in connection.laneLinks:
+            junction = openDrive.getJunction(road.link.successor.elementId)
 
-                            if roadAcp == "start":
-                                pLaneId = encode_road_section_lane_width_id(roadA.id, 0, laneLink.fromId, -1)
-                            else:
-                                predecessorId = encode_road_section_lane_width_id(roadA.id, roadA.lanes.getLastLaneSectionIdx(), laneLink.fromId, -1)
+            if junction is not None:
 
-                            if roadBcp == "start":
-                                pLaneId = encode_road_section_lane_width_id(roadB.id, 0, laneLink.toId, -1)
-                            else:
-                                predecessorId = encode_road_section_lane_width_id(roadB.id, roadB.lanes.getLastLaneSectionIdx(), laneLink.toId, -1)
+                for connection in junction.connections:
 
-                            add_to_index(linkIndex, predecessorId, pLaneId, laneLink.fromId < 0)
+                    roadA = openDrive.getRoad(connection.incomingRoad)
+                    roadAcp = "end"
+                    roadB = openDrive.getRoad(connection.connectingRoad)
+                    roadBcp = connection.contactPoint
 
-        # for junction in openDrive.junctions:
-        #     for connection in junction.connections:
+                    # Roads outside of a partially loaded network
+                    if roadA is None or roadB is None:
+                        continue
 
-        #         incomingRoad = openDrive.getRoad(connection.incomingRoad)
-        #         connectingRoad = openDrive.getRoad(connection.connectingRoad)
+                    if roadA.id != road.id:
+                        roadA, roadB = [roadB, roadA]
 
-        #         if incomingRoad is not None and connectingRoad is not None:
+                    for laneLink in connection.laneLinks:
 
-        #             for laneLink in connection.laneLinks:
+                        if roadAcp == "start":
+                            pLaneId = encode_road_section_lane_width_id(roadA.id, 0, laneLink.fromId, -1)
+                        else:
+                            successorId = encode_road_section_lane_width_id(roadA.id, roadA.lanes.getLastLaneSectionIdx(), laneLink.fromId, -1)
 
-        #                 pLaneId = encode_road_section_lane_width_id(incomingRoad.id, incomingRoad.lanes.getLastLaneSectionIdx(), laneLink.fromId, -1)
+                        if roadBcp == "start":
+                            pLaneId = encode_road_section_lane_width_id(roadB.id, 0, laneLink.toId, -1)
+                        else:
+                            successorId = encode_road_section_lane_width_id(roadB.id, roadB.lanes.getLastLaneSectionIdx(), laneLink.toId, -1)
 
-        #                 if connection.contactPoint == "end":
-        #                     successorId = encode_road_section_lane_width_id(connectingRoad.id, 0, laneLink.toId, -1)
-        #                 else:
-        #                     successorId = encode_road_section_lane_width_id(connectingRoad.id, connectingRoad.lanes.getLastLaneSectionIdx(), laneLink.toId, -1)
+                        Network.addToLinkIndex(linkIndex, road.id, pLaneId, successorId, laneLink.fromId < 0)
 
-        #                 add_to_index(linkIndex, pLaneId, successorId, lane.id >= 0)
+        # Add junction links to start of road
+        if road.link.predecessor is not None and road.link.predecessor.elementType == "junction":
 
+            junction = openDrive.getJunction(road.link.predecessor.elementId)
+
+            if junction is not None:
+
+                for connection in junction.connections:
+
+                    roadA = openDrive.getRoad(connection.incomingRoad)
+                    roadAcp = "start"
+                    roadB = openDrive.getRoad(connection.connectingRoad)
+                    roadBcp = connection.contactPoint
+
+                    # Roads outside of a partially loaded network
+                    if roadA is None or roadB is None:
+                        continue
+
+                    if roadA.id != road.id:
+                        roadA, roadB = [roadB, roadA]
+
+                    for laneLink in connection.laneLinks:
+
+                        if roadAcp == "start":
+                            pLaneId = encode_road_section_lane_width_id(roadA.id, 0, laneLink.fromId, -1)
+                        else:
+                            predecessorId = encode_road_section_lane_width_id(roadA.id, roadA.lanes.getLastLaneSectionIdx(), laneLink.fromId, -1)
+
+                        if roadBcp == "start":
+                            pLaneId = encode_road_section_lane_width_id(roadB.id, 0, laneLink.toId, -1)
+                        else:
+                            predecessorId = encode_road_section_lane_width_id(roadB.id, roadB.lanes.getLastLaneSectionIdx(), laneLink.toId, -1)
+
+                        Network.addToLinkIndex(linkIndex, road.id, predecessorId, pLaneId, laneLink.fromId < 0)
 
-        return linkIndex
 
 
 class LinkIndex(object):
@@ -493,14 +739,53 @@ class LinkIndex(object):
 
     def __init__(self):
         self._successors = {}
+        self._sources = {}
+        self._sourceLinks = {}
+
+    def __len__(self):
+        """ Number of links in the index """
+        return sum(len(successors) for successors in self._successors.values())
 
-    def addLink(self, pLaneId, successor):
+    def addLink(self, pLaneId, successor, source=None):
         if pLaneId not in self._successors:
             self._successors[pLaneId] = []
 
         if successor not in self._successors[pLaneId]:
             self._successors[pLaneId].append(successor)
 
+        # Remember which road created the link, the same link can be created by multiple roads
+        if source is not None:
+            self._sources.setdefault((pLaneId, successor), set()).add(source)
+            self._sourceLinks.setdefault(source, set()).add((pLaneId, successor))
+
+    def links(self):
+        """ All links as (pLaneId, successor), in the order they were added """
+        return [(pLaneId, successor) for pLaneId, successors in self._successors.items() for successor in successors]
+
+    def linkSources(self):
+        """ All (pLaneId, successor, source) of links added with a source """
+        return [(pLaneId, successor, source) for (pLaneId, successor), sources in self._sources.items() for source in sorted(sources)]
+
+    def removeSource(self, source):
+        """ Remove all links which were only created by the given source """
+
+        for link in self._sourceLinks.pop(source, ()):
+            sources = self._sources[link]
+            sources.discard(source)
+
+            if sources:
+                continue
+
+            del self._sources[link]
+
+            pLaneId, successor = link
+
+            if pLaneId in self._successors and successor in self._successors[pLaneId]:
+                self._successors[pLaneId].remove(successor)
+
+                if not self._successors[pLaneId]:
+                    del self._successors[pLaneId]
+
     def remove(self, pLaneId):
         # Delete key
         if pLaneId in self._successors:
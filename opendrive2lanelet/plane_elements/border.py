@@ -53,6 +53,77 @@ class Border(object):
         """ Offsets for coeffs """
         return self._coeffsOffsets
 
+    def calcWidths(self, sPos):
+        """ Offsets of the border to its reference for an array of positions, same coefficients as in calc """
+
+        if not self._coeffs or not self._coeffsOffsets:
+            raise Exception("No entries for width definitions.")
+
+        sPos = np.asarray(sPos, dtype=float)
+        offsets = np.array(self._coeffsOffsets, dtype=float)
+
+        # Last offset not after sPos, for equal offsets the first of them, positions before all offsets use the first
+        before = offsets <= sPos[..., np.newaxis]
+        widthIdx = np.where(before.any(axis=-1), len(offsets) - 1 - np.argmax(before[..., ::-1], axis=-1), 0)
+        widthIdx = np.array([self._coeffsOffsets.index(n) for n in self._coeffsOffsets])[widthIdx]
+
+        widths = np.zeros(sPos.shape)
+
+        for idx in np.unique(widthIdx):
+            mask = widthIdx == idx
+            widths[mask] = np.polynomial.polynomial.polyval(sPos[mask] - offsets[idx], self._coeffs[idx])
+
+        return widths
+
+    def _walkReferences(self, sPos, widths=True):
+        """ Plan view at the end of the reference chain, the positions on it and the summed widths of the chain """
+
+        border = self
+        sPos = np.asarray(sPos, dtype=float)
+        distance = np.zeros(sPos.shape)
+
+        while isinstance(border, Border):
+            if widths:
+                distance = distance + border.calcWidths(sPos)
+
+            sPos = sPos + border._refOffset
+            border = border._reference
+
+        if not isinstance(border, PlanView):
+            raise Exception("Reference must be plan view or other lane border.")
+
+        return border, sPos, distance
+
+    def calcReferenceNormals(self, sPos):
+        """ Unit vectors in which an additional offset moves the border, for an array of positions
+
+        These are the normals of the plan view at the end of the reference chain, as used by calc.
+        """
+
+        planView, sPos, _ = self._walkReferences(sPos, widths=False)
+
+        _, d1, _ = planView.calcDerivatives(sPos)
+        tangent = np.arctan2(d1[..., 1], d1[..., 0])
+
+        return np.stack([np.cos(tangent + np.pi / 2), np.sin(tangent + np.pi / 2)], axis=-1)
+
+    def calcPositions(self, sPos, addOffset=0.0):
+        """ Calculate the border for an array of positions, returns the positions and tangents like calc
+
+        addOffset can be a scalar or an array with an offset for every position.
+        """
+
+        planView, sPos, distance = self._walkReferences(sPos)
+        distance = distance + addOffset
+
+        pos, d1, _ = planView.calcDerivatives(sPos)
+        tangent = np.arctan2(d1[..., 1], d1[..., 0])
+
+        # New points are in orthogonal direction
+        ortho = tangent + np.pi / 2
+
+        return pos + np.stack([distance * np.cos(ortho), distance * np.sin(ortho)], axis=-1), tangent
+
     @lru_cache(maxsize=200000)
     def calc(self, sPos, addOffset=0.0):
         """ Calculate the border  """
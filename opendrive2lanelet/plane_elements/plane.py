@@ -91,39 +91,69 @@ class PLane(object):
 
         return np.linalg.norm(innerCoords[0] - outerCoords[0])
 
-    def convertToLanelet(self, precision=0.5, ref=None, refDistance=[0.0, 0.0], refMinDistance=3.0):
-        # Define calculation points
+    def samplePositions(self, precision=0.5):
+        """ Positions along the lane at which convertToLanelet samples the borders """
+
         # TODO dependent on max error
-        numSteps = max(2, np.ceil(self._length / float(precision)))
-        poses = np.linspace(0, self._length, numSteps)
+        numSteps = int(max(2, np.ceil(self._length / float(precision))))
+
+        return np.linspace(0, self._length, numSteps)
+
+    def calcRefDisplacement(self, precision=0.5, ref=None, refDistance=[0.0, 0.0]):
+        """ Displacement of the left and right vertices of convertToLanelet(precision) to get
+        convertToLanelet(precision, ref, refDistance), without sampling the borders again
+        """
+
+        poses = self.samplePositions(precision)
+
+        leftDisplacement = np.zeros((len(poses), 2))
+        rightDisplacement = np.zeros((len(poses), 2))
+
+        if ref is None:
+            return leftDisplacement, rightDisplacement
+
+        # Same linear offset as in convertToLanelet, applied in the normal direction of the borders
+        d = (refDistance[1] - refDistance[0]) / self._length * poses + refDistance[0]
 
-        left_vertices = []
-        right_vertices = []
+        if ref == "left":
+            rightDisplacement = d[:, np.newaxis] * self._outerBorder.calcReferenceNormals(self._outerBorderOffset + poses)
+        elif ref == "right":
+            leftDisplacement = d[:, np.newaxis] * self._innerBorder.calcReferenceNormals(self._innerBorderOffset + poses)
 
-        for pos in poses:
-            if ref is None:
-                left_vertices.append(self.calcInnerBorder(pos)[0])
-                right_vertices.append(self.calcOuterBorder(pos)[0])
-            else:
-                x = pos
-                m = (refDistance[1] - refDistance[0]) / self._length
-                t = refDistance[0]
+        return leftDisplacement, rightDisplacement
 
-                d = m*x + t
+    def sampleBorders(self, precision=0.5, ref=None, refDistance=[0.0, 0.0]):
+        """ Left and right vertices of convertToLanelet, all positions of a border are sampled at once """
 
-                if ref == "left":
-                    left_vertices.append(self.calcInnerBorder(pos)[0])
-                    right_vertices.append(self.calcOuterBorder(pos, d)[0])
-                elif ref == "right":
-                    left_vertices.append(self.calcInnerBorder(pos, d)[0])
-                    right_vertices.append(self.calcOuterBorder(pos)[0])
+        # Define calculation points
+        poses = self.samplePositions(precision)
+
+        innerOffset = 0.0
+        outerOffset = 0.0
+
+        if ref is not None:
+            # Linear offset of one border from refDistance[0] to refDistance[1]
+            d = (refDistance[1] - refDistance[0]) / self._length * poses + refDistance[0]
+
+            if ref == "left":
+                outerOffset = d
+            elif ref == "right":
+                innerOffset = d
+
+        left_vertices, _ = self._innerBorder.calcPositions(self._innerBorderOffset + poses, innerOffset)
+        right_vertices, _ = self._outerBorder.calcPositions(self._outerBorderOffset + poses, outerOffset)
+
+        return left_vertices, right_vertices
+
+    def convertToLanelet(self, precision=0.5, ref=None, refDistance=[0.0, 0.0], refMinDistance=3.0):
 
-        center_vertices = [(l + r) / 2 for (l, r) in zip(left_vertices, right_vertices)]
+        left_vertices, right_vertices = self.sampleBorders(precision, ref, refDistance)
 
+        # The center line is derived from the bounds when it is needed
         return Lanelet(
-            left_vertices=np.array([np.array([x, y]) for x, y in left_vertices]),
-            center_vertices=np.array([np.array([x, y]) for x, y in center_vertices]),
-            right_vertices=np.array([np.array([x, y]) for x, y in right_vertices]),
+            left_vertices=left_vertices,
+            center_vertices=None,
+            right_vertices=right_vertices,
             lanelet_id=self._id
         )
 
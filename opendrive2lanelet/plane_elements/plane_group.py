@@ -1,4 +1,6 @@
 
+import numpy as np
+
 from opendrive2lanelet.commonroad import Lanelet
 
 class PLaneGroup(object):
@@ -39,9 +41,14 @@ class PLaneGroup(object):
     def length(self):
         return sum([x.length for x in self._pLanes])
 
-    def convertToLanelet(self, precision=0.5, ref=None, refDistance=[0.0, 0.0]):
+    def calcRefDisplacement(self, precision=0.5, ref=None, refDistance=[0.0, 0.0]):
+        """ Displacement of the left and right vertices of convertToLanelet(precision) for a linear offset
+        from refDistance[0] to refDistance[1] along the group, see PLane.calcRefDisplacement
+        """
+
+        leftDisplacements = []
+        rightDisplacements = []
 
-        lanelet = None
         y1 = refDistance[0]
         x = 0
 
@@ -50,21 +57,48 @@ class PLaneGroup(object):
             x += pLane.length
             y2 = (refDistance[1] - refDistance[0]) / self.length * x + refDistance[0]
 
-            # First lanelet
-            if lanelet is None:
-                lanelet = pLane.convertToLanelet(precision=precision, ref=ref, refDistance=[y1, y2])
-                lanelet.lanelet_id = self.id
-                continue
+            left, right = pLane.calcRefDisplacement(precision=precision, ref=ref, refDistance=[y1, y2])
+
+            # Following lanelets share their first vertex with the previous one, as in convertToLanelet
+            leftDisplacements.append(left if not leftDisplacements else left[1:])
+            rightDisplacements.append(right if not rightDisplacements else right[1:])
+
+            y1 = y2
+
+        left, right = np.vstack(leftDisplacements), np.vstack(rightDisplacements)
+
+        if self._reverse:
+            return right[::-1], left[::-1]
+
+        return left, right
+
+    def convertToLanelet(self, precision=0.5, ref=None, refDistance=[0.0, 0.0]):
+
+        leftVertices = []
+        rightVertices = []
+
+        y1 = refDistance[0]
+        x = 0
+
+        for pLane in self._pLanes:
+
+            x += pLane.length
+            y2 = (refDistance[1] - refDistance[0]) / self.length * x + refDistance[0]
 
-            # Append all following lanelets
-            newLanelet = pLane.convertToLanelet(precision=precision, ref=ref, refDistance=[y1, y2])
+            left, right = pLane.sampleBorders(precision=precision, ref=ref, refDistance=[y1, y2])
 
-            lanelet = lanelet.concatenate(newLanelet, self.id)
+            # Following lanelets share their first vertex with the previous one
+            leftVertices.append(left if not leftVertices else left[1:])
+            rightVertices.append(right if not rightVertices else right[1:])
 
             y1 = y2
 
-            if lanelet is None:
-                raise Exception("Lanelet concatenation problem")
+        lanelet = Lanelet(
+            left_vertices=np.vstack(leftVertices),
+            center_vertices=None,
+            right_vertices=np.vstack(rightVertices),
+            lanelet_id=self.id
+        )
 
         # Adjacent lanes
         if self.innerNeighbour is not None:
@@ -78,7 +112,7 @@ class PLaneGroup(object):
         if self._reverse:
             newLanelet = Lanelet(
                 left_vertices=lanelet.right_vertices[::-1],
-                center_vertices=lanelet.center_vertices[::-1],
+                center_vertices=None,
                 right_vertices=lanelet.left_vertices[::-1],
                 lanelet_id=lanelet.lanelet_id
             )
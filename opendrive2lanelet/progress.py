@@ -0,0 +1,38 @@
+
+""" Progress reports and cooperative cancellation of a conversion
+
+A progress callback is called as progress(step, done, total) with the steps
+"roads" (loadOpenDrive), "planes" and "lanelets" (exportLaneletNetwork).
+A cancellation token is checked between roads, planes and lanelets:
+
+    token = CancellationToken()
+    # ... token.cancel() from another thread
+    roadNetwork.loadOpenDrive(openDrive, progress=callback, cancelToken=token)
+"""
+
+import threading
+
+
+class ConversionCanceled(Exception):
+    """ Raised by a conversion whose cancellation token was canceled """
+    pass
+
+
+class CancellationToken(object):
+    """ Flag to cancel a running conversion, can be set from any thread """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def canceled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """ Raise ConversionCanceled if the token was canceled """
+
+        if self._event.is_set():
+            raise ConversionCanceled()
@@ -0,0 +1,156 @@
+
+import heapq
+
+import numpy as np
+
+
+class RoutingGraph(object):
+    """ Lane level routing graph of a lanelet network in compressed sparse row (CSR) form
+
+    Nodes are lanelets. Driving from a lanelet to one of its successors costs the length of the lanelet,
+    changing to an adjacent lanelet with the same driving direction costs lane_change_cost.
+    """
+
+    def __init__(self, lanelet_network, lane_change_cost=5.0):
+
+        self.lane_change_cost = float(lane_change_cost)
+
+        lanelets = lanelet_network.lanelets
+
+        self.lanelet_ids = np.array([lanelet.lanelet_id for lanelet in lanelets], dtype=np.int64)
+        self._index = {lanelet_id: idx for idx, lanelet_id in enumerate(self.lanelet_ids.tolist())}
+
+        self.lengths = np.array([lanelet.distance[-1] if len(lanelet.distance) else 0.0 for lanelet in lanelets])
+        self.start_points = np.array([lanelet.center_vertices[0] for lanelet in lanelets]).reshape(-1, 2)
+
+        sources = []
+        targets = []
+        weights = []
+        lane_change_jump = 0.0
+
+        for idx, lanelet in enumerate(lanelets):
+            for successor in lanelet.successor:
+                if successor in self._index:
+                    sources.append(idx)
+                    targets.append(self._index[successor])
+                    weights.append(self.lengths[idx])
+
+            for adjacent, same_direction in [(lanelet.adj_left, lanelet.adj_left_same_direction), (lanelet.adj_right, lanelet.adj_right_same_direction)]:
+                if adjacent is not None and same_direction and adjacent in self._index:
+                    sources.append(idx)
+                    targets.append(self._index[adjacent])
+                    weights.append(self.lane_change_cost)
+
+                    lane_change_jump = max(lane_change_jump, np.linalg.norm(self.start_points[idx] - self.start_points[self._index[adjacent]]))
+
+        sources = np.array(sources, dtype=np.int64)
+        targets = np.array(targets, dtype=np.int64)
+
+        # Explicit zeros are no edges in scipy's sparse graphs
+        weights = np.maximum(np.array(weights, dtype=float), 1e-9)
+
+        # Keep only the cheapest of parallel edges, sorted by source for the CSR layout
+        order = np.lexsort((weights, targets, sources))
+        sources, targets, weights = sources[order], targets[order], weights[order]
+
+        keep = np.ones(len(sources), dtype=bool)
+        keep[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+
+        self.indices = targets[keep]
+        self.weights = weights[keep]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(sources[keep], minlength=len(lanelets)))]).astype(np.int64)
+
+        # Lane changes move sideways without driving, scale the straight line distance to keep the A* heuristic admissible
+        self._heuristic_scale = 1.0 / max(1.0, lane_change_jump / self.lane_change_cost) if self.lane_change_cost > 0 else 0.0
+
+    def __len__(self):
+        return len(self.lanelet_ids)
+
+    def as_csr_matrix(self):
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.weights, self.indices, self.indptr), shape=(len(self), len(self)))
+
+    def _lanelet_index(self, lanelet_id):
+        if lanelet_id not in self._index:
+            raise KeyError("Lanelet {} is not part of the routing graph".format(lanelet_id))
+
+        return self._index[lanelet_id]
+
+    def shortest_path(self, source_id, target_id, use_heuristic=True):
+        """ A* search (Dijkstra without heuristic) between two lanelets
+
+        The heuristic is the straight line distance between the start points of the lanelets.
+        Returns the list of lanelet ids from source to target and the cost, or (None, inf) if there is no route.
+        """
+
+        source = self._lanelet_index(source_id)
+        target = self._lanelet_index(target_id)
+
+        if use_heuristic:
+            heuristic = self._heuristic_scale * np.linalg.norm(self.start_points - self.start_points[target], axis=1)
+        else:
+            heuristic = np.zeros(len(self))
+
+        cost = np.full(len(self), np.inf)
+        predecessor = np.full(len(self), -1, dtype=np.int64)
+        closed = np.zeros(len(self), dtype=bool)
+
+        cost[source] = 0.0
+        queue = [(heuristic[source], source)]
+
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+
+        while queue:
+            _, node = heapq.heappop(queue)
+
+            if closed[node]:
+                continue
+
+            if node == target:
+                break
+
+            closed[node] = True
+
+            for edge in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[edge]
+                new_cost = cost[node] + weights[edge]
+
+                if new_cost < cost[neighbour]:
+                    cost[neighbour] = new_cost
+                    predecessor[neighbour] = node
+                    heapq.heappush(queue, (new_cost + heuristic[neighbour], neighbour))
+
+        if np.isinf(cost[target]):
+            return None, np.inf
+
+        path = [target]
+
+        while path[-1] != source:
+            path.append(predecessor[path[-1]])
+
+        return [int(self.lanelet_ids[node]) for node in path[::-1]], float(cost[target])
+
+    def distances(self, source_ids, target_ids=None, chunk_size=256):
+        """ Route costs from many source lanelets to many target lanelets
+
+        Runs scipy's Dijkstra for chunks of sources at once and returns a matrix of shape (sources, targets),
+        unreachable targets are inf. Without targets, the costs to all lanelets are returned.
+        """
+
+        from scipy.sparse.csgraph import dijkstra
+
+        sources = np.array([self._lanelet_index(lanelet_id) for lanelet_id in source_ids], dtype=np.int64)
+
+        if target_ids is None:
+            targets = np.arange(len(self))
+        else:
+            targets = np.array([self._lanelet_index(lanelet_id) for lanelet_id in target_ids], dtype=np.int64)
+
+        graph = self.as_csr_matrix()
+        result = np.empty((len(sources), len(targets)))
+
+        for start in range(0, len(sources), chunk_size):
+            chunk = sources[start:start + chunk_size]
+            result[start:start + len(chunk)] = dijkstra(graph, directed=True, indices=chunk)[:, targets]
+
+        return result
@@ -0,0 +1,71 @@
+
+import numpy as np
+
+
+def point_segment_distance(points, starts, ends):
+    """ Distance of each point to the segment from start to end, all arrays of shape (n, 2) """
+
+    direction = ends - starts
+    length_sq = np.einsum("ij,ij->i", direction, direction)
+
+    # Projection onto the segment, degenerated segments are points
+    u = np.einsum("ij,ij->i", points - starts, direction) / np.where(length_sq > 0, length_sq, 1.0)
+    u = np.clip(u, 0.0, 1.0)
+
+    return np.linalg.norm(starts + u[:, np.newaxis] * direction - points, axis=1)
+
+
+def simplify_bounds(polylines, tolerance, breaks=None):
+    """ Douglas-Peucker simplification of polylines with the same number of vertices sharing the kept indices
+
+    A vertex is kept if it deviates more than tolerance from the simplified version of any of the polylines,
+    so all polylines stay index aligned. All intervals of one level of the recursion are processed at once.
+    The vertices at the indices in breaks are always kept, so concatenated polylines can be simplified in one call.
+    Returns the sorted indices of the kept vertices.
+    """
+
+    polylines = [np.asarray(polyline, dtype=float) for polyline in polylines]
+    n = len(polylines[0])
+
+    if n <= 2:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+
+    if breaks is not None:
+        keep[breaks] = True
+
+    kept = np.flatnonzero(keep)
+    starts = kept[:-1]
+    ends = kept[1:]
+
+    while len(starts):
+        counts = ends - starts - 1
+        starts, ends, counts = starts[counts > 0], ends[counts > 0], counts[counts > 0]
+
+        if not len(starts):
+            break
+
+        # Indices of all inner vertices of all intervals, grouped by interval
+        interval = np.repeat(np.arange(len(starts)), counts)
+        offsets = np.cumsum(counts) - counts
+        idx = np.arange(counts.sum()) - offsets[interval] + starts[interval] + 1
+
+        deviation = np.zeros(len(idx))
+
+        for polyline in polylines:
+            deviation = np.maximum(deviation, point_segment_distance(polyline[idx], polyline[starts[interval]], polyline[ends[interval]]))
+
+        # Vertex with the largest deviation of each interval
+        order = np.lexsort((-deviation, interval))
+        farthest = order[offsets]
+
+        split = deviation[farthest] > tolerance
+        split_idx = idx[farthest[split]]
+
+        keep[split_idx] = True
+
+        starts, ends = np.concatenate([starts[split], split_idx]), np.concatenate([split_idx, ends[split]])
+
+    return np.flatnonzero(keep)
@@ -0,0 +1,399 @@
+
+import numpy as np
+
+
+class SpatialIndex(object):
+    """ Uniform grid over the quads between left and right bound of lanelets
+
+    A lanelet is split into the quads between two consecutive pairs of left and right vertices,
+    consecutive quads of a lanelet are grouped into boxes and each box is registered in every grid
+    cell its bounding box overlaps. Queries test the bounding boxes of the boxes in the cells they
+    touch, then the bounding boxes of their quads, and run the exact test only on the remaining
+    quads. All tests are vectorized over the whole batch.
+    """
+
+    # Number of candidate pairs tested at once, bounds the memory used by large batches
+    chunk_size = 1000000
+
+    # Number of consecutive quads of a lanelet in a box of the grid
+    quads_per_box = 8
+
+    def __init__(self, cell_size=None):
+        """ Without a cell size, it is derived from the size of the first inserted boxes """
+        self.cell_size = None if cell_size is None else float(cell_size)
+
+        self._quads = np.zeros((0, 4, 2))
+        self._quad_min = np.zeros((0, 2))
+        self._quad_max = np.zeros((0, 2))
+        self._quad_lanelets = np.zeros(0, dtype=np.int64)
+
+        self._box_min = np.zeros((0, 2))
+        self._box_max = np.zeros((0, 2))
+        self._box_first = np.zeros(0, dtype=np.int64)
+        self._box_count = np.zeros(0, dtype=np.int64)
+
+        self._cell_keys = np.zeros(0, dtype=np.int64)
+        self._cell_boxes = np.zeros(0, dtype=np.int64)
+
+        self._num_lanelets = 0
+        self._pending = []
+
+    def __len__(self):
+        return self._num_lanelets + len(self._pending)
+
+    def add(self, left_vertices, right_vertices):
+        """ Add the polygon of a lanelet, returns the index of the lanelet in this index """
+
+        self._pending.append((np.asarray(left_vertices, dtype=float), np.asarray(right_vertices, dtype=float)))
+
+        return len(self) - 1
+
+    def _flush(self):
+        """ Insert all pending lanelets into the grid """
+
+        if not self._pending:
+            return
+
+        quads = []
+        quad_lanelets = []
+
+        for idx, (left_vertices, right_vertices) in enumerate(self._pending):
+            lanelet_idx = self._num_lanelets + idx
+
+            if len(left_vertices) < 2:
+                continue
+
+            quads.append(np.stack([left_vertices[:-1], left_vertices[1:], right_vertices[1:], right_vertices[:-1]], axis=1))
+            quad_lanelets.append(np.full(len(left_vertices) - 1, lanelet_idx, dtype=np.int64))
+
+        self._num_lanelets += len(self._pending)
+        self._pending = []
+
+        if not quads:
+            return
+
+        first_quad = len(self._quads)
+        first_box = len(self._box_first)
+        quads = np.concatenate(quads)
+        quad_min = quads.min(axis=1)
+        quad_max = quads.max(axis=1)
+
+        # Boxes of up to quads_per_box consecutive quads, a box never spans two lanelets
+        quad_counts = np.array([len(lanelet_quads) for lanelet_quads in quad_lanelets])
+        box_counts = (quad_counts + self.quads_per_box - 1) // self.quads_per_box
+
+        box_lanelet_start = np.repeat(np.cumsum(quad_counts) - quad_counts, box_counts)
+        box_local = np.arange(box_counts.sum()) - np.repeat(np.cumsum(box_counts) - box_counts, box_counts)
+
+        box_first = box_lanelet_start + box_local * self.quads_per_box
+        box_count = np.minimum(self.quads_per_box, np.repeat(quad_counts, box_counts) - box_local * self.quads_per_box)
+
+        box_min = np.minimum.reduceat(quad_min, box_first)
+        box_max = np.maximum.reduceat(quad_max, box_first)
+
+        if self.cell_size is None:
+            # Cells about the size of a box keep both the boxes per cell and the cells per box small
+            extent = (box_max - box_min).max(axis=1)
+            self.cell_size = max(1.0, float(np.median(extent)))
+
+        self._quads = np.concatenate([self._quads, quads])
+        self._quad_min = np.concatenate([self._quad_min, quad_min])
+        self._quad_max = np.concatenate([self._quad_max, quad_max])
+        self._quad_lanelets = np.concatenate([self._quad_lanelets] + quad_lanelets)
+
+        self._box_min = np.concatenate([self._box_min, box_min])
+        self._box_max = np.concatenate([self._box_max, box_max])
+        self._box_first = np.concatenate([self._box_first, box_first + first_quad])
+        self._box_count = np.concatenate([self._box_count, box_count])
+
+        # Register each new box in all cells its bounding box overlaps
+        ix0, iy0 = self._cell(box_min)
+        ix1, iy1 = self._cell(box_max)
+
+        nx = ix1 - ix0 + 1
+        ny = iy1 - iy0 + 1
+        counts = nx * ny
+
+        box_idx = np.repeat(np.arange(len(box_first)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        keys = self._key(ix0[box_idx] + local % nx[box_idx], iy0[box_idx] + local // nx[box_idx])
+
+        keys = np.concatenate([self._cell_keys, keys])
+        cell_boxes = np.concatenate([self._cell_boxes, box_idx + first_box])
+
+        order = np.argsort(keys, kind="stable")
+        self._cell_keys = keys[order]
+        self._cell_boxes = cell_boxes[order]
+
+    def _cell(self, points):
+        cells = np.floor(np.asarray(points) / self.cell_size).astype(np.int64)
+        return cells[..., 0], cells[..., 1]
+
+    @staticmethod
+    def _key(ix, iy):
+        return (ix << 32) + (iy & 0xffffffff)
+
+    @staticmethod
+    def _expand(query_idx, start, counts):
+        """ Pairs of (query index, start + offset) for all offsets below the count of each query """
+
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        return np.repeat(query_idx, counts), np.repeat(start, counts) + offsets
+
+    def _candidates(self, keys):
+        """ Pairs of (query index, box index) for all boxes registered in the cells of the keys """
+
+        start = np.searchsorted(self._cell_keys, keys, side="left")
+        end = np.searchsorted(self._cell_keys, keys, side="right")
+
+        query_idx, cell_idx = self._expand(np.arange(len(keys)), start, end - start)
+
+        return query_idx, self._cell_boxes[cell_idx]
+
+    def _box_quads(self, query_idx, box_idx):
+        """ Pairs of (query index, quad index) for all quads of the boxes """
+        return self._expand(query_idx, self._box_first[box_idx], self._box_count[box_idx])
+
+    @staticmethod
+    def _contains(box_min, box_max, points):
+        return (points[:, 0] >= box_min[:, 0]) & (points[:, 0] <= box_max[:, 0]) & (points[:, 1] >= box_min[:, 1]) & (points[:, 1] <= box_max[:, 1])
+
+    def query_points(self, points):
+        """ Find all lanelets containing the points
+
+        Returns two arrays of equal length with the index of the point and the index of a lanelet containing it.
+        """
+
+        self._flush()
+
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+
+        if self.cell_size is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        ix, iy = self._cell(points)
+        point_idx, box_idx = self._candidates(self._key(ix, iy))
+
+        keys = []
+
+        for start in range(0, len(point_idx), self.chunk_size):
+            p = point_idx[start:start + self.chunk_size]
+            b = box_idx[start:start + self.chunk_size]
+
+            # Boxes and quads whose bounding box does not contain the point are skipped without the exact test
+            hit = self._contains(self._box_min[b], self._box_max[b], points[p])
+            p, q = self._box_quads(p[hit], b[hit])
+
+            hit = self._contains(self._quad_min[q], self._quad_max[q], points[p])
+            p, q = p[hit], q[hit]
+
+            inside = self._points_in_quads(points[p], self._quads[q])
+
+            keys.append(p[inside] * self._num_lanelets + self._quad_lanelets[q[inside]])
+
+        # A point can be inside of multiple quads of the same lanelet
+        keys = np.unique(np.concatenate(keys)) if keys else np.zeros(0, dtype=np.int64)
+
+        return keys // self._num_lanelets, keys % self._num_lanelets
+
+    @staticmethod
+    def _points_in_quads(points, corners):
+        """ Crossing number test of every point against the four edges of its quad """
+
+        px = points[:, 0, np.newaxis]
+        py = points[:, 1, np.newaxis]
+
+        x1, y1 = corners[:, :, 0], corners[:, :, 1]
+        x2, y2 = corners[:, [1, 2, 3, 0], 0], corners[:, [1, 2, 3, 0], 1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = ((y1 > py) != (y2 > py)) & (px < (x2 - x1) * (py - y1) / (y2 - y1) + x1)
+
+        return np.count_nonzero(crossing, axis=1) % 2 == 1
+
+    def query_box(self, x_min, y_min, x_max, y_max):
+        """ Find the indices of all lanelets intersecting an axis aligned box """
+
+        self._flush()
+
+        if self.cell_size is None:
+            return np.zeros(0, dtype=np.int64)
+
+        ix0, iy0 = self._cell(np.array([x_min, y_min]))
+        ix1, iy1 = self._cell(np.array([x_max, y_max]))
+
+        # Large boxes touch more cells than there are boxes, test all quads directly
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(self._box_first):
+            quad_idx = np.arange(len(self._quads))
+        else:
+            cx, cy = np.meshgrid(np.arange(ix0, ix1 + 1), np.arange(iy0, iy1 + 1))
+            _, box_idx = self._candidates(self._key(cx.ravel(), cy.ravel()))
+
+            candidates = np.zeros(len(self._box_first), dtype=bool)
+            candidates[box_idx] = True
+            box_idx = np.flatnonzero(candidates)
+
+            _, quad_idx = self._box_quads(box_idx, box_idx)
+
+        quad_min, quad_max = self._quad_min[quad_idx], self._quad_max[quad_idx]
+
+        # Separating axis test: box axes first, quads inside the box overlap without further tests
+        overlap = (quad_max[:, 0] >= x_min) & (quad_min[:, 0] <= x_max) & (quad_max[:, 1] >= y_min) & (quad_min[:, 1] <= y_max)
+        inside = (quad_min[:, 0] >= x_min) & (quad_max[:, 0] <= x_max) & (quad_min[:, 1] >= y_min) & (quad_max[:, 1] <= y_max)
+
+        lanelets = np.zeros(self._num_lanelets, dtype=bool)
+        lanelets[self._quad_lanelets[quad_idx[inside]]] = True
+
+        # Then the edge normals of the quads crossing the border of the box, unless their lanelet is already found
+        border = overlap & ~inside
+        border[border] = ~lanelets[self._quad_lanelets[quad_idx[border]]]
+
+        corners = self._quads[quad_idx[border]]
+
+        box = np.array([[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]])
+        edges = corners[:, [1, 2, 3, 0]] - corners
+        normals = np.stack([-edges[:, :, 1], edges[:, :, 0]], axis=2)
+
+        quad_projections = np.einsum("qnd,qkd->qnk", normals, corners)
+        box_projections = np.einsum("qnd,kd->qnk", normals, box)
+
+        separated = (quad_projections.max(axis=2) < box_projections.min(axis=2)) | \
+                    (quad_projections.min(axis=2) > box_projections.max(axis=2))
+
+        lanelets[self._quad_lanelets[quad_idx[border][~separated.any(axis=1)]]] = True
+
+        return np.flatnonzero(lanelets)
+
+
+class CenterlineIndex(object):
+    """ KD-tree over the center line segments of lanelets for nearest lanelet and Frenet projection queries
+
+    The tree contains the midpoints of all segments. The nearest segment of a point is always within
+    the distance to the nearest segment found so far plus half of the longest segment, points whose
+    k nearest midpoints do not cover this radius are checked again with a radius query.
+    """
+
+    # Number of points projected at once, small chunks keep the temporary arrays in the cache
+    chunk_size = 4096
+
+    def __init__(self, center_lines, distances):
+        from scipy.spatial import cKDTree
+
+        starts = []
+        ends = []
+        offsets = []
+        lanelets = []
+
+        for idx, (center_vertices, distance) in enumerate(zip(center_lines, distances)):
+            center_vertices = np.asarray(center_vertices, dtype=float)
+
+            if len(center_vertices) < 2:
+                continue
+
+            starts.append(center_vertices[:-1])
+            ends.append(center_vertices[1:])
+            offsets.append(np.asarray(distance, dtype=float)[:-1])
+            lanelets.append(np.full(len(center_vertices) - 1, idx, dtype=np.int64))
+
+        self._starts = np.concatenate(starts) if starts else np.zeros((0, 2))
+        self._ends = np.concatenate(ends) if ends else np.zeros((0, 2))
+        self._offsets = np.concatenate(offsets) if offsets else np.zeros(0)
+        self._lanelets = np.concatenate(lanelets) if lanelets else np.zeros(0, dtype=np.int64)
+
+        self._max_half_length = 0.5 * np.linalg.norm(self._ends - self._starts, axis=1).max() if len(self._starts) else 0.0
+        self._tree = cKDTree((self._starts + self._ends) / 2) if len(self._starts) else None
+
+    def _project(self, px, py, segments):
+        """ Project points onto segments, returns the squared distance and the segment parameter """
+
+        ax = self._starts[segments, 0]
+        ay = self._starts[segments, 1]
+        dx = self._ends[segments, 0] - ax
+        dy = self._ends[segments, 1] - ay
+
+        vx = px - ax
+        vy = py - ay
+
+        length_sq = dx * dx + dy * dy
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u = np.clip((vx * dx + vy * dy) / length_sq, 0.0, 1.0)
+
+        u[length_sq == 0] = 0.0
+
+        ex = vx - u * dx
+        ey = vy - u * dy
+
+        return ex * ex + ey * ey, u
+
+    def _nearest(self, points, k):
+        """ Nearest segment and squared distance for each point """
+
+        best_segment = np.zeros(len(points), dtype=np.int64)
+        distance_sq = np.zeros(len(points))
+
+        # Closer segments may exist if their midpoints are outside of the k nearest ones,
+        # query those points again with more neighbours until the result is certain
+        rows = np.arange(len(points))
+
+        while len(rows):
+            k = min(k, len(self._starts))
+            mid_distance, segments = self._tree.query(points[rows], k=k)
+
+            mid_distance = mid_distance.reshape(len(rows), k)
+            segments = segments.reshape(len(rows), k)
+
+            candidate_distance_sq, _ = self._project(points[rows, 0, np.newaxis], points[rows, 1, np.newaxis], segments)
+
+            best = np.argmin(candidate_distance_sq, axis=1)
+            pick = np.arange(len(rows))
+
+            best_segment[rows] = segments[pick, best]
+            distance_sq[rows] = candidate_distance_sq[pick, best]
+
+            if k == len(self._starts):
+                break
+
+            rows = rows[mid_distance[:, -1] < np.sqrt(distance_sq[rows]) + self._max_half_length]
+            k *= 4
+
+        return best_segment, distance_sq
+
+    def project(self, points, k=8):
+        """ Project points onto the nearest center line
+
+        Returns arrays of lanelet index, arc length along the center line, lateral offset and distance.
+        Without any segments all lanelet indices are -1.
+        """
+
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        num_points = len(points)
+
+        if self._tree is None or num_points == 0:
+            return np.full(num_points, -1, dtype=np.int64), np.full(num_points, np.nan), np.full(num_points, np.nan), np.full(num_points, np.inf)
+
+        best_segment = np.zeros(num_points, dtype=np.int64)
+        distance_sq = np.zeros(num_points)
+
+        for start in range(0, num_points, self.chunk_size):
+            chunk = slice(start, start + self.chunk_size)
+            best_segment[chunk], distance_sq[chunk] = self._nearest(points[chunk], k)
+
+        # Arc length and signed lateral offset on the nearest segment, positive offsets are left of the driving direction
+        _, u = self._project(points[:, 0], points[:, 1], best_segment)
+
+        start = self._starts[best_segment]
+        direction = self._ends[best_segment] - start
+        diff = points - start - u[:, np.newaxis] * direction
+
+        distance = np.sqrt(distance_sq)
+        cross = direction[:, 0] * diff[:, 1] - direction[:, 1] * diff[:, 0]
+
+        t = np.where(cross < 0, -distance, distance)
+
+        lanelet_idx = self._lanelets[best_segment]
+        s = self._offsets[best_segment] + u * np.linalg.norm(direction, axis=1)
+
+        return lanelet_idx, s, t, distance
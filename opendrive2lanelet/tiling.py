@@ -0,0 +1,373 @@
+
+""" Conversion of an OpenDRIVE network in spatial tiles
+
+Usage: python -m opendrive2lanelet.tiling [-o OUTPUT_DIR] [--tile-size METERS] [-j JOBS] [--tile IX,IY ...] INPUT
+
+Every road belongs to the square tile containing the center of the bounding box of its plan view. A tile
+is converted together with the roads and junctions its links are built from, the lanelets of these roads
+are removed afterwards and their links become cross-tile links. A worker converts a group of tiles and only
+keeps the elements of the roads needed for its tiles while reading the input. Each tile is written as tile_IX_IY.xml
+with its manifest tile_IX_IY.json, so tiles can also be converted on separate hosts from the same input.
+manifest.json combines the manifests of all tiles in the output directory, which must all have the tile size
+of the run, stitch_links resolves the cross-tile links to (tile, lanelet id) pairs.
+"""
+
+import argparse
+import collections
+import glob
+import json
+import math
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from opendriveparser.elements.openDrive import OpenDrive
+from opendriveparser.region import linkDependencies
+from opendrive2lanelet.network import Network
+from opendrive2lanelet.commonroad import LaneletNetwork, Scenario
+from opendrive2lanelet.utils import decode_road_section_lane_width_id
+
+
+DEFAULT_FILTER_TYPES = ['driving', 'onRamp', 'offRamp', 'exit', 'entry']
+
+
+def tile_name(tile):
+    return "{}_{}".format(*tile)
+
+
+def assign_tiles(openDrive, tile_size):
+    """ Tile (ix, iy) of every road, by the center of the bounding box of its plan view
+
+    Only the road index is used, the roads of a lazily parsed network are not built.
+    """
+
+    tiles = collections.OrderedDict()
+
+    for road in openDrive.roadIndex:
+        x_min, y_min, x_max, y_max = road.boundingBox
+
+        tiles[road.id] = (int(math.floor((x_min + x_max) / 2 / tile_size)), int(math.floor((y_min + y_max) / 2 / tile_size)))
+
+    return tiles
+
+
+class TileIndex(object):
+    """ Roads of every tile and lookups of roads and junctions by id, built once for all tiles of a network """
+
+    def __init__(self, openDrive, road_tiles):
+        self.road_index = openDrive.roadIndex
+        self.road_rows = {entry.id: row for row, entry in enumerate(self.road_index)}
+
+        self.tile_roads = collections.OrderedDict()
+
+        for road_id, tile in road_tiles.items():
+            self.tile_roads.setdefault(tile, []).append(road_id)
+
+        self.junctions = {junction.id: junction for junction in openDrive.junctions}
+
+        # Rows of the junctions of an id and of the junctions connecting a road
+        self.junction_rows = collections.defaultdict(set)
+        self.road_junctions = collections.defaultdict(set)
+
+        for row, junction in enumerate(openDrive.junctions):
+            self.junction_rows[junction.id].add(row)
+
+            for connection in junction.connections:
+                self.road_junctions[connection.incomingRoad].add(row)
+                self.road_junctions[connection.connectingRoad].add(row)
+
+    def road_ids(self, tile):
+        """ Ids of the roads of a tile """
+        return self.tile_roads.get(tuple(tile), [])
+
+    def dependencies(self, road_ids):
+        """ Ids of the roads and rows of the junctions needed to convert the roads, like Region.selectRoads """
+
+        needed_roads = set(road_ids)
+        junction_rows = set()
+
+        for road_id in road_ids:
+            road_dependencies, junction_dependencies = linkDependencies(self.road_index[self.road_rows[road_id]], self.junctions.get)
+
+            needed_roads |= road_dependencies
+            junction_rows |= self.road_junctions.get(road_id, set())
+
+            for junction_id in junction_dependencies:
+                junction_rows |= self.junction_rows.get(junction_id, set())
+
+        return set(road_id for road_id in needed_roads if road_id in self.road_rows), junction_rows
+
+    def needed_road_ids(self, tiles):
+        """ Ids of the roads of the tiles and the roads their links are built from """
+
+        road_ids = set()
+
+        for tile in tiles:
+            road_ids |= self.dependencies(self.road_ids(tile))[0]
+
+        return road_ids
+
+    def tile_open_drive(self, openDrive, tile):
+        """ OpenDrive with the roads and junctions needed to convert a tile, of a lazily parsed network only these roads are built """
+
+        road_ids, junction_rows = self.dependencies(self.road_ids(tile))
+
+        tileOpenDrive = OpenDrive()
+        tileOpenDrive.roads.extend(openDrive.roads[row] for row in sorted(self.road_rows[road_id] for road_id in road_ids))
+        tileOpenDrive.junctions.extend(openDrive.junctions[row] for row in sorted(junction_rows))
+
+        return tileOpenDrive
+
+
+def convert_tile(openDrive, tile, road_tiles, tile_size, filter_types=None, dt=0.1, tile_index=None):
+    """ Convert the roads of one tile, returns the scenario and the manifest of the tile
+
+    road_tiles is the result of assign_tiles for the whole network, tile_index a TileIndex of the network to
+    reuse for several tiles. Of a lazily parsed network only the roads of the tile and the roads their links
+    are built from are built.
+    """
+
+    if tile_index is None:
+        tile_index = TileIndex(openDrive, road_tiles)
+
+    road_ids = tile_index.road_ids(tile)
+
+    # Lanelets of the linked roads of other tiles are needed for the cross-tile links, they are removed below
+    tileOpenDrive = tile_index.tile_open_drive(openDrive, tile)
+
+    roadNetwork = Network()
+    roadNetwork.loadOpenDrive(tileOpenDrive)
+
+    laneletNetwork = roadNetwork.exportLaneletNetwork(filterTypes=filter_types if filter_types is not None else DEFAULT_FILTER_TYPES)
+
+    # The description is the id of the parametric lane, which is the same in all tiles
+    descriptions = {lanelet.lanelet_id: lanelet.description for lanelet in laneletNetwork.lanelets}
+
+    def lanelet_tile(lanelet_id):
+        return road_tiles[decode_road_section_lane_width_id(descriptions[lanelet_id])[0]]
+
+    tileNetwork = LaneletNetwork()
+    links = []
+
+    for lanelet in laneletNetwork.lanelets:
+        if lanelet_tile(lanelet.lanelet_id) != tile:
+            continue
+
+        for kind in ["predecessor", "successor"]:
+            targets = getattr(lanelet, kind)
+
+            for target in [target for target in targets if lanelet_tile(target) != tile]:
+                links.append(dict(lanelet=lanelet.lanelet_id, kind=kind, tile=tile_name(lanelet_tile(target)), target=descriptions[target]))
+                targets.remove(target)
+
+        tileNetwork.add_lanelet(lanelet)
+
+    scenario = Scenario(dt=dt, benchmark_id="none")
+    scenario.add_objects(tileNetwork)
+
+    manifest = dict(
+        tile=tile_name(tile),
+        index=list(tile),
+        tile_size=tile_size,
+        bounds=[tile[0] * tile_size, tile[1] * tile_size, (tile[0] + 1) * tile_size, (tile[1] + 1) * tile_size],
+        file="tile_" + tile_name(tile) + ".xml",
+        roads=len(road_ids),
+        lanelets={lanelet.description: lanelet.lanelet_id for lanelet in tileNetwork.lanelets},
+        links=links,
+    )
+
+    return scenario, manifest
+
+
+def read_open_drive(input_path, road_ids=None):
+    """ Parse an OpenDRIVE file lazily, with road ids only these roads
+
+    The elements of other roads are removed while the file is read, so they are never all in memory at once.
+    """
+
+    from lxml import etree
+
+    from opendriveparser import parse_opendrive
+
+    if road_ids is None:
+        return parse_opendrive(etree.parse(input_path).getroot(), lazy=True)
+
+    road_ids = set(road_ids)
+    context = etree.iterparse(input_path, events=("end",), tag="road")
+
+    for _, element in context:
+        parent = element.getparent()
+
+        if parent is not None and parent.getparent() is None and int(element.get("id")) not in road_ids:
+            parent.remove(element)
+
+    return parse_opendrive(context.root, lazy=True)
+
+
+def convert_tile_group(input_path, output_dir, tiles, tile_size, road_ids=None):
+    """ Parse the input once and convert and write some of its tiles, returns their manifests
+
+    The input is parsed lazily, only the roads needed for the tiles of the group are built. With road_ids,
+    the ids of TileIndex.needed_road_ids of the tiles, only the elements of these roads are kept.
+    """
+
+    openDrive = read_open_drive(input_path, road_ids)
+    road_tiles = assign_tiles(openDrive, tile_size)
+    tile_index = TileIndex(openDrive, road_tiles)
+
+    manifests = []
+
+    for tile in tiles:
+        start = time.time()
+
+        scenario, manifest = convert_tile(openDrive, tuple(tile), road_tiles, tile_size, tile_index=tile_index)
+
+        with open(os.path.join(output_dir, manifest["file"]), "wb") as fh:
+            fh.write(scenario.export_to_string())
+
+        manifest["time"] = time.time() - start
+
+        with open(os.path.join(output_dir, "tile_" + tile_name(tile) + ".json"), "w") as fh:
+            json.dump(manifest, fh, indent=2)
+
+        manifests.append(manifest)
+
+    return manifests
+
+
+def list_tiles(input_path, tile_size):
+    """ All tiles of an OpenDRIVE file containing at least one road """
+
+    return sorted(set(assign_tiles(read_open_drive(input_path), tile_size).values()))
+
+
+def convert_tiles(input_path, output_dir, tile_size=1000.0, jobs=None, tiles=None, report=print):
+    """ Convert all or the given tiles with a pool of worker processes, writes and returns the combined manifest """
+
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    # Fail before converting if the directory holds tiles of another size
+    read_tile_manifests(output_dir, tile_size)
+
+    openDrive = read_open_drive(input_path)
+    road_tiles = assign_tiles(openDrive, tile_size)
+
+    tiles = sorted(set(road_tiles.values())) if tiles is None else [tuple(tile) for tile in tiles]
+
+    jobs = max(1, min(jobs if jobs is not None else (os.cpu_count() or 1), len(tiles) or 1))
+
+    # Every worker parses the input once for a group of tiles and keeps only the roads needed for them
+    tile_index = TileIndex(openDrive, road_tiles)
+    groups = [(group, tile_index.needed_road_ids(group)) for group in [tiles[idx::jobs] for idx in range(jobs)] if group]
+
+    del openDrive, tile_index
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(convert_tile_group, input_path, output_dir, group, tile_size, road_ids) for group, road_ids in groups]
+
+        for future in as_completed(futures):
+            for manifest in future.result():
+                if report is not None:
+                    report("{:8.2f}s  tile {:<12s} roads={:<6d} lanelets={:<7d} cross-tile links={}".format(
+                        manifest["time"], manifest["tile"], manifest["roads"], len(manifest["lanelets"]), len(manifest["links"])))
+
+    return write_manifest(output_dir, tile_size)
+
+
+def read_tile_manifests(output_dir, tile_size):
+    """ Manifests of all tiles in the output directory
+
+    Tiles of other runs with the same tile size are combined, e.g. of runs on other hosts. Tiles of another
+    tile size overlap the tiles of this size and raise a ValueError.
+    """
+
+    tiles = []
+
+    for path in sorted(glob.glob(os.path.join(output_dir, "tile_*.json"))):
+        with open(path) as fh:
+            tile = json.load(fh)
+
+        if tile.get("tile_size") != tile_size:
+            raise ValueError("Tile {} has tile size {}, expected {}, remove the tiles of other runs from {}".format(
+                os.path.basename(path), tile.get("tile_size"), tile_size, output_dir))
+
+        tiles.append(tile)
+
+    return tiles
+
+
+def write_manifest(output_dir, tile_size):
+    """ Combine the manifests of all tiles in the output directory to manifest.json, see read_tile_manifests """
+
+    manifest = dict(tile_size=tile_size, tiles=read_tile_manifests(output_dir, tile_size))
+
+    with open(os.path.join(output_dir, "manifest.json"), "w") as fh:
+        json.dump(manifest, fh, indent=2)
+
+    return manifest
+
+
+def stitch_links(manifest):
+    """ Resolve the cross-tile links of a combined manifest
+
+    Returns a list of (tile, lanelet id, kind, target tile, target lanelet id), links into tiles
+    missing in the manifest are left out.
+    """
+
+    lanelets = {tile["tile"]: tile["lanelets"] for tile in manifest["tiles"]}
+    links = []
+
+    for tile in manifest["tiles"]:
+        for link in tile["links"]:
+            target = lanelets.get(link["tile"], {}).get(link["target"])
+
+            if target is not None:
+                links.append((tile["tile"], link["lanelet"], link["kind"], link["tile"], target))
+
+    return links
+
+
+def main(argv=None):
+
+    def parse_tile(value):
+        ix, iy = value.split(",")
+        return int(ix), int(iy)
+
+    parser = argparse.ArgumentParser(description="Convert an OpenDRIVE file to CommonRoad files of spatial tiles.")
+    parser.add_argument("input", help="OpenDRIVE file")
+    parser.add_argument("-o", "--output-dir", default="tiles", help="directory for the tiles and the manifest")
+    parser.add_argument("--tile-size", type=float, default=1000.0, help="edge length of the tiles in meters")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes (default: number of cores)")
+    parser.add_argument("--tile", type=parse_tile, action="append", default=None, metavar="IX,IY", help="convert only these tiles")
+    parser.add_argument("--list", action="store_true", help="only print the tiles containing roads")
+
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for tile in list_tiles(args.input, args.tile_size):
+            print("{},{}".format(*tile))
+
+        return 0
+
+    start = time.time()
+
+    try:
+        manifest = convert_tiles(args.input, args.output_dir, tile_size=args.tile_size, jobs=args.jobs, tiles=args.tile)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    print("\nConverted tiles in {:.2f}s, manifest has {} tiles and {} cross-tile links".format(
+        time.time() - start,
+        len(manifest["tiles"]),
+        sum(len(tile["links"]) for tile in manifest["tiles"])
+    ))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
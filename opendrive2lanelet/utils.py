@@ -16,3 +16,25 @@ def allCloseToZero(a):
 
     import numpy
     return numpy.allclose(a, numpy.zeros(numpy.shape(a)))
+
+def content_hash(element):
+    """ Hash of the content of a parsed OpenDRIVE element, references to parent elements and cached values are ignored """
+
+    import hashlib
+    import numpy
+
+    def content_key(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(content_key(x) for x in value)
+
+        if isinstance(value, numpy.ndarray):
+            return tuple(value.ravel().tolist())
+
+        if hasattr(value, "__dict__"):
+            return (type(value).__name__, tuple(
+                (name, content_key(attr)) for name, attr in sorted(vars(value).items()) if not name.startswith(("_parent", "_cached"))
+            ))
+
+        return value
+
+    return hashlib.sha1(repr(content_key(element)).encode("utf-8")).hexdigest()
@@ -4,33 +4,60 @@ from scipy.special import fresnel
 
 class EulerSpiral(object):
 
-    def __init__(self, gamma):
+    def __init__(self, gamma, kappa0=0, theta0=0):
         self._gamma = gamma
 
+        # Constants only depending on the start curvature and heading, computed once per spiral
+        self._constantsKey = None
+        self._constants = None
+        self._prepare(kappa0, theta0)
+
     @staticmethod
-    def createFromLengthAndCurvature(length, curvStart, curvEnd):
-        return EulerSpiral(1 * (curvEnd - curvStart) / length)
+    def createFromLengthAndCurvature(length, curvStart, curvEnd, heading=0):
+        return EulerSpiral(1 * (curvEnd - curvStart) / length, curvStart, heading)
+
+    def _prepare(self, kappa0, theta0):
+        """ Start term of the Fresnel integrals (Sb, Cb) and the complex factor Cs1 """
+
+        if self._constantsKey == (kappa0, theta0):
+            return self._constants
+
+        if self._gamma == 0:
+            self._constants = None
+        else:
+            scale = 1 / np.sqrt(np.pi * np.abs(self._gamma))
+            Sb, Cb = fresnel(kappa0 * scale)
+            Cs1 = np.sqrt(np.pi / np.abs(self._gamma)) * np.exp(1j * (theta0 - kappa0**2 / 2 / self._gamma))
+
+            self._constants = (scale, Sb, Cb, Cs1)
+
+        self._constantsKey = (kappa0, theta0)
+
+        return self._constants
 
     def calc(self, s, x0=0, y0=0, kappa0=0, theta0=0):
+        """ Position and tangent at s, which can be a single value or an array """
+
+        s = np.asarray(s, dtype=float)
 
         # Start
         C0 = x0 + 1j * y0
 
         if self._gamma == 0 and kappa0 == 0:
             # Straight line
-            Cs = C0 + np.exp(1j * theta0 * s)
+            Cs = C0 + s * np.exp(1j * theta0)
 
         elif self._gamma == 0 and kappa0 != 0:
             # Arc
             Cs = C0 + np.exp(1j * theta0) / kappa0 * (np.sin(kappa0 * s) + 1j * (1 - np.cos(kappa0 * s)))
 
         else:
-            # Fresnel integrals
-            Sa, Ca = fresnel((kappa0 + self._gamma * s) / np.sqrt(np.pi * np.abs(self._gamma)))
-            Sb, Cb = fresnel(kappa0 / np.sqrt(np.pi * np.abs(self._gamma)))
+            scale, Sb, Cb, Cs1 = self._prepare(kappa0, theta0)
+
+            # Fresnel integrals, evaluated once for all s
+            Sa, Ca = fresnel((kappa0 + self._gamma * s) * scale)
 
             # Euler Spiral
-            Cs1 = np.sqrt(np.pi / np.abs(self._gamma)) * np.exp(1j * (theta0 - kappa0**2 / 2 / self._gamma))
             Cs2 = np.sign(self._gamma) * (Ca - Cb) + 1j * Sa - 1j * Sb
 
             Cs = C0 + Cs1 * Cs2
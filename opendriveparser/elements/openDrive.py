@@ -1,4 +1,9 @@
 
+import collections.abc
+
+from opendriveparser.elements.roadLink import Link
+
+
 class OpenDrive(object):
 
     def __init__(self):
@@ -9,6 +14,11 @@ class OpenDrive(object):
         self._junctionGroups = []
         self._stations = []
 
+        # Ids of the roads of interest, the other roads are only needed for their links
+        self._regionRoadIds = None
+
+        self._cachedSampleIndex = None
+
     @property
     def header(self):
         return self._header
@@ -17,13 +27,82 @@ class OpenDrive(object):
     def roads(self):
         return self._roads
 
+    @roads.setter
+    def roads(self, value):
+        if not isinstance(value, (list, LazyRoads)):
+            raise TypeError("Value must be a list or LazyRoads")
+
+        self._roads = value
+
+    @property
+    def roadIndex(self):
+        """ Id, name, junction id, length, links and bounding box of all roads, without building lazily parsed roads """
+
+        if isinstance(self._roads, LazyRoads):
+            return self._roads.entries
+
+        return [RoadIndexEntry.fromRoad(road) for road in self._roads]
+
     def getRoad(self, id):
+        if isinstance(self._roads, LazyRoads):
+            return self._roads.getRoad(id)
+
         for road in self._roads:
             if road.id == id:
                 return road
 
         return None
 
+    def xyToRoadST(self, points, sampleDistance=1.0):
+        """ Project an array of world points onto the reference line of their nearest road
+
+        The road and start value are taken from the nearest point sampled along all reference lines,
+        then refined on the exact geometry of that road. Returns arrays of road id, s and t.
+        """
+
+        import numpy as np
+        from scipy.spatial import cKDTree
+
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+
+        if self._cachedSampleIndex is None or self._cachedSampleIndex[0] != (sampleDistance, len(self._roads)):
+            roadIdx = []
+            sSamples = []
+            samples = []
+
+            for idx, road in enumerate(self._roads):
+                roadSSamples, roadSamples = road.planView.calcSamples(sampleDistance)
+
+                roadIdx.append(np.full(len(roadSSamples), idx))
+                sSamples.append(roadSSamples)
+                samples.append(roadSamples)
+
+            self._cachedSampleIndex = ((sampleDistance, len(self._roads)), np.concatenate(roadIdx), np.concatenate(sSamples), cKDTree(np.concatenate(samples)))
+
+        _, sampleRoadIdx, sSamples, tree = self._cachedSampleIndex
+        _, nearest = tree.query(points)
+
+        roadIdx = sampleRoadIdx[nearest]
+
+        roadIds = np.array([road.id for road in self._roads])[roadIdx]
+        sPos = np.zeros(len(points))
+        tPos = np.zeros(len(points))
+
+        for idx in np.unique(roadIdx):
+            mask = roadIdx == idx
+            sPos[mask], tPos[mask], _ = self._roads[idx].planView.xyToST(points[mask], sStart=sSamples[nearest[mask]], sampleDistance=sampleDistance)
+
+        return roadIds, sPos, tPos
+
+    @property
+    def regionRoadIds(self):
+        """ Ids of the roads in the region of a partial conversion, None if all roads are of interest """
+        return self._regionRoadIds
+
+    @regionRoadIds.setter
+    def regionRoadIds(self, value):
+        self._regionRoadIds = None if value is None else set(value)
+
     @property
     def controllers(self):
         return self._controllers
@@ -47,6 +126,88 @@ class OpenDrive(object):
         return self._stations
 
 
+class RoadIndexEntry(object):
+    """ Attributes and links of a road, known without building the road """
+
+    def __init__(self, id, name, junctionId, length, element=None, boundingBox=None):
+        self.id = id
+        self.name = name
+        self.junctionId = junctionId
+        self.length = length
+        self.link = Link()
+
+        # Bounding box of the plan view, see PlanView.getBoundingBox
+        self.boundingBox = boundingBox
+
+        # XML element the road is built from
+        self.element = element
+
+    @staticmethod
+    def fromRoad(road):
+        entry = RoadIndexEntry(road.id, road.name, road.junction.id if road.junction is not None else None, road.length, boundingBox=road.planView.getBoundingBox())
+        entry.link = road.link
+
+        return entry
+
+
+class LazyRoads(collections.abc.MutableSequence):
+    """ List of roads which are built from their index entries the first time they are accessed """
+
+    def __init__(self, entries, materialize):
+        self._entries = list(entries)
+        self._roads = [None] * len(self._entries)
+        self._materialize = materialize
+
+    @property
+    def entries(self):
+        return self._entries
+
+    @property
+    def materialized(self):
+        """ Number of roads which have been built """
+        return sum(1 for road in self._roads if road is not None)
+
+    def getRoad(self, id):
+        for idx, entry in enumerate(self._entries):
+            if entry.id == id:
+                return self[idx]
+
+        return None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+
+        if self._roads[idx] is None:
+            self._roads[idx] = self._materialize(self._entries[idx].element)
+
+        return self._roads[idx]
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __setitem__(self, idx, road):
+        if isinstance(idx, slice):
+            roads = list(road)
+            self._entries[idx] = [RoadIndexEntry.fromRoad(x) for x in roads]
+            self._roads[idx] = roads
+        else:
+            self._entries[idx] = RoadIndexEntry.fromRoad(road)
+            self._roads[idx] = road
+
+    def __delitem__(self, idx):
+        del self._entries[idx]
+        del self._roads[idx]
+
+    def insert(self, idx, road):
+        self._entries.insert(idx, RoadIndexEntry.fromRoad(road))
+        self._roads.insert(idx, road)
+
+
 class Header(object):
 
     def __init__(self):
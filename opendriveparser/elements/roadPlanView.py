@@ -1,5 +1,8 @@
 
 import abc
+import bisect
+import math
+
 import numpy as np
 
 from opendriveparser.elements.eulerspiral import EulerSpiral
@@ -9,18 +12,28 @@ class PlanView(object):
 
     def __init__(self):
         self._geometries = []
+        self._cachedSamples = None
+        self._cachedSampleTree = None
 
     def addLine(self, startPosition, heading, length):
         self._geometries.append(Line(startPosition, heading, length))
+        self._cachedSamples = None
 
     def addSpiral(self, startPosition, heading, length, curvStart, curvEnd):
         self._geometries.append(Spiral(startPosition, heading, length, curvStart, curvEnd))
+        self._cachedSamples = None
 
     def addArc(self, startPosition, heading, length, curvature):
         self._geometries.append(Arc(startPosition, heading, length, curvature))
+        self._cachedSamples = None
+
+    def addPoly3(self, startPosition, heading, length, a, b, c, d):
+        self._geometries.append(Poly3(startPosition, heading, length, a, b, c, d))
+        self._cachedSamples = None
 
     def addParamPoly3(self, startPosition, heading, length, aU, bU, cU, dU, aV, bV, cV, dV, pRange):
         self._geometries.append(ParamPoly3(startPosition, heading, length, aU, bU, cU, dU, aV, bV, cV, dV, pRange))
+        self._cachedSamples = None
 
     def getLength(self):
         """ Get length of whole plan view """
@@ -32,6 +45,31 @@ class PlanView(object):
 
         return length
 
+    def getBoundingBox(self):
+        """ Box (xMin, yMin, xMax, yMax) containing the whole reference line """
+
+        return PlanView.geometryBoundingBox(
+            [geometry.getStartPosition() for geometry in self._geometries],
+            [geometry.getLength() for geometry in self._geometries]
+        )
+
+    @staticmethod
+    def geometryBoundingBox(startPositions, lengths):
+        """ Box (xMin, yMin, xMax, yMax) containing all geometries given by their start points and lengths
+
+        A geometry never leaves the circle of its length around its start point.
+        """
+
+        starts = np.asarray(startPositions, dtype=float).reshape(-1, 2)
+        lengths = np.asarray(lengths, dtype=float)
+
+        return (
+            float((starts[:, 0] - lengths).min()),
+            float((starts[:, 1] - lengths).min()),
+            float((starts[:, 0] + lengths).max()),
+            float((starts[:, 1] + lengths).max())
+        )
+
     def calc(self, sPos):
         """ Calculate position and tangent at sPos """
 
@@ -46,6 +84,105 @@ class PlanView(object):
 
         # raise Exception("Tried to calculate a position outside of the borders of the reference path at s=" + str(sPos) + " but path has only length of l=" + str(self.getLength()))
 
+    def calcDerivatives(self, sPos):
+        """ Calculate positions, first and second derivative by s for an array of s positions
+
+        Positions outside of the plan view are clipped to its start or end.
+        """
+
+        sPos = np.asarray(sPos, dtype=float)
+
+        lengths = np.array([geometry.getLength() for geometry in self._geometries])
+        starts = np.concatenate([[0.0], np.cumsum(lengths)[:-1]])
+
+        sPos = np.clip(sPos, 0.0, starts[-1] + lengths[-1])
+        geometryIdx = np.clip(np.searchsorted(starts, sPos, side="right") - 1, 0, len(self._geometries) - 1)
+
+        pos = np.zeros(sPos.shape + (2,))
+        d1 = np.zeros(sPos.shape + (2,))
+        d2 = np.zeros(sPos.shape + (2,))
+
+        for idx in np.unique(geometryIdx):
+            mask = geometryIdx == idx
+            pos[mask], d1[mask], d2[mask] = self._geometries[idx].calcDerivatives(np.minimum(sPos[mask] - starts[idx], lengths[idx]))
+
+        return pos, d1, d2
+
+    def stToXY(self, sPos, tPos):
+        """ Convert arrays of road coordinates (s along the reference line, t to the left of it) to world coordinates """
+
+        pos, d1, _ = self.calcDerivatives(sPos)
+
+        heading = np.arctan2(d1[..., 1], d1[..., 0])
+        tPos = np.asarray(tPos, dtype=float)
+
+        return pos + np.stack([-np.sin(heading) * tPos, np.cos(heading) * tPos], axis=-1)
+
+    def calcSamples(self, sampleDistance=1.0):
+        """ Sample the reference line with a maximum distance between two samples, returns s positions and points """
+
+        if self._cachedSamples is None or self._cachedSamples[0] != sampleDistance:
+            sSamples = np.linspace(0.0, self.getLength(), max(2, int(np.ceil(self.getLength() / sampleDistance)) + 1))
+            self._cachedSamples = (sampleDistance, sSamples, self.calcDerivatives(sSamples)[0])
+            self._cachedSampleTree = None
+
+        return self._cachedSamples[1], self._cachedSamples[2]
+
+    def xyToST(self, points, sStart=None, sampleDistance=1.0, maxIterations=20, tolerance=1e-9):
+        """ Project an array of world points onto the reference line
+
+        Without start values, the start value for each point is the nearest of the points sampled along the
+        reference line. It is refined with Newton iterations on the exact geometry of the reference line.
+        Returns arrays of s, t (positive to the left) and the distance to the reference line.
+        """
+
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+
+        sSamples, samples = self.calcSamples(sampleDistance)
+
+        if sStart is None:
+            if self._cachedSampleTree is None:
+                from scipy.spatial import cKDTree
+                self._cachedSampleTree = cKDTree(samples)
+
+            _, nearest = self._cachedSampleTree.query(points)
+            sPos = sSamples[nearest]
+        else:
+            sPos = np.array(sStart, dtype=float).reshape(-1)
+
+        maxStep = sSamples[1] - sSamples[0]
+        length = sSamples[-1]
+
+        # Newton iterations on the derivative of the squared distance f(s) = (P(s) - X) * P'(s)
+        active = np.arange(len(points))
+
+        for _ in range(maxIterations):
+            if not len(active):
+                break
+
+            pos, d1, d2 = self.calcDerivatives(sPos[active])
+            diff = pos - points[active]
+
+            f = np.einsum("ij,ij->i", diff, d1)
+            df = np.einsum("ij,ij->i", d1, d1) + np.einsum("ij,ij->i", diff, d2)
+
+            # Fall back to a gradient step where the distance is not convex
+            step = np.where(df > 1e-12, f / np.where(df > 1e-12, df, 1.0), f / np.einsum("ij,ij->i", d1, d1))
+            step = np.clip(step, -maxStep, maxStep)
+
+            sPos[active] = np.clip(sPos[active] - step, 0.0, length)
+            active = active[np.abs(step) > tolerance]
+
+        pos, d1, _ = self.calcDerivatives(sPos)
+        diff = points - pos
+
+        distance = np.linalg.norm(diff, axis=1)
+        cross = d1[:, 0] * diff[:, 1] - d1[:, 1] * diff[:, 0]
+
+        tPos = np.where(cross < 0, -distance, distance)
+
+        return sPos, tPos, distance
+
 class Geometry(object):
     __metaclass__ = abc.ABCMeta
 
@@ -64,6 +201,11 @@ class Geometry(object):
         """ Calculates the position of the geometry as if the starting point is (0/0) """
         return
 
+    @abc.abstractmethod
+    def calcDerivatives(self, s):
+        """ Calculates positions, first and second derivatives by s for an array of s positions """
+        return
+
 class Line(Geometry):
 
     def __init__(self, startPosition, heading, length):
@@ -83,6 +225,14 @@ class Line(Geometry):
 
         return (pos, tangent)
 
+    def calcDerivatives(self, s):
+        s = np.asarray(s, dtype=float)[..., np.newaxis]
+        direction = np.array([np.cos(self.heading), np.sin(self.heading)])
+
+        pos = self.startPosition + s * direction
+
+        return (pos, np.broadcast_to(direction, pos.shape).copy(), np.zeros(pos.shape))
+
 class Arc(Geometry):
 
     def __init__(self, startPosition, heading, length, curvature):
@@ -112,6 +262,20 @@ class Arc(Geometry):
 
         return (pos, tangent)
 
+    def calcDerivatives(self, s):
+        s = np.asarray(s, dtype=float)
+        c = self.curvature
+
+        theta = self.heading + s * c
+        d1 = np.stack([np.cos(theta), np.sin(theta)], axis=-1)
+
+        pos = self.startPosition + np.stack([
+            (np.sin(theta) - np.sin(self.heading)) / c,
+            (np.cos(self.heading) - np.cos(theta)) / c
+        ], axis=-1)
+
+        return (pos, d1, c * np.stack([-d1[..., 1], d1[..., 0]], axis=-1))
+
 class Spiral(Geometry):
 
     def __init__(self, startPosition, heading, length, curvStart, curvEnd):
@@ -121,7 +285,7 @@ class Spiral(Geometry):
         self._curvStart = curvStart
         self._curvEnd = curvEnd
 
-        self._spiral = EulerSpiral.createFromLengthAndCurvature(self._length, self._curvStart, self._curvEnd)
+        self._spiral = EulerSpiral.createFromLengthAndCurvature(self._length, self._curvStart, self._curvEnd, self._heading)
 
     def getStartPosition(self):
         return self._startPosition
@@ -134,42 +298,138 @@ class Spiral(Geometry):
 
         return (np.array([x, y]), t)
 
-class Poly3(Geometry):
+    def calcDerivatives(self, s):
+        s = np.asarray(s, dtype=float)
 
-    def __init__(self, startPosition, heading, length, a, b, c, d):
-        self._startPosition = np.array(startPosition)
-        self._heading = heading
-        self._length = length
-        self._a = a
-        self._b = b
-        self._c = c
-        self._d = d
+        (x, y, theta) = self._spiral.calc(s, self._startPosition[0], self._startPosition[1], self._curvStart, self._heading)
 
-        raise NotImplementedError()
+        d1 = np.stack([np.cos(theta), np.sin(theta)], axis=-1)
+        curvature = (self._curvStart + (self._curvEnd - self._curvStart) / self._length * s)[..., np.newaxis]
 
-    def getStartPosition(self):
-        return self._startPosition
+        return (np.stack([x, y], axis=-1), d1, curvature * np.stack([-d1[..., 1], d1[..., 0]], axis=-1))
 
-    def getLength(self):
-        return self._length
+class CubicArcLength(object):
+    """ Arc length table of a planar curve (u(p), v(p)) with cubic polynomials, maps arc lengths back to p
 
-    def calcPosition(self, s):
-        # TODO untested
+    The arc length between the table knots is integrated with a Gauss-Legendre quadrature. An arc length
+    is mapped to p with a cubic Hermite interpolation of the table, followed by a Newton step on the exact
+    arc length.
+    """
+
+    # 5 point Gauss-Legendre quadrature on [0, 1]
+    gaussNodes = (np.polynomial.legendre.leggauss(5)[0] + 1) / 2
+    gaussWeights = np.polynomial.legendre.leggauss(5)[1] / 2
+
+    def __init__(self, coeffsU, coeffsV, pMax, numIntervals):
+        self._coeffs = np.array([coeffsU, coeffsV], dtype=float)
+        self._dCoeffs = self._coeffs[:, 1:] * np.arange(1, 4)
+        self._ddCoeffs = self._dCoeffs[:, 1:] * np.arange(1, 3)
+
+        self._pKnots = np.linspace(0.0, pMax, numIntervals + 1)
+        self._sKnots = np.concatenate([[0.0], np.cumsum(self._integrate(self._pKnots[:-1], self._pKnots[1:]))])
+        self._dpdsKnots = 1.0 / np.maximum(self.speed(self._pKnots), 1e-12)
+
+        # Plain floats for the evaluation of single values without numpy overhead
+        self._sKnotsList = self._sKnots.tolist()
+        self._pKnotsList = self._pKnots.tolist()
+        self._dpdsKnotsList = self._dpdsKnots.tolist()
+        self._dCoeffsList = self._dCoeffs.tolist()
+        self._gaussList = list(zip(self.gaussNodes.tolist(), self.gaussWeights.tolist()))
+
+    @property
+    def length(self):
+        return self._sKnots[-1]
+
+    @staticmethod
+    def _horner(coeffs, p):
+        result = coeffs[..., -1, np.newaxis] * np.ones_like(p)
+
+        for idx in range(coeffs.shape[-1] - 2, -1, -1):
+            result = result * p + coeffs[..., idx, np.newaxis]
+
+        return result
+
+    def evaluate(self, p):
+        """ Points, first and second derivatives by p, each of shape (2, n) """
+
+        p = np.asarray(p, dtype=float)
+
+        return self._horner(self._coeffs, p), self._horner(self._dCoeffs, p), self._horner(self._ddCoeffs, p)
+
+    def speed(self, p):
+        d = self._horner(self._dCoeffs, np.asarray(p, dtype=float))
+        return np.hypot(d[0], d[1])
+
+    def _integrate(self, pStart, pEnd):
+        """ Arc length between arrays of parameters """
+
+        width = pEnd - pStart
+        nodes = pStart[:, np.newaxis] + width[:, np.newaxis] * self.gaussNodes
+
+        return width * (self.speed(nodes.ravel()).reshape(nodes.shape).dot(self.gaussWeights))
+
+    def parameter(self, s):
+        """ Parameter p of an array of arc lengths, arc lengths are clipped to the curve """
+
+        s = np.clip(np.asarray(s, dtype=float), 0.0, self.length)
 
-        # Calculate new point in s/t coordinate system
-        coeffs = [self._a, self._b, self._c, self._d]
+        idx = np.clip(np.searchsorted(self._sKnots, s, side="right") - 1, 0, len(self._sKnots) - 2)
 
-        t = np.polynomial.polynomial.polyval(s, coeffs)
+        # Cubic Hermite interpolation of p(s), dp/ds is the inverse speed
+        s0, s1 = self._sKnots[idx], self._sKnots[idx + 1]
+        h = s1 - s0
+        t = (s - s0) / np.where(h > 0, h, 1.0)
 
-        # Rotate and translate
-        srot = s * np.cos(self._heading) - t * np.sin(self._heading)
-        trot = s * np.sin(self._heading) + t * np.cos(self._heading)
+        p = (2 * t**3 - 3 * t**2 + 1) * self._pKnots[idx] + (t**3 - 2 * t**2 + t) * h * self._dpdsKnots[idx] + \
+            (-2 * t**3 + 3 * t**2) * self._pKnots[idx + 1] + (t**3 - t**2) * h * self._dpdsKnots[idx + 1]
 
-        # Derivate to get heading change
-        dCoeffs = coeffs[1:] * np.array(np.arange(1, len(coeffs)))
-        tangent = np.polynomial.polynomial.polyval(s, dCoeffs)
+        # Newton step on the exact arc length from the knot
+        error = self._sKnots[idx] + self._integrate(self._pKnots[idx], p) - s
+        p = p - error / np.maximum(self.speed(p), 1e-12)
 
-        return (self._startPosition + np.array([srot, trot]), self._heading + tangent)
+        return np.clip(p, self._pKnots[0], self._pKnots[-1])
+
+    def _speedScalar(self, p):
+        du, dv = self._dCoeffsList
+        return math.hypot(du[0] + p * (du[1] + p * du[2]), dv[0] + p * (dv[1] + p * dv[2]))
+
+    def parameterScalar(self, s):
+        """ Same as parameter for a single arc length, evaluated with plain floats """
+
+        sKnots, pKnots, dpds = self._sKnotsList, self._pKnotsList, self._dpdsKnotsList
+
+        s = min(max(float(s), 0.0), sKnots[-1])
+        idx = min(max(bisect.bisect_right(sKnots, s) - 1, 0), len(sKnots) - 2)
+
+        h = sKnots[idx + 1] - sKnots[idx]
+        t = (s - sKnots[idx]) / h if h > 0 else 0.0
+
+        p = (2 * t**3 - 3 * t**2 + 1) * pKnots[idx] + (t**3 - 2 * t**2 + t) * h * dpds[idx] + \
+            (-2 * t**3 + 3 * t**2) * pKnots[idx + 1] + (t**3 - t**2) * h * dpds[idx + 1]
+
+        width = p - pKnots[idx]
+        arcLength = sKnots[idx] + width * sum(w * self._speedScalar(pKnots[idx] + width * x) for x, w in self._gaussList)
+
+        p -= (arcLength - s) / max(self._speedScalar(p), 1e-12)
+
+        return min(max(p, pKnots[0]), pKnots[-1])
+
+    def evaluateScalar(self, p):
+        """ Point and first derivative by p of a single parameter """
+
+        (u, v), (du, dv) = self._coeffs.tolist(), self._dCoeffsList
+
+        return (
+            u[0] + p * (u[1] + p * (u[2] + p * u[3])),
+            v[0] + p * (v[1] + p * (v[2] + p * v[3])),
+            du[0] + p * (du[1] + p * du[2]),
+            dv[0] + p * (dv[1] + p * dv[2])
+        )
+
+    @staticmethod
+    def numIntervals(length):
+        """ Table size for a curve of the given length, knots are at most 2 m apart """
+        return int(min(4096, max(4, np.ceil(length / 2.0))))
 
 class ParamPoly3(Geometry):
 
@@ -192,6 +452,13 @@ class ParamPoly3(Geometry):
         else:
             self._pRange = pRange
 
+        self._arcLength = CubicArcLength([aU, bU, cU, dU], [aV, bV, cV, dV], self._pRange, CubicArcLength.numIntervals(length))
+
+        # The length of the geometry is mapped onto the arc length of the curve
+        self._sScale = self._arcLength.length / self._length if self._length > 0 else 1.0
+        self._cosHeading = np.cos(heading)
+        self._sinHeading = np.sin(heading)
+
     def getStartPosition(self):
         return self._startPosition
 
@@ -200,26 +467,48 @@ class ParamPoly3(Geometry):
 
     def calcPosition(self, s):
 
-        # Position
-        pos = (s / self._length) * self._pRange
+        if np.ndim(s) == 0:
+            u, v, du, dv = self._arcLength.evaluateScalar(self._arcLength.parameterScalar(s * self._sScale))
+
+            x = self._startPosition[0] + u * self._cosHeading - v * self._sinHeading
+            y = self._startPosition[1] + u * self._sinHeading + v * self._cosHeading
+
+            return (np.array([x, y]), self._heading + np.arctan2(dv, du))
+
+        pos, d1, _ = self.calcDerivatives(s)
 
-        coeffsU = [self._aU, self._bU, self._cU, self._dU]
-        coeffsV = [self._aV, self._bV, self._cV, self._dV]
+        return (pos.T, np.arctan2(d1[..., 1], d1[..., 0]))
 
-        x = np.polynomial.polynomial.polyval(pos, coeffsU)
-        y = np.polynomial.polynomial.polyval(pos, coeffsV)
+    def calcDerivatives(self, s):
+        s = np.asarray(s, dtype=float)
 
-        xrot = x * np.cos(self._heading) - y * np.sin(self._heading)
-        yrot = x * np.sin(self._heading) + y * np.cos(self._heading)
+        uv, duv, dduv = self._arcLength.evaluate(self._arcLength.parameter(s.ravel() * self._sScale))
 
-        # Tangent is defined by derivation
-        dCoeffsU = coeffsU[1:] * np.array(np.arange(1, len(coeffsU)))
-        dCoeffsV = coeffsV[1:] * np.array(np.arange(1, len(coeffsV)))
+        rotation = np.array([[self._cosHeading, -self._sinHeading], [self._sinHeading, self._cosHeading]])
 
-        dx = np.polynomial.polynomial.polyval(pos, dCoeffsU)
-        dy = np.polynomial.polynomial.polyval(pos, dCoeffsV)
+        # Unit tangent and curvature of the curve, scaled to the derivatives by s
+        speed = np.maximum(np.hypot(duv[0], duv[1]), 1e-12)
+        tangent = duv / speed
+        curvature = (duv[0] * dduv[1] - duv[1] * dduv[0]) / speed**3
 
-        tangent = np.arctan2(dy, dx)
+        pos = self._startPosition + uv.T.dot(rotation.T)
+        d1 = self._sScale * tangent.T.dot(rotation.T)
+        d2 = (self._sScale * curvature)[:, np.newaxis] * np.stack([-d1[:, 1], d1[:, 0]], axis=-1)
 
+        return (pos.reshape(s.shape + (2,)), d1.reshape(s.shape + (2,)), d2.reshape(s.shape + (2,)))
+
+class Poly3(ParamPoly3):
+    """ Lateral offset v(u) = a + b*u + c*u**2 + d*u**3 along the start heading, evaluated as the curve (u, v(u)) """
+
+    def __init__(self, startPosition, heading, length, a, b, c, d):
+
+        # The arc length of the curve is at least u, a table up to u = length covers the whole geometry
+        super(Poly3, self).__init__(startPosition, heading, length, 0.0, 1.0, 0.0, 0.0, a, b, c, d, length)
+
+        self._a = a
+        self._b = b
+        self._c = c
+        self._d = d
 
-        return (self._startPosition + np.array([xrot, yrot]), self._heading + tangent)
+        # s is the arc length itself, the geometry ends where the arc length reaches its length
+        self._sScale = 1.0
@@ -0,0 +1,120 @@
+
+""" Opt-in timings and counters of the parser and the converter
+
+Nothing is recorded unless a report is active:
+
+    with instrumentation.recording() as report:
+        openDrive = parse_opendrive(root)
+        ...
+
+    print(report)
+    report.toJson()
+"""
+
+import collections
+import contextlib
+import functools
+import json
+import time
+
+
+_activeReport = None
+
+
+class ConversionReport(object):
+    """ Wall time of the stages and single roads of a conversion and counters of the work done """
+
+    def __init__(self):
+        self.stages = collections.OrderedDict()
+        self.stageCalls = collections.Counter()
+        self.roads = collections.OrderedDict()
+        self.counters = collections.Counter()
+
+    def addStageTime(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        self.stageCalls[stage] += 1
+
+    def addRoadTime(self, stage, roadId, seconds):
+        roads = self.roads.setdefault(stage, {})
+        roads[roadId] = roads.get(roadId, 0.0) + seconds
+
+    def count(self, counter, value=1):
+        self.counters[counter] += value
+
+    def slowestRoads(self, stage, n=10):
+        """ List of (roadId, seconds) of the n roads which took longest in a stage """
+
+        return sorted(self.roads.get(stage, {}).items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def toDict(self):
+        return dict(
+            stages=[dict(name=stage, seconds=seconds, calls=self.stageCalls[stage]) for stage, seconds in self.stages.items()],
+            roads={stage: [dict(road=roadId, seconds=seconds) for roadId, seconds in roads.items()] for stage, roads in self.roads.items()},
+            counters=dict(self.counters),
+        )
+
+    def toJson(self, **kwargs):
+        return json.dumps(self.toDict(), **kwargs)
+
+    def __str__(self):
+        lines = ["Stages:"]
+
+        for stage, seconds in self.stages.items():
+            lines.append("    {:<24s} {:9.4f}s  ({} calls)".format(stage, seconds, self.stageCalls[stage]))
+
+        for stage in self.roads:
+            lines.append("Slowest roads in {}:".format(stage))
+
+            for roadId, roadSeconds in self.slowestRoads(stage, 3):
+                lines.append("    road {:<19} {:9.4f}s".format(str(roadId), roadSeconds))
+
+        lines.append("Counters:")
+
+        for counter in sorted(self.counters):
+            lines.append("    {:<24s} {:>9d}".format(counter, self.counters[counter]))
+
+        return "\n".join(lines)
+
+
+def activeReport():
+    """ The report which is currently recorded or None """
+    return _activeReport
+
+
+@contextlib.contextmanager
+def recording(report=None):
+    """ Record timings and counters of everything run inside the with block """
+
+    global _activeReport
+
+    previous = _activeReport
+    _activeReport = report if report is not None else ConversionReport()
+
+    try:
+        yield _activeReport
+    finally:
+        _activeReport = previous
+
+
+def stage(name):
+    """ Decorator recording the wall time of a function as stage, only a single check if nothing is recorded """
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            report = _activeReport
+
+            if report is None:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                report.addStageTime(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
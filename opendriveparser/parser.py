@@ -1,8 +1,10 @@
 
+import time
+
 import numpy as np
 from lxml import etree
 
-from opendriveparser.elements.openDrive import OpenDrive
+from opendriveparser.elements.openDrive import OpenDrive, LazyRoads, RoadIndexEntry
 from opendriveparser.elements.road import Road
 from opendriveparser.elements.roadLink import Predecessor as RoadLinkPredecessor, Successor as RoadLinkSuccessor, Neighbor as RoadLinkNeighbor
 from opendriveparser.elements.roadType import Type as RoadType, Speed as RoadTypeSpeed
@@ -10,10 +12,17 @@ from opendriveparser.elements.roadElevationProfile import Elevation as RoadEleva
 from opendriveparser.elements.roadLateralProfile import Superelevation as RoadLateralProfileSuperelevation, Crossfall as RoadLateralProfileCrossfall, Shape as RoadLateralProfileShape
 from opendriveparser.elements.roadLanes import LaneOffset as RoadLanesLaneOffset, Lane as RoadLaneSectionLane, LaneSection as RoadLanesSection, LaneWidth as RoadLaneSectionLaneWidth, LaneBorder as RoadLaneSectionLaneBorder
 from opendriveparser.elements.junction import Junction, Connection as JunctionConnection, LaneLink as JunctionConnectionLaneLink
+from opendriveparser.elements.roadPlanView import PlanView
+from opendriveparser import instrumentation
+
 
+@instrumentation.stage("parse_opendrive")
+def parse_opendrive(rootNode, region=None, lazy=False):
+    """ Tries to parse XML tree, returns OpenDRIVE object
 
-def parse_opendrive(rootNode):
-    """ Tries to parse XML tree, returns OpenDRIVE object """
+    With a Region only the roads in it and the roads their links are built from are parsed. In lazy mode
+    only an index of the roads is built, each road is built the first time it is accessed.
+    """
 
     # Only accept lxml element
     if not etree.iselement(rootNode):
@@ -91,323 +100,395 @@ def parse_opendrive(rootNode):
 
         newOpenDrive.junctions.append(newJunction)
 
-    # Load roads
-    for road in rootNode.findall("road"):
+    report = instrumentation.activeReport()
 
-        newRoad = Road()
+    roadElements = rootNode.findall("road")
+    roadIndex = None
 
-        newRoad.id = int(road.get("id"))
-        newRoad.name = road.get("name")
+    if region is not None:
+        # Only the index of the roads is needed to select the roads of a region
+        roadIndex = [indexRoad(road) for road in roadElements]
 
-        junctionId = int(road.get("junction")) if road.get("junction") != "-1" else None
+        newOpenDrive.regionRoadIds, roadIds, newOpenDrive.junctions[:] = region.selectRoads(roadIndex, newOpenDrive.junctions)
 
-        if junctionId:
-            newRoad.junction = newOpenDrive.getJunction(junctionId)
+        roadIndex = [entry for entry in roadIndex if entry.id in roadIds]
+        roadElements = [entry.element for entry in roadIndex]
 
-        # TODO verify road length
-        newRoad.length = float(road.get("length"))
+    if lazy:
+        # Roads are built on first access
+        newOpenDrive.roads = LazyRoads(roadIndex if roadIndex is not None else [indexRoad(road) for road in roadElements], lambda road: parseRoad(road, newOpenDrive))
 
-        # Links
-        if road.find("link") is not None:
+    else:
+        for road in roadElements:
 
-            predecessor = road.find("link").find("predecessor")
+            if report is not None:
+                roadStart = time.perf_counter()
 
-            if predecessor is not None:
+            newRoad = parseRoad(road, newOpenDrive)
 
-                newPredecessor = RoadLinkPredecessor()
+            newOpenDrive.roads.append(newRoad)
 
-                newPredecessor.elementType = predecessor.get("elementType")
-                newPredecessor.elementId = predecessor.get("elementId")
-                newPredecessor.contactPoint = predecessor.get("contactPoint")
+            if report is not None:
+                report.addRoadTime("parse_opendrive", newRoad.id, time.perf_counter() - roadStart)
 
-                newRoad.link.predecessor = newPredecessor
+    if report is not None:
+        report.count("roads", len(newOpenDrive.roads))
+        report.count("junctions", len(newOpenDrive.junctions))
 
-            successor = road.find("link").find("successor")
+    return newOpenDrive
 
-            if successor is not None:
 
-                newSuccessor = RoadLinkSuccessor()
+def parseRoadLink(road, link):
+    """ Fill a Link with the links of a road element """
 
-                newSuccessor.elementType = successor.get("elementType")
-                newSuccessor.elementId = successor.get("elementId")
-                newSuccessor.contactPoint = successor.get("contactPoint")
+    if road.find("link") is not None:
 
-                newRoad.link.successor = newSuccessor
+        predecessor = road.find("link").find("predecessor")
 
-            for neighbor in road.find("link").findall("neighbor"):
+        if predecessor is not None:
 
-                newNeighbor = RoadLinkNeighbor()
+            newPredecessor = RoadLinkPredecessor()
 
-                newNeighbor.side = neighbor.get("side")
-                newNeighbor.elementId = neighbor.get("elementId")
-                newNeighbor.direction = neighbor.get("direction")
+            newPredecessor.elementType = predecessor.get("elementType")
+            newPredecessor.elementId = predecessor.get("elementId")
+            newPredecessor.contactPoint = predecessor.get("contactPoint")
 
-                newRoad.link.neighbors.append(newNeighbor)
+            link.predecessor = newPredecessor
 
-        # Type
-        for roadType in road.findall("type"):
+        successor = road.find("link").find("successor")
 
-            newType = RoadType()
+        if successor is not None:
 
-            newType.sPos = roadType.get("s")
-            newType.type = roadType.get("type")
+            newSuccessor = RoadLinkSuccessor()
 
-            if roadType.find("speed"):
+            newSuccessor.elementType = successor.get("elementType")
+            newSuccessor.elementId = successor.get("elementId")
+            newSuccessor.contactPoint = successor.get("contactPoint")
 
-                newSpeed = RoadTypeSpeed()
+            link.successor = newSuccessor
 
-                newSpeed.max = roadType.find("speed").get("max")
-                newSpeed.unit = roadType.find("speed").get("unit")
+        for neighbor in road.find("link").findall("neighbor"):
 
-                newType.speed = newSpeed
+            newNeighbor = RoadLinkNeighbor()
 
-            newRoad.types.append(newType)
+            newNeighbor.side = neighbor.get("side")
+            newNeighbor.elementId = neighbor.get("elementId")
+            newNeighbor.direction = neighbor.get("direction")
 
-        # Plan view
-        for geometry in road.find("planView").findall("geometry"):
+            link.neighbors.append(newNeighbor)
 
-            startCoord = [float(geometry.get("x")), float(geometry.get("y"))]
 
-            if geometry.find("line") is not None:
-                newRoad.planView.addLine(startCoord, float(geometry.get("hdg")), float(geometry.get("length")))
+def indexRoad(road):
+    """ Index entry of a road element with only the attributes, links and bounding box of the road """
 
-            elif geometry.find("spiral") is not None:
-                newRoad.planView.addSpiral(startCoord, float(geometry.get("hdg")), float(geometry.get("length")), float(geometry.find("spiral").get("curvStart")), float(geometry.find("spiral").get("curvEnd")))
+    geometries = road.find("planView").findall("geometry")
 
-            elif geometry.find("arc") is not None:
-                newRoad.planView.addArc(startCoord, float(geometry.get("hdg")), float(geometry.get("length")), float(geometry.find("arc").get("curvature")))
+    entry = RoadIndexEntry(
+        int(road.get("id")),
+        road.get("name"),
+        int(road.get("junction")) if road.get("junction") not in [None, "-1"] else None,
+        float(road.get("length")),
+        road,
+        PlanView.geometryBoundingBox(
+            [[float(geometry.get("x")), float(geometry.get("y"))] for geometry in geometries],
+            [float(geometry.get("length")) for geometry in geometries]
+        )
+    )
 
-            elif geometry.find("poly3") is not None:
-                raise NotImplementedError()
+    parseRoadLink(road, entry.link)
 
-            elif geometry.find("paramPoly3") is not None:
-                if geometry.find("paramPoly3").get("pRange"):
+    return entry
 
-                    if geometry.find("paramPoly3").get("pRange") == "arcLength":
-                        pMax = float(geometry.get("length"))
-                    else:
-                        pMax = None
-                else:
-                    pMax = None
 
-                newRoad.planView.addParamPoly3( \
-                    startCoord, \
-                    float(geometry.get("hdg")), \
-                    float(geometry.get("length")), \
-                    float(geometry.find("paramPoly3").get("aU")), \
-                    float(geometry.find("paramPoly3").get("bU")), \
-                    float(geometry.find("paramPoly3").get("cU")), \
-                    float(geometry.find("paramPoly3").get("dU")), \
-                    float(geometry.find("paramPoly3").get("aV")), \
-                    float(geometry.find("paramPoly3").get("bV")), \
-                    float(geometry.find("paramPoly3").get("cV")), \
-                    float(geometry.find("paramPoly3").get("dV")), \
-                    pMax \
-                )
+def parseRoad(road, openDrive):
+    """ Build a Road from a road element, junctions are looked up in openDrive """
+
+    newRoad = Road()
+
+    newRoad.id = int(road.get("id"))
+    newRoad.name = road.get("name")
+
+    junctionId = int(road.get("junction")) if road.get("junction") != "-1" else None
+
+    if junctionId:
+        newRoad.junction = openDrive.getJunction(junctionId)
+
+    # TODO verify road length
+    newRoad.length = float(road.get("length"))
+
+    # Links
+    parseRoadLink(road, newRoad.link)
+
+    # Type
+    for roadType in road.findall("type"):
+
+        newType = RoadType()
+
+        newType.sPos = roadType.get("s")
+        newType.type = roadType.get("type")
+
+        if roadType.find("speed"):
+
+            newSpeed = RoadTypeSpeed()
 
+            newSpeed.max = roadType.find("speed").get("max")
+            newSpeed.unit = roadType.find("speed").get("unit")
+
+            newType.speed = newSpeed
+
+        newRoad.types.append(newType)
+
+    # Plan view
+    for geometry in road.find("planView").findall("geometry"):
+
+        startCoord = [float(geometry.get("x")), float(geometry.get("y"))]
+
+        if geometry.find("line") is not None:
+            newRoad.planView.addLine(startCoord, float(geometry.get("hdg")), float(geometry.get("length")))
+
+        elif geometry.find("spiral") is not None:
+            newRoad.planView.addSpiral(startCoord, float(geometry.get("hdg")), float(geometry.get("length")), float(geometry.find("spiral").get("curvStart")), float(geometry.find("spiral").get("curvEnd")))
+
+        elif geometry.find("arc") is not None:
+            newRoad.planView.addArc(startCoord, float(geometry.get("hdg")), float(geometry.get("length")), float(geometry.find("arc").get("curvature")))
+
+        elif geometry.find("poly3") is not None:
+            newRoad.planView.addPoly3( \
+                startCoord, \
+                float(geometry.get("hdg")), \
+                float(geometry.get("length")), \
+                float(geometry.find("poly3").get("a")), \
+                float(geometry.find("poly3").get("b")), \
+                float(geometry.find("poly3").get("c")), \
+                float(geometry.find("poly3").get("d")) \
+            )
+
+        elif geometry.find("paramPoly3") is not None:
+            if geometry.find("paramPoly3").get("pRange"):
+
+                if geometry.find("paramPoly3").get("pRange") == "arcLength":
+                    pMax = float(geometry.get("length"))
+                else:
+                    pMax = None
             else:
-                raise Exception("invalid xml")
+                pMax = None
 
-        # Elevation profile
-        if road.find("elevationProfile") is not None:
+            newRoad.planView.addParamPoly3( \
+                startCoord, \
+                float(geometry.get("hdg")), \
+                float(geometry.get("length")), \
+                float(geometry.find("paramPoly3").get("aU")), \
+                float(geometry.find("paramPoly3").get("bU")), \
+                float(geometry.find("paramPoly3").get("cU")), \
+                float(geometry.find("paramPoly3").get("dU")), \
+                float(geometry.find("paramPoly3").get("aV")), \
+                float(geometry.find("paramPoly3").get("bV")), \
+                float(geometry.find("paramPoly3").get("cV")), \
+                float(geometry.find("paramPoly3").get("dV")), \
+                pMax \
+            )
 
-            for elevation in road.find("elevationProfile").findall("elevation"):
+        else:
+            raise Exception("invalid xml")
 
-                newElevation = RoadElevationProfileElevation()
+    # Elevation profile
+    if road.find("elevationProfile") is not None:
 
-                newElevation.sPos = elevation.get("s")
-                newElevation.a = elevation.get("a")
-                newElevation.b = elevation.get("b")
-                newElevation.c = elevation.get("c")
-                newElevation.d = elevation.get("d")
+        for elevation in road.find("elevationProfile").findall("elevation"):
 
-                newRoad.elevationProfile.elevations.append(newElevation)
+            newElevation = RoadElevationProfileElevation()
 
-        # Lateral profile
-        if road.find("lateralProfile") is not None:
+            newElevation.sPos = elevation.get("s")
+            newElevation.a = elevation.get("a")
+            newElevation.b = elevation.get("b")
+            newElevation.c = elevation.get("c")
+            newElevation.d = elevation.get("d")
 
-            for superelevation in road.find("lateralProfile").findall("superelevation"):
+            newRoad.elevationProfile.elevations.append(newElevation)
 
-                newSuperelevation = RoadLateralProfileSuperelevation()
+    # Lateral profile
+    if road.find("lateralProfile") is not None:
 
-                newSuperelevation.sPos = superelevation.get("s")
-                newSuperelevation.a = superelevation.get("a")
-                newSuperelevation.b = superelevation.get("b")
-                newSuperelevation.c = superelevation.get("c")
-                newSuperelevation.d = superelevation.get("d")
+        for superelevation in road.find("lateralProfile").findall("superelevation"):
 
-                newRoad.lateralProfile.superelevations.append(newSuperelevation)
+            newSuperelevation = RoadLateralProfileSuperelevation()
 
-            for crossfall in road.find("lateralProfile").findall("crossfall"):
+            newSuperelevation.sPos = superelevation.get("s")
+            newSuperelevation.a = superelevation.get("a")
+            newSuperelevation.b = superelevation.get("b")
+            newSuperelevation.c = superelevation.get("c")
+            newSuperelevation.d = superelevation.get("d")
 
-                newCrossfall = RoadLateralProfileCrossfall()
+            newRoad.lateralProfile.superelevations.append(newSuperelevation)
 
-                newCrossfall.side = crossfall.get("side")
-                newCrossfall.sPos = crossfall.get("s")
-                newCrossfall.a = crossfall.get("a")
-                newCrossfall.b = crossfall.get("b")
-                newCrossfall.c = crossfall.get("c")
-                newCrossfall.d = crossfall.get("d")
+        for crossfall in road.find("lateralProfile").findall("crossfall"):
 
-                newRoad.lateralProfile.crossfalls.append(newCrossfall)
+            newCrossfall = RoadLateralProfileCrossfall()
 
-            for shape in road.find("lateralProfile").findall("shape"):
+            newCrossfall.side = crossfall.get("side")
+            newCrossfall.sPos = crossfall.get("s")
+            newCrossfall.a = crossfall.get("a")
+            newCrossfall.b = crossfall.get("b")
+            newCrossfall.c = crossfall.get("c")
+            newCrossfall.d = crossfall.get("d")
 
-                newShape = RoadLateralProfileShape()
+            newRoad.lateralProfile.crossfalls.append(newCrossfall)
 
-                newShape.sPos = shape.get("s")
-                newShape.t = shape.get("t")
-                newShape.a = shape.get("a")
-                newShape.b = shape.get("b")
-                newShape.c = shape.get("c")
-                newShape.d = shape.get("d")
+        for shape in road.find("lateralProfile").findall("shape"):
 
-                newRoad.lateralProfile.shapes.append(newShape)
+            newShape = RoadLateralProfileShape()
 
-        # Lanes
-        lanes = road.find("lanes")
+            newShape.sPos = shape.get("s")
+            newShape.t = shape.get("t")
+            newShape.a = shape.get("a")
+            newShape.b = shape.get("b")
+            newShape.c = shape.get("c")
+            newShape.d = shape.get("d")
 
-        if lanes is None:
-            raise Exception("Road must have lanes element")
+            newRoad.lateralProfile.shapes.append(newShape)
 
-        # Lane offset
-        for laneOffset in lanes.findall("laneOffset"):
+    # Lanes
+    lanes = road.find("lanes")
 
-            newLaneOffset = RoadLanesLaneOffset()
+    if lanes is None:
+        raise Exception("Road must have lanes element")
 
-            newLaneOffset.sPos = laneOffset.get("s")
-            newLaneOffset.a = laneOffset.get("a")
-            newLaneOffset.b = laneOffset.get("b")
-            newLaneOffset.c = laneOffset.get("c")
-            newLaneOffset.d = laneOffset.get("d")
+    # Lane offset
+    for laneOffset in lanes.findall("laneOffset"):
 
-            newRoad.lanes.laneOffsets.append(newLaneOffset)
+        newLaneOffset = RoadLanesLaneOffset()
 
-        # Lane sections
-        for laneSectionIdx, laneSection in enumerate(road.find("lanes").findall("laneSection")):
+        newLaneOffset.sPos = laneOffset.get("s")
+        newLaneOffset.a = laneOffset.get("a")
+        newLaneOffset.b = laneOffset.get("b")
+        newLaneOffset.c = laneOffset.get("c")
+        newLaneOffset.d = laneOffset.get("d")
 
-            newLaneSection = RoadLanesSection(road=newRoad)
+        newRoad.lanes.laneOffsets.append(newLaneOffset)
 
-            # Manually enumerate lane sections for referencing purposes
-            newLaneSection.idx = laneSectionIdx
+    # Lane sections
+    for laneSectionIdx, laneSection in enumerate(road.find("lanes").findall("laneSection")):
 
-            newLaneSection.sPos = laneSection.get("s")
-            newLaneSection.singleSide = laneSection.get("singleSide")
+        newLaneSection = RoadLanesSection(road=newRoad)
 
-            sides = dict(
-                left=newLaneSection.leftLanes,
-                center=newLaneSection.centerLanes,
-                right=newLaneSection.rightLanes
-                )
+        # Manually enumerate lane sections for referencing purposes
+        newLaneSection.idx = laneSectionIdx
 
-            for sideTag, newSideLanes in sides.items():
+        newLaneSection.sPos = laneSection.get("s")
+        newLaneSection.singleSide = laneSection.get("singleSide")
 
-                side = laneSection.find(sideTag)
+        sides = dict(
+            left=newLaneSection.leftLanes,
+            center=newLaneSection.centerLanes,
+            right=newLaneSection.rightLanes
+            )
 
-                # It is possible one side is not present
-                if side is None:
-                    continue
+        for sideTag, newSideLanes in sides.items():
 
-                for lane in side.findall("lane"):
+            side = laneSection.find(sideTag)
 
-                    newLane = RoadLaneSectionLane(
-                        parentRoad=newRoad
-                    )
+            # It is possible one side is not present
+            if side is None:
+                continue
 
-                    newLane.id = lane.get("id")
-                    newLane.type = lane.get("type")
+            for lane in side.findall("lane"):
 
-                    # In some sample files the level is not specified according to the OpenDRIVE spec
-                    newLane.level = "true" if lane.get("level") in [1, '1', 'true'] else "false"
+                newLane = RoadLaneSectionLane(
+                    parentRoad=newRoad
+                )
 
-                    # Lane Links
-                    if lane.find("link") is not None:
+                newLane.id = lane.get("id")
+                newLane.type = lane.get("type")
 
-                        if lane.find("link").find("predecessor") is not None:
-                            newLane.link.predecessorId = lane.find("link").find("predecessor").get("id")
+                # In some sample files the level is not specified according to the OpenDRIVE spec
+                newLane.level = "true" if lane.get("level") in [1, '1', 'true'] else "false"
 
-                        if lane.find("link").find("successor") is not None:
-                            newLane.link.successorId = lane.find("link").find("successor").get("id")
+                # Lane Links
+                if lane.find("link") is not None:
 
-                    # Width
-                    for widthIdx, width in enumerate(lane.findall("width")):
+                    if lane.find("link").find("predecessor") is not None:
+                        newLane.link.predecessorId = lane.find("link").find("predecessor").get("id")
 
-                        newWidth = RoadLaneSectionLaneWidth()
+                    if lane.find("link").find("successor") is not None:
+                        newLane.link.successorId = lane.find("link").find("successor").get("id")
 
-                        newWidth.idx = widthIdx
-                        newWidth.sOffset = width.get("sOffset")
-                        newWidth.a = width.get("a")
-                        newWidth.b = width.get("b")
-                        newWidth.c = width.get("c")
-                        newWidth.d = width.get("d")
+                # Width
+                for widthIdx, width in enumerate(lane.findall("width")):
 
-                        newLane.widths.append(newWidth)
+                    newWidth = RoadLaneSectionLaneWidth()
 
-                    # Border
-                    for borderIdx, border in enumerate(lane.findall("border")):
+                    newWidth.idx = widthIdx
+                    newWidth.sOffset = width.get("sOffset")
+                    newWidth.a = width.get("a")
+                    newWidth.b = width.get("b")
+                    newWidth.c = width.get("c")
+                    newWidth.d = width.get("d")
 
-                        newBorder = RoadLaneSectionLaneBorder()
+                    newLane.widths.append(newWidth)
 
-                        newBorder.idx = borderIdx
-                        newBorder.sPos = border.get("sOffset")
-                        newBorder.a = border.get("a")
-                        newBorder.b = border.get("b")
-                        newBorder.c = border.get("c")
-                        newBorder.d = border.get("d")
+                # Border
+                for borderIdx, border in enumerate(lane.findall("border")):
 
-                        newLane.borders.append(newBorder)
+                    newBorder = RoadLaneSectionLaneBorder()
 
-                    # Road Marks
-                    # TODO implementation
+                    newBorder.idx = borderIdx
+                    newBorder.sPos = border.get("sOffset")
+                    newBorder.a = border.get("a")
+                    newBorder.b = border.get("b")
+                    newBorder.c = border.get("c")
+                    newBorder.d = border.get("d")
 
-                    # Material
-                    # TODO implementation
+                    newLane.borders.append(newBorder)
 
-                    # Visiblility
-                    # TODO implementation
+                # Road Marks
+                # TODO implementation
 
-                    # Speed
-                    # TODO implementation
+                # Material
+                # TODO implementation
 
-                    # Access
-                    # TODO implementation
+                # Visiblility
+                # TODO implementation
 
-                    # Lane Height
-                    # TODO implementation
+                # Speed
+                # TODO implementation
 
-                    # Rules
-                    # TODO implementation
+                # Access
+                # TODO implementation
 
-                    newSideLanes.append(newLane)
+                # Lane Height
+                # TODO implementation
 
-            newRoad.lanes.laneSections.append(newLaneSection)
+                # Rules
+                # TODO implementation
 
-        # OpenDRIVE does not provide lane section lengths by itself, calculate them by ourselves
-        for laneSection in newRoad.lanes.laneSections:
+                newSideLanes.append(newLane)
 
-            # Last lane section in road
-            if laneSection.idx + 1 >= len(newRoad.lanes.laneSections):
-                laneSection.length = newRoad.planView.getLength() - laneSection.sPos
+        newRoad.lanes.laneSections.append(newLaneSection)
 
-            # All but the last lane section end at the succeeding one
-            else:
-                laneSection.length = newRoad.lanes.laneSections[laneSection.idx + 1].sPos - laneSection.sPos
+    # OpenDRIVE does not provide lane section lengths by itself, calculate them by ourselves
+    for laneSection in newRoad.lanes.laneSections:
 
-        # OpenDRIVE does not provide lane width lengths by itself, calculate them by ourselves
-        for laneSection in newRoad.lanes.laneSections:
-            for lane in laneSection.allLanes:
-                widthsPoses = np.array([x.sOffset for x in lane.widths] + [laneSection.length])
-                widthsLengths = widthsPoses[1:] - widthsPoses[:-1]
+        # Last lane section in road
+        if laneSection.idx + 1 >= len(newRoad.lanes.laneSections):
+            laneSection.length = newRoad.planView.getLength() - laneSection.sPos
 
-                for widthIdx, width in enumerate(lane.widths):
-                    width.length = widthsLengths[widthIdx]
+        # All but the last lane section end at the succeeding one
+        else:
+            laneSection.length = newRoad.lanes.laneSections[laneSection.idx + 1].sPos - laneSection.sPos
 
-        # Objects
-        # TODO implementation
+    # OpenDRIVE does not provide lane width lengths by itself, calculate them by ourselves
+    for laneSection in newRoad.lanes.laneSections:
+        for lane in laneSection.allLanes:
+            widthsPoses = np.array([x.sOffset for x in lane.widths] + [laneSection.length])
+            widthsLengths = widthsPoses[1:] - widthsPoses[:-1]
 
-        # Signals
-        # TODO implementation
+            for widthIdx, width in enumerate(lane.widths):
+                width.length = widthsLengths[widthIdx]
 
-        newOpenDrive.roads.append(newRoad)
+    # Objects
+    # TODO implementation
 
-    return newOpenDrive
+    # Signals
+    # TODO implementation
+
+    return newRoad
@@ -0,0 +1,158 @@
+
+import numpy as np
+
+
+def linkDependencies(road, getJunction):
+    """ Ids of all roads and junctions the links of a road are built from
+
+    road is a Road or a RoadIndexEntry, getJunction returns the junction of an id or None.
+    """
+
+    roadIds = set()
+    junctionIds = set()
+
+    for link in [road.link.predecessor, road.link.successor]:
+        if link is None:
+            continue
+
+        if link.elementType == "junction":
+            junctionIds.add(link.elementId)
+
+            junction = getJunction(link.elementId)
+
+            if junction is not None:
+                for connection in junction.connections:
+                    roadIds.add(connection.incomingRoad)
+                    roadIds.add(connection.connectingRoad)
+
+        else:
+            roadIds.add(link.elementId)
+
+    return roadIds, junctionIds
+
+
+class Region(object):
+    """ Region of interest of a partial conversion
+
+    A road is in the region if the bounding box of its plan view, grown by margin, intersects the bounding box
+    (xMin, yMin, xMax, yMax) or the polygon of the region, or if its id is in roadIds. Without box and polygon
+    only the listed roads are in the region.
+    """
+
+    def __init__(self, boundingBox=None, polygon=None, roadIds=None, margin=0.0):
+
+        if boundingBox is None and polygon is None and roadIds is None:
+            raise ValueError("Region needs a bounding box, a polygon or road ids")
+
+        self._boundingBox = None if boundingBox is None else tuple(float(x) for x in boundingBox)
+        self._polygon = None if polygon is None else np.asarray(polygon, dtype=float).reshape(-1, 2)
+        self._roadIds = None if roadIds is None else set(int(roadId) for roadId in roadIds)
+        self._margin = float(margin)
+
+        if self._polygon is not None and len(self._polygon) < 3:
+            raise ValueError("Polygon needs at least three points")
+
+    @property
+    def boundingBox(self):
+        return self._boundingBox
+
+    @property
+    def polygon(self):
+        return self._polygon
+
+    @property
+    def roadIds(self):
+        return self._roadIds
+
+    @property
+    def margin(self):
+        return self._margin
+
+    def containsRoad(self, roadId, boundingBox):
+        """ Whether a road with the given plan view bounding box is in the region """
+
+        if self._roadIds is not None and roadId in self._roadIds:
+            return True
+
+        xMin, yMin, xMax, yMax = boundingBox
+        box = (xMin - self._margin, yMin - self._margin, xMax + self._margin, yMax + self._margin)
+
+        if self._boundingBox is not None and self._boxesIntersect(box, self._boundingBox):
+            return True
+
+        if self._polygon is not None and self._polygonIntersectsBox(self._polygon, box):
+            return True
+
+        return False
+
+    def selectRoads(self, roads, junctions):
+        """ Roads and junctions needed to convert the roads of the region
+
+        roads are RoadIndexEntry objects or anything else with id, link and boundingBox. Returns the ids of the roads in
+        the region, the ids of these roads and of all roads their links are built from, and the junctions which are
+        linked by or connect roads of the region.
+        """
+
+        regionRoadIds = set(road.id for road in roads if self.containsRoad(road.id, road.boundingBox))
+
+        junctionsById = {junction.id: junction for junction in junctions}
+
+        roadIds = set(regionRoadIds)
+        junctionIds = set()
+
+        for road in roads:
+            if road.id in regionRoadIds:
+                roadDependencies, junctionDependencies = linkDependencies(road, junctionsById.get)
+
+                roadIds |= roadDependencies
+                junctionIds |= junctionDependencies
+
+        # Junctions without roads in the region are skipped
+        regionJunctions = [
+            junction for junction in junctions
+            if junction.id in junctionIds or any(connection.incomingRoad in regionRoadIds or connection.connectingRoad in regionRoadIds for connection in junction.connections)
+        ]
+
+        return regionRoadIds, roadIds, regionJunctions
+
+    @staticmethod
+    def _boxesIntersect(a, b):
+        return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+    @staticmethod
+    def _polygonIntersectsBox(polygon, box):
+        """ Whether a simple polygon and an axis aligned box overlap """
+
+        xMin, yMin, xMax, yMax = box
+
+        if not Region._boxesIntersect(box, (polygon[:, 0].min(), polygon[:, 1].min(), polygon[:, 0].max(), polygon[:, 1].max())):
+            return False
+
+        # A corner of the polygon inside the box
+        if np.any((polygon[:, 0] >= xMin) & (polygon[:, 0] <= xMax) & (polygon[:, 1] >= yMin) & (polygon[:, 1] <= yMax)):
+            return True
+
+        # The box inside the polygon, tested with one of its corners by ray casting
+        x1, y1 = polygon[:, 0], polygon[:, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = ((y1 > yMin) != (y2 > yMin)) & (xMin < (x2 - x1) * (yMin - y1) / (y2 - y1) + x1)
+
+        if np.count_nonzero(crossing) % 2 == 1:
+            return True
+
+        # Otherwise an edge of the polygon has to cross the box, clip all edges against the box (Liang-Barsky)
+        dx, dy = x2 - x1, y2 - y1
+        tMin = np.zeros(len(polygon))
+        tMax = np.ones(len(polygon))
+
+        for p, q in [(-dx, x1 - xMin), (dx, xMax - x1), (-dy, y1 - yMin), (dy, yMax - y1)]:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = q / p
+
+            tMin = np.where(p < 0, np.maximum(tMin, t), tMin)
+            tMax = np.where(p > 0, np.minimum(tMax, t), tMax)
+            tMax = np.where((p == 0) & (q < 0), -1.0, tMax)
+
+        return bool(np.any(tMin <= tMax))
@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from opendrive2lanelet.batch import collect_input_files, convert_file, convert_files
+
+def crashing_convert(input_path, output_path, memory=False, simplify=None):
+    """ Conversion whose worker process dies for files named crash*, like a process killed for its memory """
+
+    if os.path.basename(input_path).startswith("crash"):
+        os._exit(1)
+
+    return convert_file(input_path, output_path, memory=memory, simplify=simplify)
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.input = os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr"
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def copyInput(self, *path):
+        target = os.path.join(self.directory, *path)
+
+        if not os.path.isdir(os.path.dirname(target)):
+            os.makedirs(os.path.dirname(target))
+
+        shutil.copy(self.input, target)
+
+        return target
+
+    def test_worker_crash(self):
+        files = [self.copyInput(name) for name in ["a.xodr", "b.xodr", "crash.xodr", "c.xodr", "d.xodr"]]
+
+        summaries = convert_files(files, output_dir=os.path.join(self.directory, "out"), jobs=2, report=None, convert=crashing_convert)
+
+        self.assertEqual(sorted(summary["input"] for summary in summaries), sorted(files))
+        self.assertEqual([os.path.basename(summary["input"]) for summary in summaries if not summary["ok"]], ["crash.xodr"])
+        self.assertIn("BrokenProcessPool", [summary for summary in summaries if not summary["ok"]][0]["error"])
+
+        for name in ["a", "b", "c", "d"]:
+            self.assertTrue(os.path.exists(os.path.join(self.directory, "out", name + ".xml")))
+
+    def test_collect_input_files(self):
+        files = [self.copyInput("top.xodr"), self.copyInput("tiles", "a.xodr"), self.copyInput("tiles", "x", "y", "b.xodr")]
+
+        self.assertEqual(collect_input_files([os.path.join(self.directory, "**", "*.xodr")]), sorted(files))
+        self.assertEqual(collect_input_files([os.path.join(self.directory, "tiles", "**", "*.xodr")]), sorted(files[1:]))
+        self.assertEqual(collect_input_files([os.path.join(self.directory, "tiles"), files[0]]), sorted([files[0], files[1]]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import unittest
+
+import numpy as np
+from lxml import etree
+from opendriveparser import parse_opendrive
+from opendrive2lanelet import Network
+from opendrive2lanelet.plane_elements.plane_group import PLaneGroup
+
+class BorderTest(unittest.TestCase):
+
+    def setUp(self):
+
+        fh = open(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr", 'r')
+        openDrive = parse_opendrive(etree.parse(fh).getroot())
+        fh.close()
+
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(openDrive)
+
+        self.pLanes = []
+
+        for entry in roadNetwork._planes:
+            self.pLanes.extend(entry._pLanes if isinstance(entry, PLaneGroup) else [entry])
+
+    def test_positions_match_calc(self):
+
+        for pLane in self.pLanes:
+            poses = pLane.samplePositions()
+
+            for ref, refDistance in [(None, [0.0, 0.0]), ("left", [0.0, 2.0]), ("right", [1.5, -0.5])]:
+                left, right = pLane.sampleBorders(ref=ref, refDistance=refDistance)
+
+                for idx, pos in enumerate(poses):
+                    d = (refDistance[1] - refDistance[0]) / pLane.length * pos + refDistance[0]
+
+                    np.testing.assert_allclose(left[idx], pLane.calcInnerBorder(pos, d if ref == "right" else 0.0)[0], atol=1e-9)
+                    np.testing.assert_allclose(right[idx], pLane.calcOuterBorder(pos, d if ref == "left" else 0.0)[0], atol=1e-9)
+
+    def test_widths(self):
+        border = self.pLanes[0].outerBorder
+
+        sPos = np.linspace(border.coeffsOffsets[0], border.coeffsOffsets[-1] + 10.0, 50)
+
+        expected = [np.polynomial.polynomial.polyval(s - offset, coeffs) for s in sPos
+                    for offset, coeffs in [next((o, c) for o, c in reversed(list(zip(border.coeffsOffsets, border.coeffs))) if o <= s)]]
+
+        np.testing.assert_allclose(border.calcWidths(sPos), expected)
+
+if __name__ == '__main__':
+    unittest.main()
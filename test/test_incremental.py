@@ -0,0 +1,73 @@
+
+import os
+import unittest
+
+import numpy as np
+from lxml import etree
+from opendriveparser import parse_opendrive
+from opendrive2lanelet import Network
+
+class IncrementalTest(unittest.TestCase):
+
+    def setUp(self):
+
+        fh = open(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr", 'r')
+        self.xml = fh.read()
+        fh.close()
+
+    def parse(self, xml):
+        return parse_opendrive(etree.fromstring(xml.encode("utf-8")))
+
+    def summary(self, laneletNetwork):
+        return [(
+            lanelet.lanelet_id,
+            lanelet.description,
+            sorted(lanelet.predecessor),
+            sorted(lanelet.successor),
+            lanelet.adj_left,
+            lanelet.adj_right,
+            np.round(lanelet.left_vertices, 6).tolist(),
+            np.round(lanelet.right_vertices, 6).tolist()
+        ) for lanelet in laneletNetwork.lanelets]
+
+    def assertSameAsFullConversion(self, roadNetwork, xml):
+        fullRoadNetwork = Network()
+        fullRoadNetwork.loadOpenDrive(self.parse(xml))
+
+        self.assertEqual(self.summary(roadNetwork.exportLaneletNetwork()), self.summary(fullRoadNetwork.exportLaneletNetwork()))
+
+    def test_unchanged(self):
+
+        roadNetwork = Network(incremental=True)
+        roadNetwork.loadOpenDrive(self.parse(self.xml))
+
+        self.assertEqual(roadNetwork.updateOpenDrive(self.parse(self.xml)), set())
+        self.assertSameAsFullConversion(roadNetwork, self.xml)
+
+    def test_changed_road(self):
+
+        roadNetwork = Network(incremental=True)
+        roadNetwork.loadOpenDrive(self.parse(self.xml))
+
+        # Removing a lane section of road 2 also changes the links of road 1
+        start = self.xml.index('<laneSection s="20">')
+        end = self.xml.index('</laneSection>', start) + len('</laneSection>')
+        changedXml = self.xml[:start] + self.xml[end:]
+
+        self.assertEqual(roadNetwork.updateOpenDrive(self.parse(changedXml)), {2})
+        self.assertSameAsFullConversion(roadNetwork, changedXml)
+
+        self.assertEqual(roadNetwork.updateOpenDrive(self.parse(self.xml)), {2})
+        self.assertSameAsFullConversion(roadNetwork, self.xml)
+
+    def test_requires_incremental(self):
+
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(self.parse(self.xml))
+
+        with self.assertRaises(Exception):
+            roadNetwork.updateOpenDrive(self.parse(self.xml))
+
+
+if __name__ == '__main__':
+    unittest.main()
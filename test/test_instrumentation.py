@@ -0,0 +1,52 @@
+import json
+import os
+import unittest
+
+from lxml import etree
+from opendriveparser import parse_opendrive, instrumentation
+from opendrive2lanelet import Network
+
+class InstrumentationTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.root = etree.parse(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr").getroot()
+
+    def convert(self):
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(parse_opendrive(self.root))
+
+        scenario = roadNetwork.exportCommonRoadScenario()
+        scenario.export_to_string()
+
+        return scenario
+
+    def test_disabled(self):
+        self.assertIsNone(instrumentation.activeReport())
+        self.convert()
+        self.assertIsNone(instrumentation.activeReport())
+
+    def test_report(self):
+        with instrumentation.recording() as report:
+            scenario = self.convert()
+
+        self.assertIsNone(instrumentation.activeReport())
+
+        self.assertEqual(list(report.stages), ["parse_opendrive", "createLinkIndex", "loadOpenDrive", "exportLaneletNetwork", "export_to_string"])
+        self.assertEqual(sorted(report.roads["parse_opendrive"]), [1, 2])
+        self.assertEqual(sorted(report.roads["roadToPLanes"]), [1, 2])
+
+        lanelets = scenario.lanelet_network.lanelets
+
+        self.assertEqual(report.counters["roads"], 2)
+        self.assertEqual(report.counters["lanelets"], len(lanelets))
+        self.assertEqual(report.counters["vertices"], sum(len(l.left_vertices) + len(l.right_vertices) for l in lanelets))
+        self.assertGreater(report.counters["linksCreated"], 0)
+        self.assertGreaterEqual(report.counters["borderSamples"], report.counters["vertices"])
+        self.assertGreater(report.counters["outputBytes"], 0)
+
+        data = json.loads(report.toJson())
+        self.assertEqual(data["counters"]["roads"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
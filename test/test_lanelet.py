@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+
+from opendrive2lanelet.commonroad import Lanelet
+
+class LaneletDerivedFieldsTest(unittest.TestCase):
+
+    def setUp(self):
+        x = np.linspace(0.0, 30.0, 4)
+        self.left = np.column_stack([x, np.full(4, 2.0)])
+        self.right = np.column_stack([x, np.full(4, -2.0)])
+
+    def test_lazy(self):
+        lanelet = Lanelet(self.left, None, self.right, 1)
+
+        self.assertIsNone(lanelet._center_vertices)
+        self.assertIsNone(lanelet._distance)
+
+        np.testing.assert_allclose(lanelet.center_vertices, [[0.0, 0.0], [10.0, 0.0], [20.0, 0.0], [30.0, 0.0]])
+        np.testing.assert_allclose(lanelet.distance, [0.0, 10.0, 20.0, 30.0])
+
+        # Cached
+        self.assertIs(lanelet.center_vertices, lanelet.center_vertices)
+        self.assertIs(lanelet.distance, lanelet.distance)
+
+    def test_invalidate(self):
+        lanelet = Lanelet(self.left, None, self.right, 1)
+        lanelet.distance
+
+        lanelet.left_vertices = self.left[:2] * 2
+        lanelet.right_vertices = self.right[:2] * 2
+
+        np.testing.assert_allclose(lanelet.center_vertices, [[0.0, 0.0], [20.0, 0.0]])
+        np.testing.assert_allclose(lanelet.distance, [0.0, 20.0])
+
+    def test_explicit_center(self):
+        center = np.column_stack([np.linspace(0.0, 30.0, 4), np.full(4, 1.0)])
+        lanelet = Lanelet(self.left, center, self.right, 1)
+
+        # An explicit center line is kept when the bounds change
+        lanelet.left_vertices = self.left + [0.0, 1.0]
+        np.testing.assert_allclose(lanelet.center_vertices, center)
+
+        lanelet.center_vertices = None
+        np.testing.assert_allclose(lanelet.center_vertices[:, 1], 0.5)
+
+    def test_concatenate(self):
+        laneletA = Lanelet(self.left, None, self.right, 1)
+        laneletB = Lanelet(self.left + [30.0, 0.0], None, self.right + [30.0, 0.0], 2)
+
+        lanelet = laneletA.concatenate(laneletB, 3)
+
+        self.assertEqual(len(lanelet.center_vertices), 7)
+        np.testing.assert_allclose(lanelet.distance[-1], 60.0)
+
+if __name__ == '__main__':
+    unittest.main()
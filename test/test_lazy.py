@@ -0,0 +1,48 @@
+import os
+import unittest
+
+import numpy as np
+from lxml import etree
+from opendriveparser import parse_opendrive
+from opendrive2lanelet import Network
+
+class LazyParsingTest(unittest.TestCase):
+
+    def setUp(self):
+
+        fh = open(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr", 'r')
+        self.rootNode = etree.fromstring(fh.read().encode("utf-8"))
+        fh.close()
+
+    def test_index(self):
+        openDrive = parse_opendrive(self.rootNode, lazy=True)
+
+        self.assertEqual(len(openDrive.roads), 2)
+        self.assertEqual([road.id for road in openDrive.roadIndex], [1, 2])
+        self.assertEqual([road.length for road in openDrive.roadIndex], [130.0, 40.0])
+        self.assertEqual(openDrive.roadIndex[0].link.successor.elementId, 2)
+        self.assertEqual(openDrive.roads.materialized, 0)
+
+        road = openDrive.getRoad(2)
+
+        self.assertEqual(road.id, 2)
+        self.assertEqual(openDrive.roads.materialized, 1)
+        self.assertIs(openDrive.getRoad(2), road)
+
+    def test_conversion(self):
+        lanelets = []
+
+        for lazy in [False, True]:
+            roadNetwork = Network()
+            roadNetwork.loadOpenDrive(parse_opendrive(self.rootNode, lazy=lazy))
+            lanelets.append(roadNetwork.exportLaneletNetwork().lanelets)
+
+        self.assertEqual(len(lanelets[0]), len(lanelets[1]))
+
+        for eager, lazy in zip(*lanelets):
+            self.assertEqual((eager.description, eager.successor, eager.predecessor), (lazy.description, lazy.successor, lazy.predecessor))
+            np.testing.assert_array_equal(eager.left_vertices, lazy.left_vertices)
+            np.testing.assert_array_equal(eager.right_vertices, lazy.right_vertices)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import os
+import tracemalloc
+import unittest
+
+from opendrive2lanelet.memory import profile_conversion
+
+class MemoryReportTest(unittest.TestCase):
+
+    def test_report(self):
+        report = profile_conversion(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr")
+
+        self.assertFalse(tracemalloc.is_tracing())
+
+        self.assertEqual([stage["name"] for stage in report.stages], ["parse_xml", "parse_opendrive", "loadOpenDrive", "exportLaneletNetwork", "export_to_string"])
+        self.assertEqual(sorted(report.families), ["lanelet_objects", "lanelet_vertices", "output_buffer", "plane_graph", "road_model", "xml_tree"])
+
+        self.assertEqual(report.counts["roads"], 2)
+        self.assertGreater(report.families["road_model"], 0)
+        self.assertGreater(report.families["lanelet_vertices"], 0)
+        self.assertGreaterEqual(report.peak, max(stage["peak"] for stage in report.stages))
+
+        self.assertEqual(json.loads(report.to_json())["counts"]["roads"], 2)
+
+    def test_report_without_reset_peak(self):
+        # tracemalloc.reset_peak is only available from Python 3.9
+        reset_peak = getattr(tracemalloc, "reset_peak", None)
+
+        if reset_peak is not None:
+            del tracemalloc.reset_peak
+
+        try:
+            report = profile_conversion(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr")
+        finally:
+            if reset_peak is not None:
+                tracemalloc.reset_peak = reset_peak
+
+        self.assertFalse(tracemalloc.is_tracing())
+
+        self.assertEqual(len(report.stages), 5)
+        self.assertEqual(report.counts["roads"], 2)
+        self.assertGreater(report.families["lanelet_vertices"], 0)
+
+        for stage in report.stages:
+            self.assertGreaterEqual(stage["peak"], stage["allocated"])
+
+if __name__ == '__main__':
+    unittest.main()
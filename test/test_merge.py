@@ -0,0 +1,41 @@
+import os
+import unittest
+
+import numpy as np
+from lxml import etree
+from opendriveparser import parse_opendrive
+from opendrive2lanelet import Network
+
+class MergeTest(unittest.TestCase):
+
+    def setUp(self):
+
+        fh = open(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr", 'r')
+        openDrive = parse_opendrive(etree.fromstring(fh.read().encode("utf-8")))
+        fh.close()
+
+        self.network = Network()
+        self.network.loadOpenDrive(openDrive)
+
+    def test_displacement_matches_resampling(self):
+
+        for pLane in self.network._planes:
+            lanelet = pLane.convertToLanelet()
+
+            for ref, refDistance in [("right", [1.5, 0.0]), ("left", [-1.5, 0.0]), ("right", [0.0, -2.0]), ("left", [0.0, 2.0])]:
+                merged = pLane.convertToLanelet(ref=ref, refDistance=refDistance)
+                leftDisplacement, rightDisplacement = pLane.calcRefDisplacement(ref=ref, refDistance=refDistance)
+
+                np.testing.assert_allclose(lanelet.left_vertices + leftDisplacement, merged.left_vertices, atol=1e-9)
+                np.testing.assert_allclose(lanelet.right_vertices + rightDisplacement, merged.right_vertices, atol=1e-9)
+
+    def test_no_reference(self):
+
+        pLane = self.network._planes[0]
+        leftDisplacement, rightDisplacement = pLane.calcRefDisplacement()
+
+        self.assertEqual(leftDisplacement.shape, pLane.convertToLanelet().left_vertices.shape)
+        self.assertFalse(leftDisplacement.any() or rightDisplacement.any())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+
+import os
+import unittest
+
+import numpy as np
+from lxml import etree
+from opendriveparser import parse_opendrive
+from opendriveparser.elements.eulerspiral import EulerSpiral
+from opendriveparser.elements.roadPlanView import ParamPoly3, Poly3
+
+class PlanViewProjectionTest(unittest.TestCase):
+
+    def setUp(self):
+
+        fh = open(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr", 'r')
+        self.openDrive = parse_opendrive(etree.parse(fh).getroot())
+        fh.close()
+
+    def test_derivatives_match_calc(self):
+
+        for road in self.openDrive.roads:
+            sPos = np.linspace(0.0, road.planView.getLength(), 25)
+            pos, d1, _ = road.planView.calcDerivatives(sPos)
+
+            for idx, s in enumerate(sPos):
+                refPos, refTang = road.planView.calc(s)
+
+                np.testing.assert_allclose(pos[idx], refPos, atol=1e-9)
+                self.assertAlmostEqual(np.cos(np.arctan2(d1[idx, 1], d1[idx, 0]) - refTang), 1.0)
+
+    def test_roundtrip(self):
+
+        random = np.random.RandomState(0)
+
+        for road in self.openDrive.roads:
+            length = road.planView.getLength()
+
+            sPos = random.uniform(0.01 * length, 0.99 * length, 1000)
+            tPos = random.uniform(-3.0, 3.0, 1000)
+
+            sResult, tResult, distance = road.planView.xyToST(road.planView.stToXY(sPos, tPos))
+
+            np.testing.assert_allclose(sResult, sPos, atol=1e-8)
+            np.testing.assert_allclose(tResult, tPos, atol=1e-8)
+            np.testing.assert_allclose(distance, np.abs(tPos), atol=1e-8)
+
+    def test_road_ids(self):
+
+        road = self.openDrive.getRoad(2)
+        points = road.planView.stToXY(np.array([5.0, 20.0, 35.0]), np.array([1.0, -1.0, 0.5]))
+
+        roadIds, sPos, tPos = self.openDrive.xyToRoadST(points)
+
+        np.testing.assert_array_equal(roadIds, [2, 2, 2])
+        np.testing.assert_allclose(sPos, [5.0, 20.0, 35.0], atol=1e-8)
+        np.testing.assert_allclose(tPos, [1.0, -1.0, 0.5], atol=1e-8)
+
+
+class EulerSpiralTest(unittest.TestCase):
+
+    def test_array_matches_scalar(self):
+        spiral = EulerSpiral.createFromLengthAndCurvature(50.0, 0.001, 0.02, 0.3)
+        s = np.linspace(0.0, 50.0, 101)
+
+        x, y, theta = spiral.calc(s, 1000.0, 1000.0, 0.001, 0.3)
+        scalar = np.array([spiral.calc(sPos, 1000.0, 1000.0, 0.001, 0.3) for sPos in s])
+
+        np.testing.assert_allclose(np.column_stack([x, y, theta]), scalar, atol=1e-10)
+
+        # Integrate the tangent numerically as reference for the positions
+        dx = np.concatenate([[0.0], np.cumsum((np.cos(theta[1:]) + np.cos(theta[:-1])) / 2 * np.diff(s))])
+        dy = np.concatenate([[0.0], np.cumsum((np.sin(theta[1:]) + np.sin(theta[:-1])) / 2 * np.diff(s))])
+
+        np.testing.assert_allclose(x - 1000.0, dx, atol=1e-3)
+        np.testing.assert_allclose(y - 1000.0, dy, atol=1e-3)
+
+    def test_straight_line(self):
+        spiral = EulerSpiral.createFromLengthAndCurvature(10.0, 0.0, 0.0)
+        x, y, theta = spiral.calc(np.array([0.0, 5.0, 10.0]), 1.0, 2.0, 0.0, np.pi / 2)
+
+        np.testing.assert_allclose(x, [1.0, 1.0, 1.0], atol=1e-12)
+        np.testing.assert_allclose(y, [2.0, 7.0, 12.0])
+
+class ParamPoly3Test(unittest.TestCase):
+
+    def setUp(self):
+        # Strongly non uniform parametrisation, the arc length is not linear in p
+        self.coeffs = ([0.0, 30.0, 60.0, -20.0], [0.0, 5.0, 40.0, -30.0])
+        length = ParamPoly3([0.0, 0.0], 0.0, 1.0, *(self.coeffs[0] + self.coeffs[1] + [None]))._arcLength.length
+
+        self.geometry = ParamPoly3([1000.0, 1000.0], 0.4, length, *(self.coeffs[0] + self.coeffs[1] + [None]))
+
+    def test_arc_length(self):
+        s = np.linspace(0.0, self.geometry.getLength(), 201)
+        pos, d1, _ = self.geometry.calcDerivatives(s)
+
+        # Parametrised by arc length, the tangent has unit length and sample distances equal the s steps
+        np.testing.assert_allclose(np.linalg.norm(d1, axis=1), 1.0, atol=1e-8)
+        np.testing.assert_allclose(np.linalg.norm(np.diff(pos, axis=0), axis=1), np.diff(s), rtol=1e-3)
+
+        end = np.array([np.polyval(self.coeffs[0][::-1], 1.0), np.polyval(self.coeffs[1][::-1], 1.0)])
+        rotation = np.array([[np.cos(0.4), -np.sin(0.4)], [np.sin(0.4), np.cos(0.4)]])
+        np.testing.assert_allclose(pos[-1], [1000.0, 1000.0] + rotation.dot(end), atol=1e-8)
+
+    def test_scalar_matches_array(self):
+        s = np.linspace(0.0, self.geometry.getLength(), 51)
+        pos, d1, _ = self.geometry.calcDerivatives(s)
+
+        scalar = [self.geometry.calcPosition(sPos) for sPos in s]
+
+        np.testing.assert_allclose(np.array([p for p, _ in scalar]), pos, atol=1e-9)
+        np.testing.assert_allclose(np.array([h for _, h in scalar]), np.unwrap(np.arctan2(d1[:, 1], d1[:, 0])), atol=1e-9)
+
+class Poly3Test(unittest.TestCase):
+
+    def test_on_curve(self):
+        geometry = Poly3([1000.0, 1000.0], 0.3, 40.0, 0.5, 0.1, 0.01, -0.0002)
+
+        s = np.linspace(0.0, 40.0, 81)
+        pos, d1, _ = geometry.calcDerivatives(s)
+
+        np.testing.assert_allclose(np.linalg.norm(d1, axis=1), 1.0, atol=1e-8)
+        np.testing.assert_allclose(np.sum(np.linalg.norm(np.diff(pos, axis=0), axis=1)), 40.0, rtol=1e-4)
+
+        # All points fulfill v = poly3(u) in the frame of the start heading
+        rotation = np.array([[np.cos(0.3), np.sin(0.3)], [-np.sin(0.3), np.cos(0.3)]])
+        local = (pos - [1000.0, 1000.0]).dot(rotation.T)
+
+        np.testing.assert_allclose(local[:, 1], np.polyval([-0.0002, 0.01, 0.1, 0.5], local[:, 0]), atol=1e-9)
+
+    def test_parse(self):
+        xml = open(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr").read()
+
+        lineRoad = parse_opendrive(etree.fromstring(xml.encode("utf-8"))).roads[0]
+        poly3Road = parse_opendrive(etree.fromstring(xml.replace("<line/>", '<poly3 a="0.0" b="0.0" c="0.0" d="0.0"/>', 1).encode("utf-8"))).roads[0]
+
+        sPos = np.linspace(0.0, lineRoad.planView.getLength(), 50)
+        np.testing.assert_allclose(poly3Road.planView.calcDerivatives(sPos)[0], lineRoad.planView.calcDerivatives(sPos)[0], atol=1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
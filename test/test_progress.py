@@ -0,0 +1,52 @@
+import os
+import unittest
+
+from lxml import etree
+from opendriveparser import parse_opendrive
+from opendrive2lanelet import Network
+from opendrive2lanelet.progress import CancellationToken, ConversionCanceled
+
+class ProgressTest(unittest.TestCase):
+
+    def setUp(self):
+
+        fh = open(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr", 'r')
+        self.openDrive = parse_opendrive(etree.fromstring(fh.read().encode("utf-8")))
+        fh.close()
+
+    def test_progress(self):
+        events = []
+
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(self.openDrive, progress=lambda *event: events.append(event))
+        laneletNetwork = roadNetwork.exportLaneletNetwork(progress=lambda *event: events.append(event))
+
+        steps = [step for step, _, _ in events]
+        self.assertEqual(sorted(set(steps), key=steps.index), ["roads", "planes", "lanelets"])
+
+        for step, total in [("roads", len(self.openDrive.roads)), ("planes", len(roadNetwork._planes)), ("lanelets", len(laneletNetwork.lanelets))]:
+            done = [event[1] for event in events if event[0] == step]
+
+            self.assertEqual(done, list(range(1, total + 1)))
+            self.assertTrue(all(event[2] == total for event in events if event[0] == step))
+
+    def test_cancel(self):
+        token = CancellationToken()
+
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(self.openDrive, cancelToken=token)
+
+        def progress(step, done, total):
+            if done == 2:
+                token.cancel()
+
+        with self.assertRaises(ConversionCanceled):
+            roadNetwork.exportLaneletNetwork(progress=progress, cancelToken=token)
+
+        self.assertTrue(token.canceled)
+
+        with self.assertRaises(ConversionCanceled):
+            Network().loadOpenDrive(self.openDrive, cancelToken=token)
+
+if __name__ == '__main__':
+    unittest.main()
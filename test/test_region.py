@@ -0,0 +1,105 @@
+import os
+import unittest
+
+import numpy as np
+from lxml import etree
+from opendriveparser import parse_opendrive
+from opendriveparser.region import Region
+from opendrive2lanelet import Network
+from opendrive2lanelet.utils import decode_road_section_lane_width_id
+
+class RegionTest(unittest.TestCase):
+
+    def setUp(self):
+
+        fh = open(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr", 'r')
+        self.rootNode = etree.fromstring(fh.read().encode("utf-8"))
+        fh.close()
+
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(parse_opendrive(self.rootNode))
+        self.full = roadNetwork.exportLaneletNetwork()
+
+    def links(self, laneletNetwork):
+        descriptions = {lanelet.lanelet_id: lanelet.description for lanelet in laneletNetwork.lanelets}
+
+        return set(
+            (lanelet.description, kind, descriptions[target])
+            for lanelet in laneletNetwork.lanelets
+            for kind in ["predecessor", "successor", "adj_left", "adj_right"]
+            for target in (getattr(lanelet, kind) if kind in ["predecessor", "successor"] else [getattr(lanelet, kind)])
+            if target is not None
+        )
+
+    def assertRegionConversion(self, laneletNetwork, roadIds):
+        expected = [lanelet for lanelet in self.full.lanelets if decode_road_section_lane_width_id(lanelet.description)[0] in roadIds]
+        lanelets = {lanelet.description: lanelet for lanelet in laneletNetwork.lanelets}
+
+        self.assertTrue(expected)
+        self.assertEqual(sorted(lanelets), sorted(lanelet.description for lanelet in expected))
+
+        for lanelet in expected:
+            np.testing.assert_allclose(lanelets[lanelet.description].left_vertices, lanelet.left_vertices)
+            np.testing.assert_allclose(lanelets[lanelet.description].right_vertices, lanelet.right_vertices)
+
+        self.assertEqual(self.links(laneletNetwork), set(link for link in self.links(self.full) if link[0] in lanelets and link[2] in lanelets))
+
+    def test_parse_region(self):
+        openDrive = parse_opendrive(self.rootNode, region=Region(boundingBox=(1130, 1054, 1200, 1100)))
+
+        self.assertEqual(openDrive.regionRoadIds, {2})
+        self.assertEqual(sorted(road.id for road in openDrive.roads), [1, 2])
+
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(openDrive)
+
+        self.assertRegionConversion(roadNetwork.exportLaneletNetwork(), {2})
+
+    def test_load_region(self):
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(parse_opendrive(self.rootNode), region=Region(roadIds=[1]))
+
+        self.assertRegionConversion(roadNetwork.exportLaneletNetwork(), {1})
+
+    def test_select_roads(self):
+        openDrive = parse_opendrive(self.rootNode, lazy=True)
+
+        regionRoadIds, roadIds, junctions = Region(boundingBox=(1130, 1054, 1200, 1100)).selectRoads(openDrive.roadIndex, openDrive.junctions)
+
+        self.assertEqual(regionRoadIds, {2})
+        self.assertEqual(roadIds, {1, 2})
+        self.assertEqual(openDrive.roads.materialized, 0)
+
+        # Bounding boxes of the index are the ones of the built plan views
+        for entry, road in zip(openDrive.roadIndex, parse_opendrive(self.rootNode).roads):
+            self.assertEqual(entry.boundingBox, road.planView.getBoundingBox())
+
+    def test_load_lazy_region(self):
+        openDrive = parse_opendrive(self.rootNode, lazy=True)
+
+        regionOpenDrive = Network.regionOpenDrive(openDrive, Region(roadIds=[1]))
+
+        self.assertEqual(regionOpenDrive.regionRoadIds, {1})
+        self.assertEqual(openDrive.roads.materialized, len(regionOpenDrive.roads))
+
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(regionOpenDrive)
+
+        self.assertRegionConversion(roadNetwork.exportLaneletNetwork(), {1})
+
+    def test_polygon(self):
+        region = Region(polygon=[(1140, 1055), (1200, 1055), (1200, 1100)])
+
+        self.assertTrue(region.containsRoad(2, (1080, 980, 1160, 1060)))
+        self.assertFalse(region.containsRoad(1, (950, 950, 1129.8, 1053)))
+
+        # Box inside the polygon and polygon edge crossing the box without corners inside each other
+        self.assertTrue(Region(polygon=[(0, 0), (10, 0), (0, 10)]).containsRoad(0, (1, 1, 2, 2)))
+        self.assertTrue(Region(polygon=[(-1, 4), (11, 4), (11, 6)]).containsRoad(0, (0, 0, 10, 10)))
+        self.assertFalse(Region(polygon=[(0, 0), (10, 0), (0, 10)]).containsRoad(0, (6, 6, 9, 9)))
+
+        with self.assertRaises(ValueError):
+            Region()
+
+if __name__ == '__main__':
+    unittest.main()
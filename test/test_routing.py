@@ -0,0 +1,56 @@
+
+import unittest
+
+import numpy as np
+
+from opendrive2lanelet.commonroad import Lanelet, LaneletNetwork
+from opendrive2lanelet.routing import RoutingGraph
+
+def straight_lanelet(lanelet_id, x0, y0, length=20.0, width=4.0, **kwargs):
+    x = np.linspace(x0, x0 + length, 11)
+
+    left_vertices = np.stack([x, np.full_like(x, y0 + width)], axis=1)
+    right_vertices = np.stack([x, np.full_like(x, y0)], axis=1)
+
+    return Lanelet(
+        left_vertices=left_vertices,
+        center_vertices=(left_vertices + right_vertices) / 2,
+        right_vertices=right_vertices,
+        lanelet_id=lanelet_id,
+        **kwargs
+    )
+
+class RoutingGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        # Two parallel lanes with three lanelets each, lane changes only possible in the middle
+        laneletNetwork = LaneletNetwork()
+        laneletNetwork.add_lanelet([
+            straight_lanelet(1, 0.0, 0.0, successor=[2]),
+            straight_lanelet(2, 20.0, 0.0, successor=[3], adjacent_left=5, adjacent_left_same_direction=True),
+            straight_lanelet(3, 40.0, 0.0),
+            straight_lanelet(4, 0.0, 4.0, successor=[5]),
+            straight_lanelet(5, 20.0, 4.0, successor=[6], adjacent_right=2, adjacent_right_same_direction=True),
+            straight_lanelet(6, 40.0, 4.0),
+        ])
+
+        self.graph = RoutingGraph(laneletNetwork, lane_change_cost=3.0)
+
+    def test_shortest_path(self):
+        self.assertEqual(self.graph.shortest_path(1, 3), ([1, 2, 3], 40.0))
+        self.assertEqual(self.graph.shortest_path(1, 6), ([1, 2, 5, 6], 43.0))
+        self.assertEqual(self.graph.shortest_path(3, 1), (None, np.inf))
+
+    def test_heuristic_matches_dijkstra(self):
+        for source in range(1, 7):
+            for target in range(1, 7):
+                self.assertEqual(self.graph.shortest_path(source, target)[1], self.graph.shortest_path(source, target, use_heuristic=False)[1])
+
+    def test_distances(self):
+        distances = self.graph.distances([1, 4], [3, 6])
+
+        np.testing.assert_allclose(distances, [[40.0, 43.0], [43.0, 40.0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from opendrive2lanelet.simplification import simplify_bounds, point_segment_distance
+from opendrive2lanelet.commonroad import Lanelet, LaneletNetwork
+
+class SimplificationTest(unittest.TestCase):
+
+    def arc_lanelet(self, lanelet_id, radius=50.0):
+        angle = np.linspace(0.0, np.pi / 2, 200)
+
+        left = np.column_stack([(radius - 2.0) * np.sin(angle), radius - (radius - 2.0) * np.cos(angle)])
+        right = np.column_stack([(radius + 2.0) * np.sin(angle), radius - (radius + 2.0) * np.cos(angle)])
+
+        return Lanelet(left, (left + right) / 2, right, lanelet_id)
+
+    def max_deviation(self, original, simplified):
+        """ Largest distance of the original vertices to the simplified polyline """
+        return np.min([
+            point_segment_distance(original, np.repeat(simplified[[i]], len(original), axis=0), np.repeat(simplified[[i + 1]], len(original), axis=0))
+            for i in range(len(simplified) - 1)
+        ], axis=0).max()
+
+    def test_straight(self):
+        line = np.column_stack([np.linspace(0.0, 100.0, 101), np.zeros(101)])
+
+        np.testing.assert_array_equal(simplify_bounds([line, line + [0.0, 3.0]], 0.01), [0, 100])
+
+    def test_breaks(self):
+        laneletA = self.arc_lanelet(1)
+        laneletB = self.arc_lanelet(2, radius=80.0)
+
+        left = np.vstack([laneletA.left_vertices, laneletB.left_vertices])
+        right = np.vstack([laneletA.right_vertices, laneletB.right_vertices])
+        n = len(laneletA.left_vertices)
+
+        keep = simplify_bounds([left, right], 0.01, breaks=[n - 1, n])
+
+        keepA = simplify_bounds([laneletA.left_vertices, laneletA.right_vertices], 0.01)
+        keepB = simplify_bounds([laneletB.left_vertices, laneletB.right_vertices], 0.01)
+
+        np.testing.assert_array_equal(keep, np.concatenate([keepA, keepB + n]))
+
+    def test_tolerance(self):
+        lanelet = self.arc_lanelet(1)
+        left, right = lanelet.left_vertices.copy(), lanelet.right_vertices.copy()
+
+        for tolerance in [0.005, 0.01, 0.1]:
+            keep = simplify_bounds([left, right], tolerance)
+
+            self.assertLess(len(keep), len(left))
+            self.assertLessEqual(self.max_deviation(left, left[keep]), tolerance)
+            self.assertLessEqual(self.max_deviation(right, right[keep]), tolerance)
+
+    def test_network(self):
+        laneletNetwork = LaneletNetwork()
+        laneletNetwork.add_lanelet(self.arc_lanelet(1))
+        laneletNetwork.add_lanelet(self.arc_lanelet(2, radius=80.0))
+
+        before, after = laneletNetwork.simplify(0.01)
+
+        self.assertEqual(before, 800)
+        self.assertEqual(after, sum(len(l.left_vertices) + len(l.right_vertices) for l in laneletNetwork.lanelets))
+        self.assertLess(after, before)
+
+        for lanelet in laneletNetwork.lanelets:
+            self.assertEqual(len(lanelet.left_vertices), len(lanelet.right_vertices))
+            self.assertEqual(len(lanelet.center_vertices), len(lanelet.distance))
+            self.assertAlmostEqual(lanelet.distance[-1], np.pi / 2 * 50.0 if lanelet.lanelet_id == 1 else np.pi / 2 * 80.0, delta=0.05)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from lxml import etree
+from opendriveparser import parse_opendrive
+from opendrive2lanelet import Network
+from opendrive2lanelet import snapshot
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+
+        fh = open(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr", 'r')
+        self.openDrive = parse_opendrive(etree.fromstring(fh.read().encode("utf-8")))
+        fh.close()
+
+        self.roadNetwork = Network(incremental=True)
+        self.roadNetwork.loadOpenDrive(self.openDrive)
+
+    def roundTrip(self, save, load, obj):
+        buf = io.BytesIO()
+        save(obj, buf)
+        buf.seek(0)
+
+        return load(buf)
+
+    def assertSameLanelets(self, laneletsA, laneletsB):
+        self.assertEqual(len(laneletsA), len(laneletsB))
+
+        for a, b in zip(laneletsA, laneletsB):
+            self.assertEqual(
+                (a.lanelet_id, a.description, a.predecessor, a.successor, a.adj_left, a.adj_left_same_direction, a.adj_right, a.adj_right_same_direction, a.speed_limit),
+                (b.lanelet_id, b.description, b.predecessor, b.successor, b.adj_left, b.adj_left_same_direction, b.adj_right, b.adj_right_same_direction, b.speed_limit)
+            )
+            np.testing.assert_array_equal(a.left_vertices, b.left_vertices)
+            np.testing.assert_array_equal(a.right_vertices, b.right_vertices)
+            np.testing.assert_array_equal(a.center_vertices, b.center_vertices)
+
+    def test_network(self):
+        loaded = self.roundTrip(snapshot.save_network, snapshot.load_network, self.roadNetwork)
+
+        self.assertEqual(loaded._linkIndex.links(), self.roadNetwork._linkIndex.links())
+        self.assertEqual(loaded._linkIndex.linkSources(), self.roadNetwork._linkIndex.linkSources())
+
+        self.assertSameLanelets(loaded.exportLaneletNetwork().lanelets, self.roadNetwork.exportLaneletNetwork().lanelets)
+
+        # Shared neighbour lists and strings are restored, saving the loaded network again gives the same arrays
+        arrays = snapshot.network_to_arrays(self.roadNetwork)
+
+        for name, array in snapshot.network_to_arrays(loaded).items():
+            np.testing.assert_array_equal(array, arrays[name])
+
+        # The state of incremental mode is restored
+        self.assertEqual(loaded.updateOpenDrive(self.openDrive), set())
+
+    def test_lanelet_network(self):
+        laneletNetwork = self.roadNetwork.exportLaneletNetwork()
+
+        laneletNetwork.lanelets[0].speed_limit = 13.9
+        laneletNetwork.lanelets[0].center_vertices = laneletNetwork.lanelets[0].left_vertices.copy()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "lanelets.snapshot")
+
+            snapshot.save_lanelet_network(laneletNetwork, path)
+            self.assertSameLanelets(snapshot.load_lanelet_network(path).lanelets, laneletNetwork.lanelets)
+
+        laneletNetwork.set_vertex_storage("fixed")
+        loaded = self.roundTrip(snapshot.save_lanelet_network, snapshot.load_lanelet_network, laneletNetwork)
+
+        self.assertEqual(loaded.lanelets[0].vertex_storage.dtype, "fixed")
+        self.assertSameLanelets(loaded.lanelets, laneletNetwork.lanelets)
+
+    def test_format(self):
+        laneletSnapshot = io.BytesIO()
+        snapshot.save_lanelet_network(self.roadNetwork.exportLaneletNetwork(), laneletSnapshot)
+        laneletSnapshot.seek(0)
+
+        with self.assertRaises(ValueError):
+            snapshot.load_network(laneletSnapshot)
+
+        with self.assertRaises(ValueError):
+            snapshot.load_network(io.BytesIO(b"not a snapshot"))
+
+        arrays = snapshot.network_to_arrays(self.roadNetwork)
+        metadata = json.loads(str(arrays["metadata"]))
+        metadata["version"] = snapshot.SNAPSHOT_VERSION + 1
+        arrays["metadata"] = np.array(json.dumps(metadata))
+
+        with self.assertRaises(ValueError):
+            snapshot.network_from_arrays(arrays)
+
+        metadata["version"] = snapshot.NETWORK_OLDEST_VERSION - 1
+        arrays["metadata"] = np.array(json.dumps(metadata))
+
+        with self.assertRaises(ValueError):
+            snapshot.network_from_arrays(arrays)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+
+import unittest
+
+import numpy as np
+
+from opendrive2lanelet.commonroad import Lanelet, LaneletNetwork
+
+def straight_lanelet(lanelet_id, x0, y0, length=20.0, width=4.0):
+    x = np.linspace(x0, x0 + length, 11)
+
+    left_vertices = np.stack([x, np.full_like(x, y0 + width)], axis=1)
+    right_vertices = np.stack([x, np.full_like(x, y0)], axis=1)
+
+    return Lanelet(
+        left_vertices=left_vertices,
+        center_vertices=(left_vertices + right_vertices) / 2,
+        right_vertices=right_vertices,
+        lanelet_id=lanelet_id
+    )
+
+class SpatialIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.laneletNetwork = LaneletNetwork()
+        self.laneletNetwork.add_lanelet([straight_lanelet(1, 0.0, 0.0), straight_lanelet(2, 0.0, 4.0)])
+
+    def test_points(self):
+        result = self.laneletNetwork.find_lanelet_by_position(np.array([[1.0, 1.0], [10.0, 7.0], [30.0, 1.0], [5.0, -1.0]]))
+
+        self.assertEqual(result, [[1], [2], [], []])
+
+    def test_box(self):
+        self.assertEqual([l.lanelet_id for l in self.laneletNetwork.find_lanelets_by_box(5.0, 5.0, 6.0, 6.0)], [2])
+        self.assertEqual([l.lanelet_id for l in self.laneletNetwork.find_lanelets_by_box(5.0, 3.0, 6.0, 5.0)], [1, 2])
+        self.assertEqual(self.laneletNetwork.find_lanelets_by_box(50.0, 50.0, 60.0, 60.0), [])
+
+    def test_incremental_update(self):
+        self.assertEqual(self.laneletNetwork.find_lanelet_by_position([[25.0, 1.0]]), [[]])
+
+        self.laneletNetwork.add_lanelet(straight_lanelet(3, 20.0, 0.0))
+
+        self.assertEqual(self.laneletNetwork.find_lanelet_by_position([[25.0, 1.0]]), [[3]])
+
+    def test_projection(self):
+        lanelet_ids, s, t = self.laneletNetwork.project_points(np.array([[5.0, 1.0], [12.5, 7.0], [19.0, 2.5]]))
+
+        np.testing.assert_array_equal(lanelet_ids, [1, 2, 1])
+        np.testing.assert_allclose(s, [5.0, 12.5, 19.0])
+        np.testing.assert_allclose(t, [-1.0, 1.0, 0.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import copy
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from lxml import etree
+from opendriveparser import parse_opendrive
+from opendriveparser.region import Region
+from opendrive2lanelet import Network
+from opendrive2lanelet.tiling import TileIndex, assign_tiles, convert_tile, convert_tile_group, stitch_links, write_manifest
+
+class TilingTest(unittest.TestCase):
+
+    def setUp(self):
+
+        fh = open(os.path.dirname(os.path.realpath(__file__)) + "/opendrive-2.xodr", 'r')
+        self.rootNode = etree.fromstring(fh.read().encode("utf-8"))
+        fh.close()
+
+        self.openDrive = parse_opendrive(self.rootNode)
+
+    def shiftedCopy(self):
+        """ The network of the test file and a copy of it with other road ids 1 km to the east """
+
+        rootNode = copy.deepcopy(self.rootNode)
+
+        for road in self.rootNode.findall("road"):
+            road = copy.deepcopy(road)
+            road.set("id", str(int(road.get("id")) + 10))
+
+            for link in road.find("link"):
+                link.set("elementId", str(int(link.get("elementId")) + 10))
+
+            for geometry in road.find("planView").findall("geometry"):
+                geometry.set("x", str(float(geometry.get("x")) + 1000.0))
+
+            rootNode.append(road)
+
+        return rootNode
+
+    def links(self, laneletNetwork, descriptions):
+        return set(
+            (lanelet.description, kind, descriptions[target])
+            for lanelet in laneletNetwork.lanelets
+            for kind in ["predecessor", "successor"]
+            for target in getattr(lanelet, kind)
+        )
+
+    def test_tiles_match_full_conversion(self):
+        roadNetwork = Network()
+        roadNetwork.loadOpenDrive(self.openDrive)
+        full = roadNetwork.exportLaneletNetwork(filterTypes=['driving', 'onRamp', 'offRamp', 'exit', 'entry'])
+
+        roadTiles = assign_tiles(self.openDrive, 50.0)
+        tiles = sorted(set(roadTiles.values()))
+
+        self.assertEqual(len(tiles), 2)
+
+        manifest = dict(tile_size=50.0, tiles=[])
+        descriptions = {}
+        lanelets = {}
+        links = set()
+
+        for tile in tiles:
+            scenario, tileManifest = convert_tile(self.openDrive, tile, roadTiles, 50.0)
+            manifest["tiles"].append(tileManifest)
+
+            tileDescriptions = {lanelet.lanelet_id: lanelet.description for lanelet in scenario.lanelet_network.lanelets}
+            descriptions[tileManifest["tile"]] = tileDescriptions
+
+            lanelets.update((lanelet.description, lanelet) for lanelet in scenario.lanelet_network.lanelets)
+            links |= self.links(scenario.lanelet_network, tileDescriptions)
+
+        for tile, laneletId, kind, targetTile, targetId in stitch_links(manifest):
+            links.add((descriptions[tile][laneletId], kind, descriptions[targetTile][targetId]))
+
+        self.assertEqual(sorted(lanelets), sorted(lanelet.description for lanelet in full.lanelets))
+        self.assertEqual(links, self.links(full, {lanelet.lanelet_id: lanelet.description for lanelet in full.lanelets}))
+        self.assertTrue(any(tile["links"] for tile in manifest["tiles"]))
+
+        for lanelet in full.lanelets:
+            np.testing.assert_allclose(lanelets[lanelet.description].left_vertices, lanelet.left_vertices)
+            np.testing.assert_allclose(lanelets[lanelet.description].right_vertices, lanelet.right_vertices)
+
+    def test_lazy_tiles(self):
+        openDrive = parse_opendrive(self.shiftedCopy(), lazy=True)
+
+        roadTiles = assign_tiles(openDrive, 50.0)
+        tiles = sorted(set(roadTiles.values()))
+
+        self.assertEqual(len(tiles), 4)
+        self.assertEqual(openDrive.roads.materialized, 0)
+
+        # The tiles of the first network only need its own roads
+        for tile in tiles[:2]:
+            scenario, manifest = convert_tile(openDrive, tile, roadTiles, 50.0)
+
+            self.assertTrue(manifest["lanelets"])
+            self.assertLess(openDrive.roads.materialized, len(openDrive.roads))
+
+        self.assertEqual(openDrive.roads.materialized, 2)
+
+    def test_tile_index(self):
+        openDrive = parse_opendrive(self.shiftedCopy(), lazy=True)
+
+        roadTiles = assign_tiles(openDrive, 50.0)
+        tileIndex = TileIndex(openDrive, roadTiles)
+
+        for tile in sorted(set(roadTiles.values())):
+            regionOpenDrive = Network.regionOpenDrive(openDrive, Region(roadIds=tileIndex.road_ids(tile)))
+            tileOpenDrive = tileIndex.tile_open_drive(openDrive, tile)
+
+            self.assertEqual([road.id for road in tileOpenDrive.roads], [road.id for road in regionOpenDrive.roads])
+            self.assertEqual([junction.id for junction in tileOpenDrive.junctions], [junction.id for junction in regionOpenDrive.junctions])
+
+    def test_tile_group(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "network.xodr")
+
+            with open(path, "wb") as fh:
+                fh.write(etree.tostring(self.shiftedCopy()))
+
+            roadTiles = assign_tiles(parse_opendrive(self.shiftedCopy(), lazy=True), 50.0)
+            tiles = sorted(set(roadTiles.values()))
+
+            manifests = convert_tile_group(path, directory, tiles[2:], 50.0)
+
+            self.assertEqual([manifest["tile"] for manifest in manifests], ["{}_{}".format(*tile) for tile in tiles[2:]])
+
+            # Keeping only the roads needed for the tiles gives the same tiles
+            roadIds = TileIndex(parse_opendrive(self.shiftedCopy(), lazy=True), roadTiles).needed_road_ids(tiles[2:])
+            self.assertLess(len(roadIds), len(roadTiles))
+
+            for manifest, partialManifest in zip(manifests, convert_tile_group(path, directory, tiles[2:], 50.0, road_ids=roadIds)):
+                self.assertEqual((partialManifest["lanelets"], partialManifest["links"]), (manifest["lanelets"], manifest["links"]))
+
+            for manifest in manifests:
+                self.assertTrue(os.path.exists(os.path.join(directory, manifest["file"])))
+
+                with open(os.path.join(directory, "tile_" + manifest["tile"] + ".json")) as fh:
+                    self.assertEqual(json.load(fh)["lanelets"], manifest["lanelets"])
+
+    def test_manifest_tile_size(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "network.xodr")
+
+            with open(path, "wb") as fh:
+                fh.write(etree.tostring(self.rootNode))
+
+            tiles = sorted(set(assign_tiles(self.openDrive, 50.0).values()))
+
+            # Tiles of runs with the same tile size are combined
+            convert_tile_group(path, directory, tiles[:1], 50.0)
+            convert_tile_group(path, directory, tiles[1:], 50.0)
+
+            self.assertEqual(len(write_manifest(directory, 50.0)["tiles"]), 2)
+
+            # A stale tile of another tile size is not mixed into the manifest
+            convert_tile_group(path, directory, sorted(set(assign_tiles(self.openDrive, 20.0).values()))[:1], 20.0)
+
+            with self.assertRaises(ValueError):
+                write_manifest(directory, 50.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from opendrive2lanelet.commonroad import Lanelet, LaneletNetwork, VertexStorage
+
+class VertexStorageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.laneletNetwork = LaneletNetwork()
+
+        for idx in range(3):
+            x = np.linspace(0.0, 100.0, 201) + 612345.678
+            y = 5412345.678 + 4.0 * idx + 0.01 * (x - x[0])**1.5
+
+            left = np.column_stack([x, y + 4.0])
+            right = np.column_stack([x, y])
+
+            self.laneletNetwork.add_lanelet(Lanelet(left, (left + right) / 2, right, idx + 1))
+
+        self.original = [(l.left_vertices.copy(), l.center_vertices.copy(), l.right_vertices.copy(), l.distance.copy()) for l in self.laneletNetwork.lanelets]
+
+    def assertCloseToOriginal(self, atol):
+        for lanelet, (left, center, right, distance) in zip(self.laneletNetwork.lanelets, self.original):
+            self.assertEqual(lanelet.left_vertices.dtype, np.float64)
+            np.testing.assert_allclose(lanelet.left_vertices, left, atol=atol, rtol=0)
+            np.testing.assert_allclose(lanelet.center_vertices, center, atol=atol, rtol=0)
+            np.testing.assert_allclose(lanelet.right_vertices, right, atol=atol, rtol=0)
+            np.testing.assert_allclose(lanelet.distance, distance, atol=10 * atol, rtol=0)
+
+    def test_float32(self):
+        before = sum(l.vertex_nbytes for l in self.laneletNetwork.lanelets)
+
+        storage = self.laneletNetwork.set_vertex_storage("float32")
+        np.testing.assert_array_equal(storage.origin, [612000.0, 5412000.0])
+
+        self.assertCloseToOriginal(1e-4)
+        self.assertLessEqual(sum(l.vertex_nbytes for l in self.laneletNetwork.lanelets) * 3.5, before)
+
+    def test_fixed(self):
+        self.laneletNetwork.set_vertex_storage("fixed", resolution=0.001)
+        self.assertCloseToOriginal(0.0005 + 1e-9)
+
+        # Queries work on the decoded vertices
+        ids = self.laneletNetwork.find_lanelet_by_position(np.array([[612395.0, 5412351.0]]))
+        self.assertEqual(len(ids[0]), 1)
+
+    def test_restore(self):
+        self.laneletNetwork.set_vertex_storage("fixed")
+        self.laneletNetwork.set_vertex_storage(None)
+
+        for lanelet in self.laneletNetwork.lanelets:
+            self.assertIsNone(lanelet.vertex_storage)
+
+        self.assertCloseToOriginal(0.0005 + 1e-9)
+
+    def test_range(self):
+        with self.assertRaises(ValueError):
+            VertexStorage("fixed", origin=(0.0, 0.0), resolution=0.001).encode([[3e6, 0.0]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,14 +13,16 @@ matplotlib.use('Qt5Agg')
 
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from matplotlib.path import Path
-from matplotlib.patches import PathPatch, Polygon
+from matplotlib.patches import Patch
+from matplotlib.collections import PolyCollection, LineCollection
+from matplotlib.colors import to_rgba
 
-from PyQt5.QtCore import Qt, pyqtSlot
+from PyQt5.QtCore import Qt, QTimer, pyqtSlot
 from PyQt5.QtWidgets import QApplication, QWidget, QTableWidget, QPushButton, QLineEdit, QFileDialog, QLabel, QMessageBox
 from PyQt5.QtWidgets import QSizePolicy, QHBoxLayout, QVBoxLayout, QTableWidgetItem, QAbstractItemView
 
-from opendrive2lanelet.commonroad import Lanelet, LaneletNetwork, Scenario, ScenarioError
+from opendrive2lanelet.commonroad import Lanelet, LaneletNetwork, Scenario
+from opendrive2lanelet.simplification import simplify_bounds
 
 
 class Canvas(FigureCanvas):
@@ -47,22 +49,39 @@ class Canvas(FigureCanvas):
         self.ax.set_aspect('equal', 'datalim')
         self.ax.set_axis_off()
 
-        self.draw()
+        self.draw_idle()
 
     def get_axes(self):
         return self.ax
 
     def update_plot(self):
-        self.draw()
+        # Several updates before the next event loop iteration are drawn once
+        self.draw_idle()
 
 class MainWindow(QWidget):
 
+    # Smallest tolerance of the decimated outlines in m, coarser levels double it
+    outline_tolerance = 0.05
+
     def __init__(self, parent=None, path=None):
         super().__init__(parent)
 
         self.current_scenario = None
         self.selected_lanelet_id = None
 
+        # Persistent artists of the network, a selection only changes their colors and the highlight layer
+        self.lanelet_collection = None
+        self.bound_collection = None
+        self.lanelet_index = {}
+        self.highlight_colors = {}
+        self.highlight_artists = []
+
+        # Only the lanelets in the view are drawn, with outlines decimated to the pixel size
+        self.visible_position = {}
+        self.viewport = None
+        self.viewport_pending = False
+        self.outline_cache = {}
+
         self._initUserInterface()
         self.show()
 
@@ -146,139 +165,259 @@ class MainWindow(QWidget):
 
     def openScenario(self, scenario):
         self.current_scenario = scenario
+        self.selected_lanelet_id = None
         self.update_plot()
+        self.update_table()
 
     @pyqtSlot()
     def onClickLanelet(self):
-        self.dynamic.clear_axes()
 
         selectedLanelets = self.laneletsList.selectedItems()
 
         if not selectedLanelets:
             self.selected_lanelet_id = None
-            return
+        else:
+            self.selected_lanelet_id = int(selectedLanelets[0].text())
 
-        self.selected_lanelet_id = int(selectedLanelets[0].text())
-        self.update_plot()
+        self.update_selection()
+
+    @staticmethod
+    def lanelet_style(lanelet, selected_lanelet):
+        """ Color, alpha and legend label of a lanelet and whether its direction is drawn """
+
+        if selected_lanelet is None:
+            return 'gray', 0.3, None, False
+
+        if lanelet.lanelet_id == selected_lanelet.lanelet_id:
+            return 'red', 0.7, '{} selected'.format(lanelet.lanelet_id), True
+        elif lanelet.lanelet_id in selected_lanelet.predecessor:
+            return 'blue', 0.5, '{} predecessor of {}'.format(lanelet.lanelet_id, selected_lanelet.lanelet_id), True
+        elif lanelet.lanelet_id in selected_lanelet.successor:
+            return 'green', 0.5, '{} successor of {}'.format(lanelet.lanelet_id, selected_lanelet.lanelet_id), True
+        elif lanelet.lanelet_id == selected_lanelet.adj_left:
+            return 'yellow', 0.5, '{} adj left of {} ({})'.format(lanelet.lanelet_id, selected_lanelet.lanelet_id, "same" if selected_lanelet.adj_left_same_direction else "opposite"), True
+        elif lanelet.lanelet_id == selected_lanelet.adj_right:
+            return 'orange', 0.5, '{} adj right of {} ({})'.format(lanelet.lanelet_id, selected_lanelet.lanelet_id, "same" if selected_lanelet.adj_right_same_direction else "opposite"), True
+
+        return 'gray', 0.3, None, False
 
     def update_plot(self):
+        """ Set up the artists of the network, the lanelets in the view are drawn by update_viewport """
+
+        self.dynamic.clear_axes()
+
+        self.lanelet_collection = None
+        self.bound_collection = None
+        self.lanelet_index = {}
+        self.highlight_colors = {}
+        self.highlight_artists = []
+        self.visible_position = {}
+        self.viewport = None
+        self.outline_cache = {}
 
         if self.current_scenario is None:
-            self.dynamic.clear_axes()
             return
 
-        try:
-            selected_lanelet = self.current_scenario.lanelet_network.find_lanelet_by_id(self.selected_lanelet_id)
+        ax = self.dynamic.get_axes()
 
-        except ScenarioError:
-            selected_lanelet = None
+        lanelets = self.current_scenario.lanelet_network.lanelets
 
-        ax = self.dynamic.get_axes()
+        self.lanelet_index = {lanelet.lanelet_id: idx for idx, lanelet in enumerate(lanelets)}
+
+        # All lanelets are drawn by two artists, independent of their number
+        self.lanelet_collection = PolyCollection([], edgecolors="none", zorder=0)
+        self.bound_collection = LineCollection([], colors="black", linewidths=0.1, zorder=1)
+
+        ax.add_collection(self.lanelet_collection)
+        ax.add_collection(self.bound_collection)
+
+        if lanelets:
+            vertices = np.vstack([np.vstack([lanelet.left_vertices, lanelet.right_vertices]) for lanelet in lanelets])
+            xlim1, ylim1 = vertices.min(axis=0)
+            xlim2, ylim2 = vertices.max(axis=0)
 
-        xlim1 = float('Inf')
-        xlim2 = -float('Inf')
-
-        ylim1 = float('Inf')
-        ylim2 = -float('Inf')
-
-        for lanelet in self.current_scenario.lanelet_network.lanelets:
-
-            # Selected lanelet
-            if selected_lanelet is not None:
-
-                draw_arrow = True
-
-                if lanelet.lanelet_id == selected_lanelet.lanelet_id:
-                    color = 'red'
-                    alpha = 0.7
-                    zorder = 10
-                    label = '{} selected'.format(lanelet.lanelet_id)
-                elif lanelet.lanelet_id in selected_lanelet.predecessor:
-                    color = 'blue'
-                    alpha = 0.5
-                    zorder = 5
-                    label = '{} predecessor of {}'.format(lanelet.lanelet_id, selected_lanelet.lanelet_id)
-                elif lanelet.lanelet_id in selected_lanelet.successor:
-                    color = 'green'
-                    alpha = 0.5
-                    zorder = 5
-                    label = '{} successor of {}'.format(lanelet.lanelet_id, selected_lanelet.lanelet_id)
-                elif lanelet.lanelet_id == selected_lanelet.adj_left:
-                    color = 'yellow'
-                    alpha = 0.5
-                    zorder = 5
-                    label = '{} adj left of {} ({})'.format(lanelet.lanelet_id, selected_lanelet.lanelet_id, "same" if selected_lanelet.adj_left_same_direction else "opposite")
-                elif lanelet.lanelet_id == selected_lanelet.adj_right:
-                    color = 'orange'
-                    alpha = 0.5
-                    zorder = 5
-                    label = '{} adj right of {} ({})'.format(lanelet.lanelet_id, selected_lanelet.lanelet_id, "same" if selected_lanelet.adj_right_same_direction else "opposite")
-                else:
-                    color = 'gray'
-                    alpha = 0.3
-                    zorder = 0
-                    label = None
-                    draw_arrow = False
-
-            else:
-                color = 'gray'
-                alpha = 0.3
-                zorder = 0
-                label = None
-                draw_arrow = False
-
-
-            verts = []
-            codes = [Path.MOVETO]
-
-            # TODO efficiency
-
-            for x, y in np.vstack([lanelet.left_vertices, lanelet.right_vertices[::-1]]):
-                verts.append([x, y])
-                codes.append(Path.LINETO)
-
-                #if color != 'gray':
-                xlim1 = min(xlim1, x)
-                xlim2 = max(xlim2, x)
-
-                ylim1 = min(ylim1, y)
-                ylim2 = max(ylim2, y)
-
-            verts.append(verts[0])
-            codes[-1] = Path.CLOSEPOLY
-
-            path = Path(verts, codes)
-
-            ax.add_patch(PathPatch(path, facecolor=color, edgecolor="black", lw=0.0, alpha=alpha, zorder=zorder, label=label))
-
-            ax.plot([x for x, y in lanelet.left_vertices], [y for x, y in lanelet.left_vertices], color="black", lw=0.1)
-            ax.plot([x for x, y in lanelet.right_vertices], [y for x, y in lanelet.right_vertices], color="black", lw=0.1)
-
-            if draw_arrow:
-                idx = 0
-
-                ml = lanelet.left_vertices[idx]
-                mr = lanelet.right_vertices[idx]
-                mc = lanelet.center_vertices[min(len(lanelet.center_vertices) - 1, idx + 10)]
-
-                ax.plot([ml[0], mr[0], mc[0], ml[0]], [ml[1], mr[1], mc[1], ml[1]], color="black", lw=0.3, zorder=15)
-
-        handles, labels = self.dynamic.get_axes().get_legend_handles_labels()
-        self.dynamic.get_axes().legend(handles, labels)
-
-        if xlim1 != float('Inf') and xlim2 != float('Inf') and ylim1 != float('Inf') and ylim2 != float('Inf'):
-            self.dynamic.get_axes().set_xlim([xlim1, xlim2])
-            self.dynamic.get_axes().set_ylim([ylim1, ylim2])
+            ax.set_xlim([xlim1, xlim2])
+            ax.set_ylim([ylim1, ylim2])
+
+        # Clearing the axes removes the callbacks
+        ax.callbacks.connect('xlim_changed', self.onLimitsChanged)
+        ax.callbacks.connect('ylim_changed', self.onLimitsChanged)
+
+        # The network is drawn once, after the viewport and the selection are set up
+        self.update_viewport(draw=False)
+        self.update_selection(draw=False)
 
         self.dynamic.update_plot()
 
+    def onLimitsChanged(self, ax):
+        """ Panning and zooming change both limits, update the view once after all of them """
+
+        if not self.viewport_pending:
+            self.viewport_pending = True
+            QTimer.singleShot(0, self.update_viewport)
+
+    def outline_level(self):
+        """ Decimation level for the current view, the tolerance of the level is below half a pixel """
+
+        ax = self.dynamic.get_axes()
+        xlim1, xlim2 = ax.get_xlim()
+
+        pixel_size = abs(xlim2 - xlim1) / max(1.0, ax.bbox.width)
+
+        if pixel_size < 2 * self.outline_tolerance:
+            return 0
+
+        return int(np.log2(pixel_size / (2 * self.outline_tolerance)))
+
+    def lanelet_outlines(self, indices, level):
+        """ Polygons and bounds of lanelets decimated to a level, level 0 has all vertices """
+
+        lanelets = self.current_scenario.lanelet_network.lanelets
+        missing = [idx for idx in indices if (idx, level) not in self.outline_cache]
+
+        if missing and level > 0:
+            # All missing lanelets are simplified at once, their first and last vertices are kept
+            left_vertices = np.vstack([lanelets[idx].left_vertices for idx in missing])
+            right_vertices = np.vstack([lanelets[idx].right_vertices for idx in missing])
+
+            ends = np.cumsum([len(lanelets[idx].left_vertices) for idx in missing])
+            starts = np.concatenate([[0], ends[:-1]])
+
+            keep = simplify_bounds([left_vertices, right_vertices], self.outline_tolerance * 2 ** level, breaks=np.concatenate([starts, ends - 1]))
+
+            for idx, kept in zip(missing, np.split(keep, np.searchsorted(keep, ends[:-1]))):
+                self.outline_cache[(idx, level)] = (np.vstack([left_vertices[kept], right_vertices[kept][::-1]]), left_vertices[kept], right_vertices[kept])
+
+        elif missing:
+            for idx in missing:
+                lanelet = lanelets[idx]
+                self.outline_cache[(idx, level)] = (np.vstack([lanelet.left_vertices, lanelet.right_vertices[::-1]]), lanelet.left_vertices, lanelet.right_vertices)
+
+        return [self.outline_cache[(idx, level)] for idx in indices]
+
+    def update_viewport(self, draw=True):
+        """ Draw the lanelets intersecting the axes limits """
+
+        self.viewport_pending = False
+
+        if self.lanelet_collection is None:
+            return
+
+        ax = self.dynamic.get_axes()
+        (xlim1, xlim2), (ylim1, ylim2) = ax.get_xlim(), ax.get_ylim()
+        level = self.outline_level()
+
+        viewport = (xlim1, xlim2, ylim1, ylim2, level)
+
+        # Drawing changes the limits again to keep the aspect ratio
+        if viewport == self.viewport:
+            return
+
+        self.viewport = viewport
+
+        laneletNetwork = self.current_scenario.lanelet_network
+        visible = laneletNetwork.spatial_index.query_box(min(xlim1, xlim2), min(ylim1, ylim2), max(xlim1, xlim2), max(ylim1, ylim2))
+
+        polygons = []
+        bounds = []
+
+        for polygon, left_vertices, right_vertices in self.lanelet_outlines(visible, level):
+            polygons.append(polygon)
+            bounds.append(left_vertices)
+            bounds.append(right_vertices)
+
+        self.visible_position = {idx: position for position, idx in enumerate(visible)}
+
+        self.lanelet_collection.set_verts(polygons)
+        self.bound_collection.set_segments(bounds)
+
+        self.apply_highlight_colors()
+
+        if draw:
+            self.dynamic.update_plot()
+
+    def apply_highlight_colors(self):
+
+        colors = np.tile(to_rgba('gray', 0.3), (len(self.visible_position), 1))
+
+        for idx, color in self.highlight_colors.items():
+            if idx in self.visible_position:
+                colors[self.visible_position[idx]] = color
+
+        self.lanelet_collection.set_facecolor(colors)
+
+    def update_selection(self, draw=True):
+        """ Recolor the selected lanelet and its neighbours, only these lanelets are visited """
+
+        if self.lanelet_collection is None:
+            return
+
+        lanelets = self.current_scenario.lanelet_network.lanelets
+
+        # Lookup by the index of the drawn lanelets, find_lanelet_by_id is a linear search
+        if self.selected_lanelet_id in self.lanelet_index:
+            selected_lanelet = lanelets[self.lanelet_index[self.selected_lanelet_id]]
+        else:
+            selected_lanelet = None
+
+        self.highlight_colors = {}
+
+        for artist in self.highlight_artists:
+            artist.remove()
+
+        self.highlight_artists = []
+
+        if selected_lanelet is not None:
+            ids = [selected_lanelet.lanelet_id] + selected_lanelet.predecessor + selected_lanelet.successor + [selected_lanelet.adj_left, selected_lanelet.adj_right]
+
+            arrows = []
+            legend = []
+
+            for lanelet_id in ids:
+                if lanelet_id not in self.lanelet_index or self.lanelet_index[lanelet_id] in self.highlight_colors:
+                    continue
+
+                lanelet = lanelets[self.lanelet_index[lanelet_id]]
+                color, alpha, label, draw_arrow = self.lanelet_style(lanelet, selected_lanelet)
+
+                self.highlight_colors[self.lanelet_index[lanelet_id]] = to_rgba(color, alpha)
+
+                if label is not None:
+                    legend.append(Patch(facecolor=color, alpha=alpha, label=label))
+
+                if draw_arrow:
+                    idx = 0
+
+                    ml = lanelet.left_vertices[idx]
+                    mr = lanelet.right_vertices[idx]
+                    mc = lanelet.center_vertices[min(len(lanelet.center_vertices) - 1, idx + 10)]
+
+                    arrows.append([ml, mr, mc, ml])
+
+            ax = self.dynamic.get_axes()
+
+            if arrows:
+                self.highlight_artists.append(ax.add_collection(LineCollection(arrows, colors="black", linewidths=0.3, zorder=15)))
+
+            if legend:
+                # Finding the best location is slow for large collections
+                self.highlight_artists.append(ax.legend(handles=legend, loc="upper right"))
+
+        self.apply_highlight_colors()
+
+        if draw:
+            self.dynamic.update_plot()
+
+    def update_table(self):
+
+        lanelets = [] if self.current_scenario is None else self.current_scenario.lanelet_network.lanelets
 
-        self.laneletsList.setRowCount(len(self.current_scenario.lanelet_network.lanelets))
+        self.laneletsList.setRowCount(len(lanelets))
         self.laneletsList.setColumnCount(2)
 
-        for idx, lanelet in enumerate(self.current_scenario.lanelet_network.lanelets):
-            self.laneletsList.setItem(idx - 1, 0, QTableWidgetItem("{}".format(lanelet.lanelet_id)))
-            self.laneletsList.setItem(idx - 1, 1, QTableWidgetItem("{}".format(lanelet.description)))
+        for idx, lanelet in enumerate(lanelets):
+            self.laneletsList.setItem(idx, 0, QTableWidgetItem("{}".format(lanelet.lanelet_id)))
+            self.laneletsList.setItem(idx, 1, QTableWidgetItem("{}".format(lanelet.description)))
 
     #def testCmd(self):
     #    self.dynamic.fig.savefig("foo.pdf", bbox_inches='tight')